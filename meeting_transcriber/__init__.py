@@ -15,53 +15,48 @@ Meeting Transcriber - Система записи и транскрипции с
     - cli_typer: Командный интерфейс (Typer + Rich)
 """
 
-# Workaround для PyTorch 2.6+ совместимости с pyannote
-# PyTorch 2.6+ по умолчанию использует weights_only=True что ломает pyannote
-# ВАЖНО: патчим ПЕРЕД импортом любых библиотек
-try:
-    import torch
-    
-    # Сохраняем настоящую оригинальную функцию
-    _real_torch_load = torch.load.__wrapped__ if hasattr(torch.load, '__wrapped__') else torch.load
-    
-    def _patched_load(f, map_location=None, pickle_module=None, *, weights_only=False, **kwargs):
-        """Патч torch.load с weights_only=False по умолчанию."""
-        if pickle_module is not None:
-            kwargs['pickle_module'] = pickle_module
-        return _real_torch_load(f, map_location=map_location, weights_only=weights_only, **kwargs)
-    
-    torch.load = _patched_load
-    
-    # Патчим lightning_fabric.utilities.cloud_io
-    try:
-        import lightning_fabric.utilities.cloud_io
-        
-        def _patched_cloud_load(path_or_url, map_location=None, weights_only=None):
-            # ВСЕГДА используем weights_only=False для pyannote моделей
-            return _patched_load(path_or_url, map_location=map_location, weights_only=False)
-        
-        lightning_fabric.utilities.cloud_io._load = _patched_cloud_load
-        lightning_fabric.utilities.cloud_io.torch.load = _patched_load
-    except ImportError:
-        pass
-        
-except ImportError:
-    pass
+# Патч torch.load для pyannote применяется лениво в whisperx._import_whisperx()
+
+import importlib
 
 from .config import Config
-from .recorder import MeetingRecorder
-from .transcriber import EnhancedTranscriber
-from .postprocess import postprocess_transcription, filter_hallucinations
-from .audio_monitor import AudioLevelMonitor
-from .groq_backend import GroqTranscriber, check_groq_available
-from .summarizer import MeetingSummarizer, format_summary_text, check_summarizer_available
-from .blackhole import (
-    CaptureMode,
-    check_blackhole_installed,
-    find_blackhole_device,
-    get_blackhole_status
-)
-from .cli_typer import app, __version__
+
+__version__ = "5.6.0"  # Улучшение качества записи: пресеты фильтров, мягкий шумодав
+
+# Остальные экспорты загружаются при первом обращении (PEP 562):
+# transcriber/recorder/groq/summarizer тянут numpy, faster-whisper и т.д.,
+# а короткие команды (list-devices, --version) не должны платить за их импорт
+_LAZY_EXPORTS = {
+    "MeetingRecorder": (".recorder", "MeetingRecorder"),
+    "EnhancedTranscriber": (".transcriber", "EnhancedTranscriber"),
+    "postprocess_transcription": (".postprocess", "postprocess_transcription"),
+    "filter_hallucinations": (".postprocess", "filter_hallucinations"),
+    "AudioLevelMonitor": (".audio_monitor", "AudioLevelMonitor"),
+    "GroqTranscriber": (".groq_backend", "GroqTranscriber"),
+    "check_groq_available": (".groq_backend", "check_groq_available"),
+    "MeetingSummarizer": (".summarizer", "MeetingSummarizer"),
+    "format_summary_text": (".summarizer", "format_summary_text"),
+    "check_summarizer_available": (".summarizer", "check_summarizer_available"),
+    "CaptureMode": (".blackhole", "CaptureMode"),
+    "check_blackhole_installed": (".blackhole", "check_blackhole_installed"),
+    "find_blackhole_device": (".blackhole", "find_blackhole_device"),
+    "get_blackhole_status": (".blackhole", "get_blackhole_status"),
+    "app": (".cli_typer", "app"),
+}
+
+
+def __getattr__(name: str):
+    """Ленивая загрузка экспортов пакета."""
+    if name in _LAZY_EXPORTS:
+        module_name, attr = _LAZY_EXPORTS[name]
+        value = getattr(importlib.import_module(module_name, __name__), attr)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
 
 __all__ = [
     "Config",
@@ -3,8 +3,15 @@
 Точка входа для запуска как модуля: python -m meeting_transcriber
 """
 
-from .cli_typer import app
+import sys
 
 if __name__ == "__main__":
-    app()
+    # --version не требует импорта CLI (Typer, Rich, recorder, transcriber)
+    if sys.argv[1:] in (["--version"], ["-v"]):
+        from . import __version__
+        print(f"Meeting Transcriber v{__version__}")
+        sys.exit(0)
+    
+    from .cli_typer import run
+    run()
 
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Числовые ядра индикатора уровня, скомпилированные Numba.
+
+Ядра работают без GIL (nogil=True), поэтому callback sounddevice
+не конкурирует с потоками записи и транскрипции. Компиляция кэшируется
+на диск (cache=True) — платим за неё только при первом запуске.
+
+Если numba не установлен, HAS_NUMBA = False и audio_monitor
+использует NumPy реализацию.
+"""
+
+import math
+
+HAS_NUMBA = False
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    pass
+
+
+if HAS_NUMBA:
+    @njit(nogil=True, cache=True, fastmath=True)
+    def max_channel_rms(indata):
+        """
+        RMS самого громкого канала.
+        
+        Args:
+            indata: int16/float32 массив (frames, channels)
+            
+        Returns:
+            RMS (максимум по каналам)
+        """
+        frames, nch = indata.shape
+        if frames == 0:
+            return 0.0
+        
+        best = 0.0
+        for ch in range(nch):
+            s = 0.0
+            for i in range(frames):
+                v = indata[i, ch]
+                s += v * v
+            if s > best:
+                best = s
+        return math.sqrt(best / frames)
@@ -6,11 +6,16 @@
 во время записи через ffmpeg.
 """
 
-import threading
-import time
-from typing import Optional, Callable
+import sys
+import math
+import logging
+from typing import Optional, Callable, Tuple
 
 from .logging_setup import get_logger
+from ._audio_kernels import HAS_NUMBA
+
+if HAS_NUMBA:
+    from ._audio_kernels import max_channel_rms
 
 logger = get_logger()
 
@@ -24,6 +29,40 @@ except ImportError:
     pass
 
 
+# Разделитель в выводе list_audio_devices
+_SEPARATOR = "-" * 60
+
+# Полная шкала int16: уровень int16 потока приводится к диапазону float [-1, 1)
+INT16_FULL_SCALE = 32768.0
+
+
+def _block_rms(indata) -> float:
+    """
+    RMS блока аудио (максимум по каналам).
+    
+    Поток всегда открывается как int16 (см. _open_stream).
+    
+    Args:
+        indata: int16 массив (frames,) или (frames, channels)
+        
+    Returns:
+        RMS самого громкого канала в шкале float (0.0 - 1.0)
+    """
+    frames = indata.shape[0]
+    if frames == 0:
+        return 0.0
+    
+    block = indata if indata.ndim > 1 else indata.reshape(-1, 1)
+    
+    if HAS_NUMBA:
+        # Скомпилированное ядро без GIL
+        return float(max_channel_rms(block)) / INT16_FULL_SCALE
+    
+    # Целочисленная сумма квадратов с накоплением в int64 (без переполнения int16)
+    sum_sq = np.einsum('ij,ij->j', block, block, dtype=np.int64).max()
+    return math.sqrt(float(sum_sq) / frames) / INT16_FULL_SCALE
+
+
 class AudioLevelMonitor:
     """
     Мониторинг уровня звука с микрофона в реальном времени.
@@ -34,6 +73,12 @@ class AudioLevelMonitor:
     # Символы для визуализации уровня
     BAR_CHARS = "▁▂▃▄▅▆▇█"
     BAR_WIDTH = 30
+    RENDER_INTERVAL = 0.05  # сек между отрисовками (не чаще 20 FPS)
+    PEAK_DECAY = 0.95       # затухание пика за RENDER_INTERVAL
+    _LINE_PREFIX = "\r🎙️  ".encode('utf-8')
+    # Первые ячейки зон ▓ (> 50% ширины) и █ (> 80% ширины)
+    _ZONE_MID_START = int(BAR_WIDTH * 0.5) + 1
+    _ZONE_HI_START = int(BAR_WIDTH * 0.8) + 1
     
     def __init__(
         self,
@@ -60,8 +105,14 @@ class AudioLevelMonitor:
         self.block_size = block_size
         
         self._running = False
-        self._thread: Optional[threading.Thread] = None
         self._stream = None
+        self._first_callback_logged = False
+        # Троттлинг отрисовки: кадров на один тик (RENDER_INTERVAL) и счётчик с прошлой отрисовки
+        self._frames_per_tick: float = sample_rate * self.RENDER_INTERVAL
+        self._frames_since_render = 0
+        # Множитель затухания пика для блока из _decay_frames кадров (блоки обычно одинаковые)
+        self._decay_frames = 0
+        self._decay_factor = 1.0
         self._current_level: float = 0.0
         self._peak_level: float = 0.0
         self._clipping = False
@@ -69,10 +120,18 @@ class AudioLevelMonitor:
         # Callback для обновления UI (опционально)
         self.on_level_update: Optional[Callable[[float, float, bool], None]] = None
     
-    def _get_device_index(self) -> Optional[int]:
-        """Получить индекс устройства из строки."""
+    def _get_device_index(self, devices) -> Tuple[Optional[int], Optional[dict]]:
+        """
+        Получить индекс устройства из строки.
+        
+        Args:
+            devices: Результат sd.query_devices() (запрашивается один раз на старт)
+            
+        Returns:
+            (индекс, информация об устройстве) или (None, None) для устройства по умолчанию
+        """
         if self.device is None:
-            return None
+            return None, None
 
         # Если это число, проверяем что устройство существует
         try:
@@ -81,87 +140,136 @@ class AudioLevelMonitor:
             device_idx = int(device_str)
 
             # Проверяем что устройство существует и поддерживает ввод
-            try:
-                device_info = sd.query_devices(device_idx)
-                if device_info['max_input_channels'] > 0:
-                    return device_idx
-                else:
-                    logger.debug(f"Устройство {device_idx} не поддерживает ввод, используем дефолтное")
-                    return None
-            except (ValueError, IndexError):
+            if not 0 <= device_idx < len(devices):
                 logger.debug(f"Устройство {device_idx} не найдено, используем дефолтное")
-                return None
+                return None, None
+            device_info = devices[device_idx]
+            if device_info['max_input_channels'] > 0:
+                return device_idx, device_info
+            logger.debug(f"Устройство {device_idx} не поддерживает ввод, используем дефолтное")
+            return None, None
         except ValueError:
             pass
 
         # Поиск устройства по имени
-        try:
-            devices = sd.query_devices()
-            for i, dev in enumerate(devices):
-                if self.device.lower() in dev['name'].lower():
-                    if dev['max_input_channels'] > 0:
-                        return i
-        except Exception as e:
-            logger.debug(f"Ошибка поиска устройства: {e}")
+        needle = self.device.lower()
+        for i, dev in enumerate(devices):
+            if needle in dev['name'].lower() and dev['max_input_channels'] > 0:
+                return i, dev
 
-        return None
+        return None, None
     
     def _audio_callback(self, indata, frames, time_info, status):
         """Callback для обработки аудио данных."""
         if status:
             logger.debug(f"Audio status: {status}")
 
-        # DEBUG: логируем первый callback
-        if not hasattr(self, '_first_callback_logged'):
-            logger.debug(f"Audio callback: shape={indata.shape}, dtype={indata.dtype}, max={np.max(np.abs(indata)):.6f}")
+        # DEBUG: логируем первый callback (np.abs по всему буферу — только при DEBUG)
+        if not self._first_callback_logged:
             self._first_callback_logged = True
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Audio callback: shape={indata.shape}, dtype={indata.dtype}, "
+                    f"max={np.max(np.abs(indata)):.6f}"
+                )
 
         # Вычисляем RMS уровень для всех каналов (берём максимум)
         # Это нужно для multi-channel устройств (Агрегатное устройство)
-        if indata.ndim > 1:
-            # Многоканальный ввод - берём максимум по всем каналам
-            rms = np.sqrt(np.max([np.mean(indata[:, ch] ** 2) for ch in range(indata.shape[1])]))
+        self._update_level(_block_rms(indata), frames)
+    
+    def _make_stream_callback(self, channels: int) -> Callable:
+        """
+        Callback, специализированный под int16 поток с известным числом каналов.
+        
+        Проверки ndim/dtype/числа каналов делаются один раз при открытии потока,
+        а не в каждом блоке. С numba и для нестандартных потоков — общий _audio_callback.
+        
+        Args:
+            channels: Число каналов открываемого потока
+            
+        Returns:
+            Функция для sd.InputStream(callback=...)
+        """
+        if HAS_NUMBA or channels < 1:
+            return self._audio_callback
+        
+        update = self._update_level
+        
+        if channels == 1:
+            def callback(indata, frames, time_info, status):
+                if status:
+                    logger.debug(f"Audio status: {status}")
+                col = indata.ravel()
+                sum_sq = np.einsum('i,i->', col, col, dtype=np.int64)
+                update(math.sqrt(float(sum_sq) / frames) / INT16_FULL_SCALE, frames)
         else:
-            # Одноканальный ввод
-            rms = np.sqrt(np.mean(indata ** 2))
+            def callback(indata, frames, time_info, status):
+                if status:
+                    logger.debug(f"Audio status: {status}")
+                sum_sq = np.einsum('ij,ij->j', indata, indata, dtype=np.int64)
+                update(math.sqrt(float(sum_sq.max()) / frames) / INT16_FULL_SCALE, frames)
         
-        # Конвертируем в dB (с защитой от log(0))
+        return callback
+    
+    def _update_level(self, rms: float, frames: int) -> None:
+        """
+        Обновить уровень/пик по RMS блока и при необходимости перерисовать индикатор.
+        
+        Args:
+            rms: RMS блока в шкале float (0.0 - 1.0)
+            frames: Число кадров в блоке
+        """
+        # Конвертируем в dB (с защитой от log(0)); скаляр — math быстрее numpy
         if rms > 0:
-            db = 20 * np.log10(rms)
+            db = 20 * math.log10(rms)
         else:
             db = -100
         
         # Нормализуем в диапазон 0-1 (от -60dB до 0dB)
         normalized = max(0, min(1, (db + 60) / 60))
         
+        # Пик затухает пропорционально прошедшему времени (PEAK_DECAY за тик);
+        # и чтение, и запись пика — только в этом потоке
+        if frames != self._decay_frames:
+            self._decay_frames = frames
+            self._decay_factor = self.PEAK_DECAY ** (frames / self._frames_per_tick)
         self._current_level = normalized
-        self._peak_level = max(self._peak_level, normalized)
+        self._peak_level = max(self._peak_level * self._decay_factor, normalized)
         self._clipping = rms > 0.95
         
         # Вызываем callback если задан
         if self.on_level_update:
             self.on_level_update(normalized, self._peak_level, self._clipping)
+        
+        # Рисуем прямо из аудио потока sounddevice — отдельный поток не нужен
+        self._frames_since_render += frames
+        if self._running and self._frames_since_render >= self._frames_per_tick:
+            self._frames_since_render = 0
+            self._write_bar(self._render_level_bar())
+    
+    def _write_bar(self, bar: str) -> None:
+        """Вывести индикатор в ту же строку консоли (байтами, мимо TextIOWrapper)."""
+        out = getattr(sys.stdout, 'buffer', None)
+        if out is None:
+            # stdout подменён (тесты, IDE) — обычный print
+            print(f"\r🎙️  {bar}", end="", flush=True)
+            return
+        out.write(self._LINE_PREFIX + bar.encode('utf-8'))
+        out.flush()
     
     def _render_level_bar(self) -> str:
         """Создать строку визуализации уровня."""
         level = self._current_level
         peak = self._peak_level
         
-        # Основная полоса
+        # Основная полоса: три зоны по уровню собираются срезами, без цикла по ячейкам
         filled = int(level * self.BAR_WIDTH)
-        bar = ""
-        
-        for i in range(self.BAR_WIDTH):
-            if i < filled:
-                # Цветовая градация по уровню
-                if i > self.BAR_WIDTH * 0.8:
-                    bar += "█"  # Высокий уровень
-                elif i > self.BAR_WIDTH * 0.5:
-                    bar += "▓"
-                else:
-                    bar += "░"
-            else:
-                bar += " "
+        mid, hi = self._ZONE_MID_START, self._ZONE_HI_START
+        bar = (
+            "░" * min(filled, mid)
+            + "▓" * max(0, min(filled, hi) - mid)  # Средний уровень
+            + "█" * max(0, filled - hi)            # Высокий уровень
+        ).ljust(self.BAR_WIDTH)
         
         # Пиковый индикатор
         peak_pos = int(peak * self.BAR_WIDTH)
@@ -180,51 +288,35 @@ class AudioLevelMonitor:
         
         return f"{clip_indicator} [{bar}] {db_str:>6}"
     
-    def _monitor_loop(self):
-        """Основной цикл мониторинга."""
-        device_idx = self._get_device_index()
-
-        try:
-            # Определяем параметры устройства
-            if device_idx is not None:
-                device_info = sd.query_devices(device_idx)
-                channels = min(device_info['max_input_channels'], 2)  # Максимум 2 канала для мониторинга
-                # Используем нативную частоту устройства
-                samplerate = int(device_info['default_samplerate'])
-            else:
-                channels = 1
-                samplerate = self.sample_rate
-
-            logger.debug(f"Запуск мониторинга на устройстве: {device_idx}, каналов: {channels}, частота: {samplerate}")
-
-            self._stream = sd.InputStream(
-                device=device_idx,
-                channels=channels,
-                samplerate=samplerate,
-                blocksize=self.block_size,
-                callback=self._audio_callback
-            )
-            
-            self._stream.start()
-            
-            while self._running:
-                # Рендерим уровень в консоль
-                bar = self._render_level_bar()
-                print(f"\r🎙️  {bar}", end="", flush=True)
-                
-                # Сбрасываем пик постепенно
-                self._peak_level *= 0.95
-                
-                time.sleep(0.05)  # 20 FPS
-            
-        except Exception as e:
-            logger.error(f"Ошибка мониторинга аудио: {e}")
-        finally:
-            if self._stream:
-                self._stream.stop()
-                self._stream.close()
-                self._stream = None
-            print()  # Новая строка после завершения
+    def _open_stream(self) -> None:
+        """Открыть и запустить InputStream; уровень считается и рисуется в _audio_callback."""
+        devices = sd.query_devices()  # один запрос к PortAudio на весь старт
+        device_idx, device_info = self._get_device_index(devices)
+        
+        # Определяем параметры устройства
+        if device_info is not None:
+            channels = min(device_info['max_input_channels'], 2)  # Максимум 2 канала для мониторинга
+            # Используем нативную частоту устройства
+            samplerate = int(device_info['default_samplerate'])
+        else:
+            channels = 1
+            samplerate = self.sample_rate
+        
+        logger.debug(f"Запуск мониторинга на устройстве: {device_idx}, каналов: {channels}, частота: {samplerate}")
+        
+        self._frames_per_tick = samplerate * self.RENDER_INTERVAL
+        self._frames_since_render = 0
+        self._decay_frames = 0
+        self._stream = sd.InputStream(
+            device=device_idx,
+            channels=channels,
+            samplerate=samplerate,
+            blocksize=self.block_size,
+            # Для индикатора хватает int16: вдвое меньше байт на блок, целочисленная сумма квадратов
+            dtype='int16',
+            callback=self._make_stream_callback(channels)
+        )
+        self._stream.start()
     
     def start(self) -> bool:
         """
@@ -243,20 +335,35 @@ class AudioLevelMonitor:
         self._running = True
         self._peak_level = 0.0
         
-        self._thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self._thread.start()
+        try:
+            self._open_stream()
+        except Exception as e:
+            logger.error(f"Ошибка мониторинга аудио: {e}")
+            self._running = False
+            self._close_stream()
+            return False
         
         logger.debug("Мониторинг уровня запущен")
         return True
     
+    def _close_stream(self) -> None:
+        """Остановить и закрыть InputStream."""
+        if self._stream:
+            try:
+                self._stream.stop()
+                self._stream.close()
+            except Exception as e:
+                logger.debug(f"Ошибка закрытия аудио потока: {e}")
+            self._stream = None
+    
     def stop(self):
         """Остановить мониторинг."""
+        was_running = self._running
         self._running = False
+        self._close_stream()
         
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=1.0)
-        
-        self._thread = None
+        if was_running:
+            print()  # Новая строка после индикатора
         logger.debug("Мониторинг уровня остановлен")
     
     def is_available(self) -> bool:
@@ -278,18 +385,18 @@ def list_audio_devices():
         print("sounddevice не установлен")
         return
     
-    print("\n📱 Доступные аудио устройства:")
-    print("-" * 60)
+    lines = ["\n📱 Доступные аудио устройства:", _SEPARATOR]
     
     devices = sd.query_devices()
+    default_input = sd.default.device[0]
     for i, dev in enumerate(devices):
         inputs = dev['max_input_channels']
-        outputs = dev['max_output_channels']
         
         if inputs > 0:  # Показываем только устройства ввода
-            default = " (default)" if i == sd.default.device[0] else ""
-            print(f"  [{i}] {dev['name']}{default}")
-            print(f"      Входы: {inputs}, Частота: {dev['default_samplerate']:.0f} Hz")
+            default = " (default)" if i == default_input else ""
+            lines.append(f"  [{i}] {dev['name']}{default}")
+            lines.append(f"      Входы: {inputs}, Частота: {dev['default_samplerate']:.0f} Hz")
     
-    print("-" * 60)
-
+    lines.append(_SEPARATOR)
+    # Одна запись в stdout вместо двух на каждое устройство
+    print("\n".join(lines))
@@ -17,10 +17,13 @@ BlackHole — виртуальный аудио драйвер, позволяю
     4. Записывать с BlackHole 2ch (там будет системный звук)
 """
 
+import re
+import time
 import platform
+import threading
 import subprocess
 import shutil
-from typing import Optional, List, Dict, Tuple
+from typing import Any, Callable, Optional, List, Dict, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -28,6 +31,25 @@ from .logging_setup import get_logger
 
 logger = get_logger()
 
+# Результаты system_profiler / ffmpeg -list_devices живут несколько секунд:
+# за один запуск CLI статус, поиск BlackHole и выбор устройства делят один вызов
+DEVICE_CACHE_TTL = 5.0
+_DEVICE_CACHE: Dict[str, Tuple[float, Any]] = {}
+
+# Строка устройства в выводе ffmpeg -list_devices: "[...] [<индекс>] <имя>"
+_DEVICE_LINE_RE = re.compile(r'\]\s*\[(\d+)\]\s*(.+?)\s*$')
+
+
+def _cached(key: str, loader: Callable[[], Any]) -> Any:
+    """Вернуть значение из кэша с TTL или вызвать loader()."""
+    now = time.monotonic()
+    entry = _DEVICE_CACHE.get(key)
+    if entry is not None and now - entry[0] < DEVICE_CACHE_TTL:
+        return entry[1]
+    value = loader()
+    _DEVICE_CACHE[key] = (now, value)
+    return value
+
 
 class CaptureMode(Enum):
     """Режим захвата аудио."""
@@ -53,7 +75,7 @@ def is_macos() -> bool:
 
 def check_blackhole_installed() -> bool:
     """
-    Проверить, установлен ли BlackHole.
+    Проверить, установлен ли BlackHole (результат кэшируется на DEVICE_CACHE_TTL).
     
     Returns:
         True если BlackHole найден в системе
@@ -61,6 +83,11 @@ def check_blackhole_installed() -> bool:
     if not is_macos():
         return False
     
+    return _cached('blackhole_installed', _probe_blackhole_installed)
+
+
+def _probe_blackhole_installed() -> bool:
+    """Проверка BlackHole через system_profiler / kextstat."""
     try:
         # Проверяем через system_profiler
         result = subprocess.run(
@@ -92,59 +119,119 @@ def list_audio_devices_avfoundation() -> List[AudioDevice]:
     """
     Получить список аудио устройств через ffmpeg (avfoundation).
     
+    Результат кэшируется на DEVICE_CACHE_TTL секунд.
+    
     Returns:
         Список AudioDevice
     """
+    return list(_cached('avfoundation_devices', _probe_avfoundation_devices))
+
+
+def _probe_avfoundation_devices() -> List[AudioDevice]:
+    """Запустить ffmpeg -list_devices и распарсить аудио устройства."""
     if not shutil.which("ffmpeg"):
         logger.warning("ffmpeg не найден")
         return []
     
+    # Читаем stderr построчно и останавливаем ffmpeg, как только секция
+    # аудио устройств закончилась — не ждём его завершения и не буферизуем вывод
     try:
-        result = subprocess.run(
-            ["ffmpeg", "-f", "avfoundation", "-list_devices", "true", "-i", ""],
-            capture_output=True,
+        proc = subprocess.Popen(
+            ["ffmpeg", "-hide_banner", "-loglevel", "info",
+             "-f", "avfoundation", "-list_devices", "true", "-i", ""],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,  # ffmpeg выводит в stderr
             text=True,
-            timeout=10
+            errors='ignore',
+            bufsize=1
         )
-        output = result.stderr  # ffmpeg выводит в stderr
     except Exception as e:
         logger.error(f"Ошибка получения списка устройств: {e}")
         return []
     
+    # Защита от зависшего ffmpeg (раньше — timeout=10 у subprocess.run)
+    watchdog = threading.Timer(10, proc.kill)
+    watchdog.start()
+    
     devices = []
     in_audio_section = False
     
-    for line in output.split('\n'):
-        # Ищем секцию аудио устройств
-        if "AVFoundation audio devices:" in line:
-            in_audio_section = True
-            continue
+    try:
+        for line in proc.stderr:
+            # Ищем секцию аудио устройств
+            if "AVFoundation audio devices:" in line:
+                in_audio_section = True
+                continue
+            
+            if not in_audio_section:
+                continue
+            
+            # Строка вида: [AVFoundation indev @ ...] [0] BlackHole 2ch
+            match = _DEVICE_LINE_RE.search(line)
+            if match is None:
+                # Первая строка не-устройство — секция аудио закончилась
+                break
+            
+            name = match.group(2)
+            devices.append(AudioDevice(
+                index=int(match.group(1)),
+                name=name,
+                is_input=True,
+                is_blackhole="blackhole" in name.lower()
+            ))
+    finally:
+        watchdog.cancel()
+        proc.kill()
+        proc.stderr.close()
+        proc.wait(timeout=1)
+    
+    return devices
+
+
+# Приоритеты имён: чем раньше в списке, тем предпочтительнее
+_BLACKHOLE_PRIORITY_NAMES = ["BlackHole 2ch", "BlackHole 16ch"]
+_AGGREGATE_PRIORITY_NAMES = [
+    "Multi-Output Device",
+    "Aggregate Device",
+    "Агрегатное устройство",
+    "Устройство с несколькими выходами",
+]
+# Ключевые слова Aggregate/Multi-Output (EN + RU), если точного имени нет
+_AGGREGATE_KEYWORDS = ["aggregate", "multi", "агрегат", "несколько"]
+
+
+def _classify_devices() -> Tuple[Optional[AudioDevice], Optional[AudioDevice]]:
+    """
+    Выбрать BlackHole и Aggregate устройства за один проход по списку.
+    
+    Returns:
+        (лучшее BlackHole устройство, лучшее Aggregate устройство)
+    """
+    blackhole, blackhole_rank = None, len(_BLACKHOLE_PRIORITY_NAMES) + 1
+    aggregate, aggregate_rank = None, len(_AGGREGATE_PRIORITY_NAMES) + 1
+    
+    for device in list_audio_devices_avfoundation():
+        # BlackHole: 2ch > 16ch > первое остальное
+        if device.is_blackhole:
+            if device.name in _BLACKHOLE_PRIORITY_NAMES:
+                rank = _BLACKHOLE_PRIORITY_NAMES.index(device.name)
+            else:
+                rank = len(_BLACKHOLE_PRIORITY_NAMES)
+            if rank < blackhole_rank:
+                blackhole, blackhole_rank = device, rank
         
-        if not in_audio_section:
+        # Aggregate: точное имя по приоритету > первое по ключевому слову
+        if device.name in _AGGREGATE_PRIORITY_NAMES:
+            rank = _AGGREGATE_PRIORITY_NAMES.index(device.name)
+        elif any(kw in device.name.lower() for kw in _AGGREGATE_KEYWORDS):
+            rank = len(_AGGREGATE_PRIORITY_NAMES)
+        else:
             continue
-        
-        # Парсим строку вида: [AVFoundation indev @ ...] [0] BlackHole 2ch
-        if "] [" in line and "]" in line:
-            try:
-                # Извлекаем индекс и имя
-                idx_start = line.rfind("] [") + 3
-                idx_end = line.find("]", idx_start)
-                if idx_start > 2 and idx_end > idx_start:
-                    index = int(line[idx_start:idx_end])
-                    name = line[idx_end + 2:].strip()
-                    
-                    is_blackhole = "blackhole" in name.lower()
-                    
-                    devices.append(AudioDevice(
-                        index=index,
-                        name=name,
-                        is_input=True,
-                        is_blackhole=is_blackhole
-                    ))
-            except (ValueError, IndexError) as e:
-                logger.debug(f"Не удалось распарсить строку устройства: {line}, {e}")
+        if rank < aggregate_rank:
+            aggregate, aggregate_rank = device, rank
     
-    return devices
+    return blackhole, aggregate
 
 
 def find_blackhole_device() -> Optional[AudioDevice]:
@@ -163,22 +250,11 @@ def find_blackhole_device() -> Optional[AudioDevice]:
         logger.debug("BlackHole доступен только на macOS")
         return None
     
-    devices = list_audio_devices_avfoundation()
-    blackhole_devices = [d for d in devices if d.is_blackhole]
-    
-    if not blackhole_devices:
+    device, _ = _classify_devices()
+    if device is None:
         logger.debug("BlackHole устройства не найдены")
         return None
     
-    # Приоритет: 2ch > 16ch > остальные
-    for priority_name in ["BlackHole 2ch", "BlackHole 16ch"]:
-        for device in blackhole_devices:
-            if device.name == priority_name:
-                logger.info(f"Найдено BlackHole устройство: {device.name} (:{device.index})")
-                return device
-    
-    # Возвращаем первое найденное
-    device = blackhole_devices[0]
     logger.info(f"Найдено BlackHole устройство: {device.name} (:{device.index})")
     return device
 
@@ -199,31 +275,10 @@ def find_aggregate_device() -> Optional[AudioDevice]:
     if not is_macos():
         return None
     
-    devices = list_audio_devices_avfoundation()
-    
-    # Ищем по приоритету (включая русские названия)
-    priority_names = [
-        "Multi-Output Device",
-        "Aggregate Device", 
-        "Агрегатное устройство",
-        "Устройство с несколькими выходами",
-    ]
-    
-    for name in priority_names:
-        for device in devices:
-            if device.name == name:
-                logger.info(f"Найдено Aggregate устройство: {device.name} (:{device.index})")
-                return device
-    
-    # Ищем по ключевым словам (EN + RU)
-    keywords = ["aggregate", "multi", "агрегат", "несколько"]
-    for device in devices:
-        name_lower = device.name.lower()
-        if any(kw in name_lower for kw in keywords):
-            logger.info(f"Найдено Aggregate устройство: {device.name} (:{device.index})")
-            return device
-    
-    return None
+    _, device = _classify_devices()
+    if device is not None:
+        logger.info(f"Найдено Aggregate устройство: {device.name} (:{device.index})")
+    return device
 
 
 def resolve_device_for_mode(
@@ -301,8 +356,10 @@ def get_blackhole_status() -> Dict[str, any]:
         status["message"] = "BlackHole доступен только на macOS"
         return status
     
+    # BlackHole и Aggregate Device — за один проход по списку устройств
+    bh, agg = _classify_devices()
+    
     # Проверяем BlackHole
-    bh = find_blackhole_device()
     if bh:
         status["blackhole_installed"] = True
         status["blackhole_device"] = {
@@ -312,7 +369,6 @@ def get_blackhole_status() -> Dict[str, any]:
         status["available_modes"].append(CaptureMode.SYSTEM.value)
     
     # Проверяем Aggregate Device
-    agg = find_aggregate_device()
     if agg:
         status["aggregate_device"] = {
             "index": agg.index,
@@ -331,47 +387,10 @@ def get_blackhole_status() -> Dict[str, any]:
     return status
 
 
-def print_blackhole_status():
-    """Вывести статус BlackHole в консоль."""
-    status = get_blackhole_status()
-    
-    print("\n🔊 BlackHole Status")
-    print("=" * 50)
-    print(f"Platform: {status['platform']}")
-    print(f"Status: {status['message']}")
-    
-    if status.get("blackhole_device"):
-        bh = status["blackhole_device"]
-        print(f"BlackHole: :{bh['index']} ({bh['name']})")
-    
-    if status.get("aggregate_device"):
-        agg = status["aggregate_device"]
-        print(f"Aggregate: :{agg['index']} ({agg['name']})")
-    
-    print(f"Available modes: {', '.join(status['available_modes'])}")
-    print("=" * 50)
-    
-    if not status.get("blackhole_installed"):
-        print("\n📦 Установка BlackHole:")
-        print("   brew install blackhole-2ch")
-        print("   # или: https://existential.audio/blackhole/")
-    
-    if status.get("blackhole_installed") and not status.get("aggregate_device"):
-        print("\n🔧 Настройка записи Mic + System:")
-        print("   1. Откройте 'Audio MIDI Setup' (Spotlight → Audio MIDI)")
-        print("   2. Нажмите '+' → 'Create Aggregate Device'")
-        print("   3. Включите галочки: микрофон + BlackHole 2ch")
-        print("   4. Используйте: --capture-mode both")
-    
-    if status.get("aggregate_device"):
-        print("\n⚠️  Важно для качества звука (избежание 'квакания'):")
-        print("   • Clock Source: выберите 'Built-in Microphone'")
-        print("   • Drift Correction: включите ТОЛЬКО для BlackHole 2ch")
-
+# Статический текст для print_blackhole_status / print_setup_instructions
+_STATUS_RULE = "=" * 50
 
-def print_setup_instructions():
-    """Вывести инструкции по настройке BlackHole."""
-    print("""
+_SETUP_GUIDE = """
 ╔══════════════════════════════════════════════════════════════════╗
 ║                    🎧 BlackHole Setup Guide                       ║
 ╠══════════════════════════════════════════════════════════════════╣
@@ -425,5 +444,47 @@ def print_setup_instructions():
 ║  --filter-preset full  : полная обработка с шумодавом             ║
 ║                                                                   ║
 ╚══════════════════════════════════════════════════════════════════╝
-""")
+"""
+
+
+def print_blackhole_status():
+    """Вывести статус BlackHole в консоль."""
+    status = get_blackhole_status()
+    
+    print("\n🔊 BlackHole Status")
+    print(_STATUS_RULE)
+    print(f"Platform: {status['platform']}")
+    print(f"Status: {status['message']}")
+    
+    if status.get("blackhole_device"):
+        bh = status["blackhole_device"]
+        print(f"BlackHole: :{bh['index']} ({bh['name']})")
+    
+    if status.get("aggregate_device"):
+        agg = status["aggregate_device"]
+        print(f"Aggregate: :{agg['index']} ({agg['name']})")
+    
+    print(f"Available modes: {', '.join(status['available_modes'])}")
+    print(_STATUS_RULE)
+    
+    if not status.get("blackhole_installed"):
+        print("\n📦 Установка BlackHole:")
+        print("   brew install blackhole-2ch")
+        print("   # или: https://existential.audio/blackhole/")
+    
+    if status.get("blackhole_installed") and not status.get("aggregate_device"):
+        print("\n🔧 Настройка записи Mic + System:")
+        print("   1. Откройте 'Audio MIDI Setup' (Spotlight → Audio MIDI)")
+        print("   2. Нажмите '+' → 'Create Aggregate Device'")
+        print("   3. Включите галочки: микрофон + BlackHole 2ch")
+        print("   4. Используйте: --capture-mode both")
+    
+    if status.get("aggregate_device"):
+        print("\n⚠️  Важно для качества звука (избежание 'квакания'):")
+        print("   • Clock Source: выберите 'Built-in Microphone'")
+        print("   • Drift Correction: включите ТОЛЬКО для BlackHole 2ch")
 
+
+def print_setup_instructions():
+    """Вывести инструкции по настройке BlackHole."""
+    print(_SETUP_GUIDE)
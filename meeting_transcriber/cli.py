@@ -4,30 +4,30 @@
 CLI интерфейс для системы записи и транскрипции совещаний.
 """
 
-import re
 import sys
-import datetime
 import argparse
 from pathlib import Path
 
-from .config import Config
+from .config import Config, ASR_BACKENDS
 from .logging_setup import setup_logging, get_logger
-from .recorder import MeetingRecorder
-from .transcriber import EnhancedTranscriber
-from .summarizer import check_summarizer_available
-from .blackhole import (
-    CaptureMode, 
-    resolve_device_for_mode, 
-    print_blackhole_status,
-    print_setup_instructions,
-    get_blackhole_status
-)
+from .utils import recording_base, resolve_summarize
 
-__version__ = "5.6.0"  # Улучшение качества записи: пресеты фильтров, мягкий шумодав
+from . import __version__
 
 
 def main():
     """Главная точка входа CLI."""
+    # Быстрые команды без построения дерева argparse (тот же вывод, что и у полного пути)
+    argv = sys.argv[1:]
+    if argv in (["--version"], ["-V"]):
+        print(f"{Path(sys.argv[0]).name} {__version__}")
+        sys.exit(0)
+    if argv == ["list-devices"]:
+        setup_logging(verbose=False, debug=False)
+        from .recorder import MeetingRecorder
+        MeetingRecorder().list_devices()
+        sys.exit(0)
+    
     parser = argparse.ArgumentParser(
         description=f"Meeting Recorder & Transcriber v{__version__}",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -194,7 +194,7 @@ BlackHole (запись системного звука, macOS):
     )
     p_tr.add_argument(
         "--backend", "-b",
-        choices=["groq", "auto", "faster", "whisper", "whisperx"],
+        choices=ASR_BACKENDS,
         help="Backend для транскрипции (по умолчанию из ASR_BACKEND)"
     )
     p_tr.add_argument(
@@ -218,6 +218,23 @@ BlackHole (запись системного звука, macOS):
         default="ru",
         help="Язык саммари (по умолчанию: ru)"
     )
+    p_tr.add_argument(
+        "--batch-size",
+        type=int,
+        metavar="N",
+        help="Размер батча faster-whisper (по умолчанию FASTER_BATCH_SIZE, 0/1 = без батчинга)"
+    )
+    p_tr.add_argument(
+        "--concurrency", "-j",
+        type=int,
+        metavar="N",
+        help="Одновременных запросов Groq для нескольких файлов (по умолчанию GROQ_CONCURRENCY)"
+    )
+    p_tr.add_argument(
+        "--stream",
+        action="store_true",
+        help="Печатать сегменты по мере распознавания (локальные faster/whisper)"
+    )
     
     # Команда: list-devices
     subparsers.add_parser(
@@ -248,10 +265,12 @@ BlackHole (запись системного звука, macOS):
     
     # Выполняем команду
     if args.command == "list-devices":
+        from .recorder import MeetingRecorder
         MeetingRecorder().list_devices()
         sys.exit(0)
     
     if args.command == "blackhole-status":
+        from .blackhole import print_blackhole_status, print_setup_instructions
         if getattr(args, 'setup', False):
             print_setup_instructions()
         else:
@@ -267,6 +286,11 @@ BlackHole (запись системного звука, macOS):
 
 def _handle_record(args, logger):
     """Обработка команды record."""
+    # Тяжёлые модули (numpy, faster-whisper) нужны только здесь — не грузим их для --version/list-devices
+    from .blackhole import CaptureMode, resolve_device_for_mode
+    from .recorder import MeetingRecorder
+    from .transcriber import EnhancedTranscriber
+    from .summarizer import check_summarizer_available
     
     # Определяем режим захвата и устройство
     capture_mode_str = getattr(args, 'capture_mode', None) or Config.CAPTURE_MODE
@@ -284,8 +308,7 @@ def _handle_record(args, logger):
     # Применяем пресет фильтров если указан
     filter_preset = getattr(args, 'filter_preset', None)
     if filter_preset:
-        if filter_preset in Config.FILTER_PRESETS:
-            Config.VOICE_FILTERS = Config.FILTER_PRESETS[filter_preset]
+        if Config.apply_filter_preset(filter_preset):
             logger.info(f"Применён пресет фильтров: {filter_preset}")
         else:
             logger.warning(f"Неизвестный пресет: {filter_preset}, используется по умолчанию")
@@ -308,8 +331,7 @@ def _handle_record(args, logger):
     rec = MeetingRecorder(enable_monitor=enable_monitor)
     
     # Безопасное имя файла
-    safe_name = re.sub(r'[^\w\s-]', '', args.name).strip().replace(' ', '_')
-    base = Config.RECORDINGS_FOLDER / f"{safe_name}_{datetime.datetime.now():%Y%m%d_%H%M}"
+    base = recording_base(Config.RECORDINGS_FOLDER, args.name)
     
     files = rec.record(base, device)
     
@@ -326,12 +348,7 @@ def _handle_record(args, logger):
     speakers = getattr(args, 'speakers', None)
     
     # Разрешаем summarize: --no-summarize > --summarize > None (использовать AUTO_SUMMARIZE)
-    if getattr(args, 'no_summarize', False):
-        summarize = False
-    elif getattr(args, 'summarize', False):
-        summarize = True
-    else:
-        summarize = None
+    summarize = resolve_summarize(getattr(args, 'summarize', False), getattr(args, 'no_summarize', False))
     
     # Проверяем доступность суммаризации ДО вывода сообщения
     will_summarize = summarize if summarize is not None else Config.AUTO_SUMMARIZE
@@ -365,20 +382,20 @@ def _handle_record(args, logger):
 
 def _handle_transcribe(args, logger):
     """Обработка команды transcribe."""
+    from .transcriber import EnhancedTranscriber
+    from .summarizer import check_summarizer_available
+    
     diarize = getattr(args, 'diarize', False)
     speakers = getattr(args, 'speakers', None)
     no_filter = getattr(args, 'no_filter', False)
     backend = getattr(args, 'backend', None)
     no_fallback = getattr(args, 'no_fallback', False)
     summary_lang = getattr(args, 'summary_lang', 'ru')
+    batch_size = getattr(args, 'batch_size', None)
+    concurrency = getattr(args, 'concurrency', None)
     
     # Разрешаем summarize: --no-summarize > --summarize > None (использовать AUTO_SUMMARIZE)
-    if getattr(args, 'no_summarize', False):
-        summarize = False
-    elif getattr(args, 'summarize', False):
-        summarize = True
-    else:
-        summarize = None  # Использовать Config.AUTO_SUMMARIZE
+    summarize = resolve_summarize(getattr(args, 'summarize', False), getattr(args, 'no_summarize', False))
     
     # Переопределяем backend если указан в аргументах
     if backend:
@@ -443,7 +460,10 @@ def _handle_transcribe(args, logger):
         max_speakers=max_sp,
         filter_hallucinations=not no_filter,
         summarize=summarize,
-        summary_language=summary_lang
+        summary_language=summary_lang,
+        batch_size=batch_size,
+        concurrency=concurrency,
+        stream=getattr(args, 'stream', False)
     )
     tr.transcribe_files(args.files)
     
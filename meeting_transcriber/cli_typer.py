@@ -10,34 +10,149 @@ Eventually will replace the old argparse-based CLI.
 import os
 import re
 import sys
-import datetime
+import importlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import List, Optional
 import typer
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.text import Text
-
-from .blackhole import (
-    get_blackhole_status,
-    CaptureMode,
-    resolve_device_for_mode,
-)
-from .recorder import MeetingRecorder
-from .transcriber import EnhancedTranscriber
-from .summarizer import check_summarizer_available
-from .groq_backend import check_groq_available
-from .config import Config
 
-__version__ = "5.6.0"
+from .config import Config, ASR_BACKENDS
+from .utils import recording_base, resolve_summarize
+
+from . import __version__
+
+# Тяжёлые зависимости команд (numpy, sounddevice, faster-whisper, urllib,
+# системные запросы blackhole) импортируются при первом обращении:
+# --help и --version их не загружают. Имена остаются атрибутами модуля и подменяются в тестах.
+_LAZY_IMPORTS = {
+    "get_blackhole_status": (".blackhole", "get_blackhole_status"),
+    "CaptureMode": (".blackhole", "CaptureMode"),
+    "resolve_device_for_mode": (".blackhole", "resolve_device_for_mode"),
+    "MeetingRecorder": (".recorder", "MeetingRecorder"),
+    "EnhancedTranscriber": (".transcriber", "EnhancedTranscriber"),
+    "TranscriptionDaemon": (".daemon", "TranscriptionDaemon"),
+    "transcribe_via_daemon": (".daemon", "transcribe_via_daemon"),
+    "check_summarizer_available": (".summarizer", "check_summarizer_available"),
+    "check_groq_available": (".groq_backend", "check_groq_available"),
+}
+
+
+def __getattr__(name: str):
+    """Ленивый импорт имён из _LAZY_IMPORTS (PEP 562)."""
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _LAZY_IMPORTS[name]
+    value = getattr(importlib.import_module(module_name, __package__), attr)
+    globals()[name] = value
+    return value
 
-# Initialize Typer app and Rich console
+
+def _lazy(name: str):
+    """Вернуть имя из _LAZY_IMPORTS: уже загруженное (или подменённое) либо импортировать."""
+    value = globals().get(name)
+    return value if value is not None else __getattr__(name)
+
+
+# Initialize Typer app
 app = typer.Typer(
     name="meeting-transcriber",
     help="Meeting Recorder & Transcriber with AI-powered transcription",
     add_completion=False,
 )
-console = Console()
+
+_CONSOLE = None
+
+# Теги разметки Rich ([green], [/], [bold red] ...) — то же правило, что в rich.markup
+_MARKUP_TAG_RE = re.compile(r'(?<!\\)\[[a-z#/@][^\[]*?\]')
+
+
+class _PlainConsole:
+    """
+    Вывод без терминала (пайп, CI, лог-файл).
+
+    Строки печатаются обычным print() без разметки Rich — без стилей,
+    подсветки и переноса; сам Rich для них не импортируется. Панели и
+    таблицы по-прежнему рисует Rich (без цвета), чтобы их содержимое не терялось.
+    """
+
+    def __init__(self):
+        self._rich = None
+
+    def print(self, *objects, **kwargs) -> None:
+        if all(isinstance(obj, str) for obj in objects):
+            print(*(_MARKUP_TAG_RE.sub('', obj).replace('\\[', '[') for obj in objects))
+            return
+        if self._rich is None:
+            from rich.console import Console
+            self._rich = Console(color_system=None, highlight=False)
+        self._rich.print(*objects, **kwargs)
+
+
+def _console():
+    """Console для вывода CLI, создаётся (и rich импортируется) при первом выводе."""
+    global _CONSOLE
+    if _CONSOLE is None:
+        if sys.stdout.isatty():
+            from rich.console import Console
+            _CONSOLE = Console()
+        else:
+            _CONSOLE = _PlainConsole()
+    return _CONSOLE
+
+
+# Подписи backend'ов и пресетов фильтров для таблиц transcribe/record
+_BACKEND_INFO = {
+    'groq': '🚀 Groq API (облако)',
+    'auto': '🔄 Auto (Groq → локальный)',
+    'faster': '💻 faster-whisper (локально)',
+    'whisper': '💻 openai-whisper (локально)',
+    'whisperx': '🎭 WhisperX (локально, с диаризацией)',
+}
+
+_VALID_BACKENDS = frozenset(ASR_BACKENDS)
+
+_PRESET_DESC = {
+    'raw': '🎚️  raw (минимум)',
+    'soft': '🎚️  soft (рекомендуется)',
+    'full': '🎚️  full (с шумодавом)',
+    'legacy': '🎚️  legacy (старый)',
+}
+
+
+def _check_backend(backend: Optional[str]) -> Optional[str]:
+    """
+    Отклонить неизвестный --backend до загрузки транскрайбера (и записи).
+
+    Args:
+        backend: Значение --backend из argv (или None)
+
+    Returns:
+        Интернированное имя backend'а (сравнения с константами идут по идентичности) или None
+    """
+    if not backend:
+        return None
+    if backend not in _VALID_BACKENDS:
+        raise typer.BadParameter(
+            f"{backend!r}, допустимо: {', '.join(ASR_BACKENDS)}",
+            param_hint="'--backend'",
+        )
+    return sys.intern(backend)
+
+
+def _check_files(files: List[Path]) -> None:
+    """Проверить, что все аргументы — существующие файлы (stat в потоках, одним проходом)."""
+    if len(files) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, len(files))) as pool:
+            present = list(pool.map(Path.is_file, files))
+    else:
+        present = [f.is_file() for f in files]
+    
+    missing = [str(f) for f, ok in zip(files, present) if not ok]
+    if missing:
+        raise typer.BadParameter(
+            f"файл не найден: {', '.join(missing)}",
+            param_hint="'FILES...'",
+        )
 
 
 @app.command(name="list-devices")
@@ -47,21 +162,23 @@ def list_devices():
 
     Использует ffmpeg для получения списка устройств записи.
     """
-    console.print()
-    console.print(
+    from rich.panel import Panel
+
+    _console().print()
+    _console().print(
         Panel(
             "[cyan]Получение списка аудио устройств...[/cyan]",
             title="🎤 Audio Devices",
             border_style="cyan"
         )
     )
-    console.print()
+    _console().print()
 
     try:
-        recorder = MeetingRecorder(enable_monitor=False)
+        recorder = _lazy("MeetingRecorder")(enable_monitor=False)
         recorder.list_devices()
     except Exception as e:
-        console.print(f"[red]❌ Ошибка:[/red] {e}")
+        _console().print(f"[red]❌ Ошибка:[/red] {e}")
         raise typer.Exit(code=1)
 
 
@@ -70,9 +187,6 @@ def transcribe(
     files: list[Path] = typer.Argument(
         ...,
         help="Путь к аудио файлу(ам)",
-        exists=True,
-        file_okay=True,
-        dir_okay=False,
     ),
     backend: str = typer.Option(
         None,
@@ -114,6 +228,22 @@ def transcribe(
         "--summary-lang",
         help="Язык саммари (ru/en)"
     ),
+    batch_size: int = typer.Option(
+        None,
+        "--batch-size",
+        help="Размер батча faster-whisper (по умолчанию FASTER_BATCH_SIZE, 0/1 = без батчинга)"
+    ),
+    concurrency: int = typer.Option(
+        None,
+        "--concurrency", "-j",
+        min=1,
+        help="Одновременных запросов Groq для нескольких файлов (по умолчанию GROQ_CONCURRENCY)"
+    ),
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        help="Печатать сегменты по мере распознавания (локальные faster/whisper)"
+    ),
 ):
     """
     Транскрибировать готовые аудио файлы.
@@ -125,13 +255,18 @@ def transcribe(
     - whisper: openai-whisper (локально)
     - whisperx: WhisperX с диаризацией (локально)
     """
-    # Разрешаем summarize: --no-summarize > --summarize > None
-    if no_summarize:
-        summarize_final = False
-    elif summarize:
-        summarize_final = True
-    else:
-        summarize_final = None  # Использовать Config.AUTO_SUMMARIZE
+    from rich.console import Group
+    from rich.table import Table
+
+    backend = _check_backend(backend)
+    _check_files(files)
+
+    # Настройки Config читаются один раз
+    auto_summarize = Config.AUTO_SUMMARIZE
+    effective_backend = backend or Config.ASR_BACKEND
+
+    # Разрешаем summarize: --no-summarize > --summarize > None (Config.AUTO_SUMMARIZE)
+    summarize_final = resolve_summarize(summarize, no_summarize)
 
     # Переопределяем backend если указан
     if backend:
@@ -143,34 +278,23 @@ def transcribe(
         os.environ['ASR_FALLBACK'] = '0'
         Config.ASR_FALLBACK = False
 
-    effective_backend = backend or Config.ASR_BACKEND
-
     # Проверяем доступность Groq API для транскрипции
-    if effective_backend in ('groq', 'auto') and not check_groq_available():
-        console.print()
-        console.print("[yellow]⚠️  Groq API недоступен (GROQ_API_KEY не установлен)[/yellow]")
+    if effective_backend in ('groq', 'auto') and not _lazy("check_groq_available")():
+        _console().print()
+        _console().print("[yellow]⚠️  Groq API недоступен (GROQ_API_KEY не установлен)[/yellow]")
         if effective_backend == 'groq':
-            console.print("[yellow]   Переключаюсь на faster-whisper[/yellow]")
+            _console().print("[yellow]   Переключаюсь на faster-whisper[/yellow]")
         elif effective_backend == 'auto':
-            console.print("[yellow]   Будет использован локальный faster-whisper[/yellow]")
+            _console().print("[yellow]   Будет использован локальный faster-whisper[/yellow]")
 
     # Красивый вывод информации о режиме
-    console.print()
-
-    # Backend info
-    backend_info = {
-        'groq': '🚀 Groq API (облако)',
-        'auto': '🔄 Auto (Groq → локальный)',
-        'faster': '💻 faster-whisper (локально)',
-        'whisper': '💻 openai-whisper (локально)',
-        'whisperx': '🎭 WhisperX (локально, с диаризацией)',
-    }
+    _console().print()
 
     info_table = Table(show_header=False, box=None, padding=(0, 2))
     info_table.add_column("Label", style="cyan")
     info_table.add_column("Value", style="white")
 
-    info_table.add_row("Backend", backend_info.get(effective_backend, effective_backend))
+    info_table.add_row("Backend", _BACKEND_INFO.get(effective_backend, effective_backend))
     info_table.add_row("Files", f"{len(files)} файл(ов)")
 
     if diarize:
@@ -179,47 +303,79 @@ def transcribe(
             info_table.add_row("  Спикеров", str(speakers))
 
     # Проверяем доступность суммаризации
-    will_summarize = summarize_final if summarize_final is not None else Config.AUTO_SUMMARIZE
-    if will_summarize and not check_summarizer_available():
-        console.print("[yellow]⚠️  Суммаризация запрошена, но GROQ_API_KEY не установлен — отключена[/yellow]")
+    will_summarize = summarize_final if summarize_final is not None else auto_summarize
+    if will_summarize and not _lazy("check_summarizer_available")():
+        _console().print("[yellow]⚠️  Суммаризация запрошена, но GROQ_API_KEY не установлен — отключена[/yellow]")
         summarize_final = False
     elif summarize_final is True:
         info_table.add_row("Суммаризация", f"🧠 Включена (язык: {summary_lang})")
     elif summarize_final is False:
         info_table.add_row("Суммаризация", "🧠 Отключена")
-    elif Config.AUTO_SUMMARIZE:
+    elif auto_summarize:
         info_table.add_row("Суммаризация", f"🧠 Авто (язык: {summary_lang})")
 
     if no_filter:
         info_table.add_row("Фильтрация", "⚠️  Отключена")
 
-    console.print(info_table)
-    console.print()
+    if batch_size is not None:
+        info_table.add_row("Batch size", str(batch_size) if batch_size > 1 else "выкл")
+
+    if concurrency is not None:
+        info_table.add_row("Concurrency", str(concurrency))
+
+    _console().print(Group(info_table, ""))
 
     # Передаём speakers как min и max для точного числа
     min_sp = max_sp = None
     if speakers is not None:
         if speakers < 1:
-            console.print(f"[yellow]⚠️  Некорректное число спикеров ({speakers}), игнорирую[/yellow]")
+            _console().print(f"[yellow]⚠️  Некорректное число спикеров ({speakers}), игнорирую[/yellow]")
         else:
             min_sp = max_sp = speakers
 
+    # Если запущен демон — используем его уже загруженную модель
+    # (--stream печатает в этот терминал, поэтому распознаём в своём процессе)
+    if not diarize and not stream:
+        response = _lazy("transcribe_via_daemon")(files, {
+            'filter_hallucinations': not no_filter,
+            'summarize': summarize_final,
+            'summary_language': summary_lang,
+            'batch_size': batch_size,
+            'concurrency': concurrency,
+            'fallback': False if no_fallback else None,
+        })
+        if response is not None:
+            success, total = response['success'], response['total']
+            _console().print()
+            if success == total:
+                _console().print(f"[green]✅ Транскрипция завершена (демон): {success}/{total}[/green]")
+            else:
+                style = "red" if success == 0 else "yellow"
+                _console().print(
+                    f"[{style}]⚠️  Транскрипция завершена с ошибками (демон): "
+                    f"успешно {success}/{total}, ошибок {total - success}[/{style}]"
+                )
+            return
+
     try:
-        tr = EnhancedTranscriber(
+        tr = _lazy("EnhancedTranscriber")(
             diarize=diarize,
             min_speakers=min_sp,
             max_speakers=max_sp,
             filter_hallucinations=not no_filter,
             summarize=summarize_final,
-            summary_language=summary_lang
+            summary_language=summary_lang,
+            batch_size=batch_size,
+            concurrency=concurrency,
+            stream=stream
         )
         tr.transcribe_files(files)
 
-        console.print()
-        console.print("[green]✅ Транскрипция завершена[/green]")
+        _console().print()
+        _console().print("[green]✅ Транскрипция завершена[/green]")
     except Exception as e:
-        console.print()
-        console.print(f"[red]❌ Ошибка:[/red] {e}")
+        _console().print()
+        _console().print(f"[red]❌ Ошибка:[/red] {e}")
         raise typer.Exit(code=1)
 
 
@@ -288,30 +444,32 @@ def record(
     - system: только системный звук (требует BlackHole)
     - both: микрофон + системный звук (требует Aggregate Device)
     """
-    console.print()
+    from rich.console import Group
+    from rich.table import Table
+
+    backend = _check_backend(backend)
+    _console().print()
 
     # Определяем режим захвата и устройство
     capture_mode_str = capture_mode or Config.CAPTURE_MODE
     try:
-        capture_mode_enum = CaptureMode(capture_mode_str)
+        capture_mode_enum = _lazy("CaptureMode")(capture_mode_str)
     except ValueError:
-        console.print(f"[red]❌ Некорректный режим захвата: {capture_mode_str}[/red]")
-        console.print("Доступные режимы: mic, system, both")
+        _console().print(f"[red]❌ Некорректный режим захвата: {capture_mode_str}[/red]")
+        _console().print("Доступные режимы: mic, system, both")
         raise typer.Exit(code=1)
 
     # Резолвим устройство
-    device_id, device_desc = resolve_device_for_mode(capture_mode_enum, device)
+    device_id, device_desc = _lazy("resolve_device_for_mode")(capture_mode_enum, device)
 
     if device_id is None:
-        console.print(f"[red]❌ {device_desc}[/red]")
+        _console().print(f"[red]❌ {device_desc}[/red]")
         raise typer.Exit(code=1)
 
     # Применяем пресет фильтров если указан
     if filter_preset:
-        if filter_preset in Config.FILTER_PRESETS:
-            Config.VOICE_FILTERS = Config.FILTER_PRESETS[filter_preset]
-        else:
-            console.print(f"[yellow]⚠️  Неизвестный пресет: {filter_preset}, используется по умолчанию[/yellow]")
+        if not Config.apply_filter_preset(filter_preset):
+            _console().print(f"[yellow]⚠️  Неизвестный пресет: {filter_preset}, используется по умолчанию[/yellow]")
             filter_preset = None
 
     # Красивый вывод информации о записи
@@ -325,13 +483,7 @@ def record(
 
     # Показываем текущий пресет
     current_preset = filter_preset or Config.FILTER_PRESET
-    preset_desc = {
-        'raw': '🎚️  raw (минимум)',
-        'soft': '🎚️  soft (рекомендуется)',
-        'full': '🎚️  full (с шумодавом)',
-        'legacy': '🎚️  legacy (старый)',
-    }
-    info_table.add_row("Фильтры", preset_desc.get(current_preset, current_preset))
+    info_table.add_row("Фильтры", _PRESET_DESC.get(current_preset, current_preset))
 
     if no_monitor:
         info_table.add_row("Мониторинг", "Отключён")
@@ -339,35 +491,33 @@ def record(
     if no_transcribe:
         info_table.add_row("Транскрипция", "⚠️  Пропущена (--no-transcribe)")
 
-    console.print(info_table)
-    console.print()
+    _console().print(Group(info_table, ""))
 
     # Создаём рекордер
     enable_monitor = not no_monitor
-    rec = MeetingRecorder(enable_monitor=enable_monitor)
+    rec = _lazy("MeetingRecorder")(enable_monitor=enable_monitor)
 
     # Безопасное имя файла
-    safe_name = re.sub(r'[^\w\s-]', '', name).strip().replace(' ', '_')
-    base = Config.RECORDINGS_FOLDER / f"{safe_name}_{datetime.datetime.now():%Y%m%d_%H%M}"
+    base = recording_base(Config.RECORDINGS_FOLDER, name)
 
-    console.print(f"[cyan]🎙️  Начинаем запись...[/cyan]")
+    _console().print(f"[cyan]🎙️  Начинаем запись...[/cyan]")
 
     try:
         files = rec.record(base, device_id)
 
         if not files:
-            console.print("[red]❌ Запись не удалась[/red]")
+            _console().print("[red]❌ Запись не удалась[/red]")
             raise typer.Exit(code=1)
 
-        console.print()
-        console.print(f"[green]✅ Запись сохранена:[/green] {files[0]}")
+        _console().print()
+        _console().print(f"[green]✅ Запись сохранена:[/green] {files[0]}")
 
         if no_transcribe:
-            console.print("[yellow]Транскрипция пропущена (--no-transcribe)[/yellow]")
+            _console().print("[yellow]Транскрипция пропущена (--no-transcribe)[/yellow]")
         else:
             # Транскрипция после записи
-            console.print()
-            console.print("[cyan]📝 Начинаем транскрипцию...[/cyan]")
+            _console().print()
+            _console().print("[cyan]📝 Начинаем транскрипцию...[/cyan]")
 
             # Переопределяем backend если указан
             if backend:
@@ -377,32 +527,27 @@ def record(
             effective_backend = backend or Config.ASR_BACKEND
 
             # Проверяем доступность Groq API для транскрипции
-            if effective_backend in ('groq', 'auto') and not check_groq_available():
-                console.print("[yellow]⚠️  Groq API недоступен (GROQ_API_KEY не установлен)[/yellow]")
+            if effective_backend in ('groq', 'auto') and not _lazy("check_groq_available")():
+                _console().print("[yellow]⚠️  Groq API недоступен (GROQ_API_KEY не установлен)[/yellow]")
                 if effective_backend == 'groq':
-                    console.print("[yellow]   Переключаюсь на faster-whisper[/yellow]")
+                    _console().print("[yellow]   Переключаюсь на faster-whisper[/yellow]")
                 elif effective_backend == 'auto':
-                    console.print("[yellow]   Будет использован локальный faster-whisper[/yellow]")
+                    _console().print("[yellow]   Будет использован локальный faster-whisper[/yellow]")
 
-            # Разрешаем summarize: --no-summarize > --summarize > None
-            if no_summarize:
-                summarize_final = False
-            elif summarize:
-                summarize_final = True
-            else:
-                summarize_final = None  # Использовать Config.AUTO_SUMMARIZE
+            # Разрешаем summarize: --no-summarize > --summarize > None (Config.AUTO_SUMMARIZE)
+            summarize_final = resolve_summarize(summarize, no_summarize)
 
             # Проверяем доступность суммаризации
             will_summarize = summarize_final if summarize_final is not None else Config.AUTO_SUMMARIZE
-            if will_summarize and not check_summarizer_available():
-                console.print("[yellow]⚠️  Суммаризация запрошена, но GROQ_API_KEY не установлен — отключена[/yellow]")
+            if will_summarize and not _lazy("check_summarizer_available")():
+                _console().print("[yellow]⚠️  Суммаризация запрошена, но GROQ_API_KEY не установлен — отключена[/yellow]")
                 summarize_final = False
 
             # Показываем информацию о транскрипции
             if diarize:
-                console.print(f"  🎭 С диаризацией спикеров{f' ({speakers})' if speakers else ''}")
+                _console().print(f"  🎭 С диаризацией спикеров{f' ({speakers})' if speakers else ''}")
             if summarize_final:
-                console.print("  🧠 С суммаризацией")
+                _console().print("  🧠 С суммаризацией")
 
             # Передаём speakers как min и max для точного числа
             min_sp = max_sp = None
@@ -410,7 +555,7 @@ def record(
                 min_sp = max_sp = speakers
 
             try:
-                tr = EnhancedTranscriber(
+                tr = _lazy("EnhancedTranscriber")(
                     diarize=diarize,
                     min_speakers=min_sp,
                     max_speakers=max_sp,
@@ -419,21 +564,40 @@ def record(
                 )
                 tr.transcribe_files(files)
 
-                console.print()
-                console.print("[green]✅ Транскрипция завершена[/green]")
+                _console().print()
+                _console().print("[green]✅ Транскрипция завершена[/green]")
             except Exception as transcribe_error:
-                console.print()
-                console.print(f"[red]❌ Ошибка транскрипции:[/red] {transcribe_error}")
+                _console().print()
+                _console().print(f"[red]❌ Ошибка транскрипции:[/red] {transcribe_error}")
                 # Не выходим с ошибкой, т.к. запись успешна
-                console.print("[yellow]⚠️  Запись сохранена, но транскрипция не удалась[/yellow]")
+                _console().print("[yellow]⚠️  Запись сохранена, но транскрипция не удалась[/yellow]")
 
     except KeyboardInterrupt:
-        console.print()
-        console.print("[yellow]⚠️  Запись прервана пользователем[/yellow]")
+        _console().print()
+        _console().print("[yellow]⚠️  Запись прервана пользователем[/yellow]")
         raise typer.Exit(code=130)
     except Exception as e:
-        console.print()
-        console.print(f"[red]❌ Ошибка:[/red] {e}")
+        _console().print()
+        _console().print(f"[red]❌ Ошибка:[/red] {e}")
+        raise typer.Exit(code=1)
+
+
+@app.command(name="daemon")
+def daemon():
+    """
+    Запустить демон транскрипции (модель остаётся загруженной).
+
+    Команда transcribe автоматически отправляет файлы запущенному
+    демону и не тратит время на загрузку модели при каждом вызове.
+    """
+    _console().print()
+    try:
+        _lazy("TranscriptionDaemon")().serve_forever()
+    except KeyboardInterrupt:
+        _console().print()
+        _console().print("[yellow]⚠️  Демон остановлен[/yellow]")
+    except Exception as e:
+        _console().print(f"[red]❌ Ошибка:[/red] {e}")
         raise typer.Exit(code=1)
 
 
@@ -457,9 +621,50 @@ def blackhole_status(
         _print_blackhole_status()
 
 
+# Статичные подсказки blackhole-status: собираются при первом выводе
+_STATUS_PANELS = None
+
+
+def _status_panels() -> dict:
+    """Собрать (и закэшировать) панели-подсказки для blackhole-status."""
+    global _STATUS_PANELS
+    if _STATUS_PANELS is not None:
+        return _STATUS_PANELS
+
+    from rich.panel import Panel
+
+    _STATUS_PANELS = {
+        "install": Panel(
+            "[yellow]brew install blackhole-2ch[/yellow]\n"
+            "или: https://existential.audio/blackhole/",
+            title="📦 Установка BlackHole",
+            border_style="yellow"
+        ),
+        "aggregate": Panel(
+            "1. Откройте 'Audio MIDI Setup' (Spotlight → Audio MIDI)\n"
+            "2. Нажмите '+' → 'Create Aggregate Device'\n"
+            "3. Включите галочки: микрофон + BlackHole 2ch\n"
+            "4. Используйте: [cyan]--capture-mode both[/cyan]",
+            title="🔧 Настройка записи Mic + System",
+            border_style="blue"
+        ),
+        "quality": Panel(
+            "• [yellow]Clock Source[/yellow]: выберите 'Built-in Microphone'\n"
+            "• [yellow]Drift Correction[/yellow]: включите ТОЛЬКО для BlackHole 2ch",
+            title="⚠️  Важно для качества звука (избежание 'квакания')",
+            border_style="yellow"
+        ),
+    }
+    return _STATUS_PANELS
+
+
 def _print_blackhole_status():
     """Вывести статус BlackHole с красивым форматированием через Rich."""
-    status = get_blackhole_status()
+    from rich.console import Group
+    from rich.table import Table
+    from rich.text import Text
+
+    status = _lazy("get_blackhole_status")()
 
     # Создаём таблицу статуса
     table = Table(title="🔊 BlackHole Status", show_header=False, box=None)
@@ -501,57 +706,46 @@ def _print_blackhole_status():
     modes = ", ".join(status["available_modes"])
     table.add_row("Available modes", modes)
 
-    console.print(table)
-    console.print()
+    output = [table, ""]
+    panels = _status_panels()
 
     # Инструкции по установке
     if not status.get("blackhole_installed"):
-        install_panel = Panel(
-            "[yellow]brew install blackhole-2ch[/yellow]\n"
-            "или: https://existential.audio/blackhole/",
-            title="📦 Установка BlackHole",
-            border_style="yellow"
-        )
-        console.print(install_panel)
-        console.print()
+        output += [panels["install"], ""]
 
     # Инструкции по настройке Aggregate Device
     if status.get("blackhole_installed") and not status.get("aggregate_device"):
-        aggregate_panel = Panel(
-            "1. Откройте 'Audio MIDI Setup' (Spotlight → Audio MIDI)\n"
-            "2. Нажмите '+' → 'Create Aggregate Device'\n"
-            "3. Включите галочки: микрофон + BlackHole 2ch\n"
-            "4. Используйте: [cyan]--capture-mode both[/cyan]",
-            title="🔧 Настройка записи Mic + System",
-            border_style="blue"
-        )
-        console.print(aggregate_panel)
-        console.print()
+        output += [panels["aggregate"], ""]
 
     # Важные советы по качеству
     if status.get("aggregate_device"):
-        quality_panel = Panel(
-            "• [yellow]Clock Source[/yellow]: выберите 'Built-in Microphone'\n"
-            "• [yellow]Drift Correction[/yellow]: включите ТОЛЬКО для BlackHole 2ch",
-            title="⚠️  Важно для качества звука (избежание 'квакания')",
-            border_style="yellow"
-        )
-        console.print(quality_panel)
+        output.append(panels["quality"])
 
+    # Весь вывод — одним print (одна запись в stdout)
+    _console().print(Group(*output))
+
+
+# Панели и таблица руководства по настройке статичны: собираются один раз
+_SETUP_GUIDE = None
 
-def _print_setup_instructions():
-    """Вывести подробные инструкции по настройке BlackHole."""
+
+def _setup_guide():
+    """Собрать (и закэшировать) руководство по настройке BlackHole одной группой Rich."""
+    global _SETUP_GUIDE
+    if _SETUP_GUIDE is not None:
+        return _SETUP_GUIDE
+
+    from rich.console import Group
+    from rich.panel import Panel
+    from rich.table import Table
 
     # Заголовок
-    console.print(
-        Panel(
-            "[bold cyan]BlackHole позволяет записывать системный звук на macOS.[/bold cyan]\n"
-            "Это полезно для транскрипции Zoom, Google Meet, Teams и др.",
-            title="🎧 BlackHole Setup Guide",
-            border_style="cyan"
-        )
+    header_panel = Panel(
+        "[bold cyan]BlackHole позволяет записывать системный звук на macOS.[/bold cyan]\n"
+        "Это полезно для транскрипции Zoom, Google Meet, Teams и др.",
+        title="🎧 BlackHole Setup Guide",
+        border_style="cyan"
     )
-    console.print()
 
     # Установка
     install_panel = Panel(
@@ -559,8 +753,6 @@ def _print_setup_instructions():
         title="📦 УСТАНОВКА",
         border_style="yellow"
     )
-    console.print(install_panel)
-    console.print()
 
     # Настройка Multi-Output
     multi_output_panel = Panel(
@@ -572,8 +764,6 @@ def _print_setup_instructions():
         title="🔧 НАСТРОЙКА: Multi-Output Device",
         border_style="blue"
     )
-    console.print(multi_output_panel)
-    console.print()
 
     # Настройка Aggregate
     aggregate_panel = Panel(
@@ -586,8 +776,6 @@ def _print_setup_instructions():
         title="🔧 НАСТРОЙКА: Aggregate Device (для mic + system)",
         border_style="blue"
     )
-    console.print(aggregate_panel)
-    console.print()
 
     # Использование
     usage_table = Table(title="📝 Использование", show_header=True, border_style="green")
@@ -611,8 +799,6 @@ def _print_setup_instructions():
         "Запись всех (рекомендуется)"
     )
 
-    console.print(usage_table)
-    console.print()
 
     # Системный звук через Multi-Output
     system_audio_panel = Panel(
@@ -622,13 +808,28 @@ def _print_setup_instructions():
         title="🔊 Настройка системного звука",
         border_style="magenta"
     )
-    console.print(system_audio_panel)
+
+    # Пустые строки между блоками — часть группы: весь вывод одним print
+    _SETUP_GUIDE = Group(
+        header_panel, "",
+        install_panel, "",
+        multi_output_panel, "",
+        aggregate_panel, "",
+        usage_table, "",
+        system_audio_panel,
+    )
+    return _SETUP_GUIDE
+
+
+def _print_setup_instructions():
+    """Вывести подробные инструкции по настройке BlackHole."""
+    _console().print(_setup_guide())
 
 
 def version_callback(value: bool):
     """Print version and exit."""
     if value:
-        console.print(f"Meeting Transcriber v{__version__}")
+        print(f"Meeting Transcriber v{__version__}")
         raise typer.Exit()
 
 
@@ -651,5 +852,39 @@ def main(
     pass
 
 
+# Команды без параметров (или только с булевыми флагами) вызываются напрямую,
+# минуя построение Click-команд и интроспекцию сигнатур Typer.
+# Всё остальное (transcribe, record, --help, ошибки разбора) — через app().
+COMMANDS = {
+    "list-devices": (list_devices, {}),
+    "blackhole-status": (blackhole_status, {"--setup": "setup"}),
+    "daemon": (daemon, {}),
+}
+
+
+def run(argv: Optional[List[str]] = None) -> None:
+    """
+    Точка входа CLI с быстрым путём для простых команд.
+
+    Args:
+        argv: Аргументы командной строки (по умолчанию sys.argv[1:])
+    """
+    args = sys.argv[1:] if argv is None else list(argv)
+
+    command = COMMANDS.get(args[0]) if args else None
+    if command is not None:
+        handler, flags = command
+        if all(arg in flags for arg in args[1:]):
+            kwargs = {param: False for param in flags.values()}
+            kwargs.update({flags[arg]: True for arg in args[1:]})
+            try:
+                handler(**kwargs)
+            except typer.Exit as e:
+                sys.exit(e.exit_code)
+            return
+
+    app(args)
+
+
 if __name__ == "__main__":
-    app()
+    run()
@@ -6,17 +6,93 @@
 
 import os
 from pathlib import Path
-from dotenv import load_dotenv
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping
 
 # Загружаем переменные из .env файла в корне проекта
-# (если файл существует и переменные ещё не установлены)
+# (если файл существует и переменные ещё не установлены).
+# python-dotenv импортируется только когда .env действительно есть
 project_root = Path(__file__).parent.parent
 dotenv_path = project_root / '.env'
 if dotenv_path.exists():
+    from dotenv import load_dotenv
     load_dotenv(dotenv_path)
 
+# os.environ — один объект на процесс; локальное имя избавляет от поиска атрибута
+# в каждом из десятков чтений при построении Config
+_ENV = os.environ
 
-class Config:
+
+def _physical_cores() -> int:
+    """Число физических ядер (psutil), иначе оценка логических / 2."""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        cores = psutil.cpu_count(logical=False)
+        if cores:
+            return cores
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+# Типы полей Config, которые можно передать процессу-воркеру (pickle)
+_SNAPSHOT_TYPES = (str, int, float, bool, Path, type(None))
+
+
+def _env_int(key: str, default: str) -> int:
+    """Целое значение переменной окружения (default — строка, как в .env)."""
+    return int(_ENV.get(key, default))
+
+
+# Пресеты аудио фильтров (для избежания "квакания" от агрессивного шумодава).
+# Неизменяемая таблица уровня модуля: выбор пресета — один поиск в словаре.
+_FILTER_PRESETS: Mapping[str, str] = MappingProxyType({
+    # raw: минимальная обработка, максимальное качество
+    'raw': 'highpass=f=80',
+    
+    # soft: мягкая обработка без шумодава (рекомендуется)
+    'soft': 'adeclick,highpass=f=80,lowpass=f=12000,'
+            'acompressor=threshold=-24dB:ratio=2:attack=10:release=150,'
+            'loudnorm=I=-16:TP=-1.5:LRA=11',
+    
+    # full: полная обработка с мягким шумодавом (anlmdn=s=3 вместо s=7)
+    'full': 'adeclick,highpass=f=80,lowpass=f=12000,anlmdn=s=3,'
+            'acompressor=threshold=-20dB:ratio=3:attack=5:release=100,'
+            'loudnorm=I=-16:TP=-1.5:LRA=11',
+    
+    # legacy: старые настройки (может давать "квакание")
+    'legacy': 'adeclick,highpass=f=80,lowpass=f=12000,anlmdn=s=7,'
+              'acompressor=threshold=-20dB:ratio=3:attack=5:release=100,'
+              'loudnorm=I=-16:TP=-1.5:LRA=11',
+})
+
+
+# Поддерживаемые ASR backend'ы (ASR_BACKEND, --backend)
+ASR_BACKENDS = ('groq', 'auto', 'faster', 'whisper', 'whisperx')
+
+# Поля Config, вычисление которых дороже чтения переменной окружения
+# (импорт psutil, опрос ядер): считаются при первом обращении и кэшируются
+_LAZY_FIELDS: Dict[str, Callable[[], Any]] = {
+    # По умолчанию — число физических ядер; FASTER_CPU_THREADS=1 включает однопоточный режим
+    'FASTER_CPU_THREADS': lambda: _env_int('FASTER_CPU_THREADS', str(_physical_cores())),
+}
+
+
+class _LazyConfigMeta(type):
+    """Метакласс Config: поля из _LAZY_FIELDS загружаются по требованию."""
+
+    def __getattr__(cls, name: str) -> Any:
+        loader = _LAZY_FIELDS.get(name)
+        if loader is None:
+            raise AttributeError(f"type object {cls.__name__!r} has no attribute {name!r}")
+        value = loader()
+        # Кэшируем в __dict__ класса: следующий доступ не дойдёт до __getattr__
+        setattr(cls, name, value)
+        return value
+
+
+class Config(metaclass=_LazyConfigMeta):
     """Централизованная конфигурация приложения."""
     
     # Папки для данных
@@ -25,79 +101,95 @@ class Config:
     LOGS_FOLDER = RECORDINGS_FOLDER / "logs"
 
     # Аудио запись
-    DEFAULT_FORMAT = os.environ.get('REC_FORMAT', 'wav').lower()    # wav|flac
-    DEFAULT_CHANNELS = os.environ.get('REC_CHANNELS', '2')          # '1'|'2'
-    DEFAULT_SAMPLE_RATE = os.environ.get('REC_RATE', '48000')
-    FLAC_LEVEL = os.environ.get('FLAC_LEVEL', '8')
-    PRE_RECORD_PROBE = int(os.environ.get('PRE_RECORD_PROBE', '3'))  # сек; 0 = без пробы
+    DEFAULT_FORMAT = _ENV.get('REC_FORMAT', 'wav').lower()    # wav|flac
+    DEFAULT_CHANNELS = _ENV.get('REC_CHANNELS', '2')          # '1'|'2'
+    DEFAULT_SAMPLE_RATE = _ENV.get('REC_RATE', '48000')
+    FLAC_LEVEL = _ENV.get('FLAC_LEVEL', '8')
+    PRE_RECORD_PROBE = _env_int('PRE_RECORD_PROBE', '3')  # сек; 0 = без пробы
+    PROBE_CACHE_TTL = _env_int('PROBE_CACHE_TTL', '3600')  # сек; успешная проба устройства не повторяется
     
-    # Пресеты аудио фильтров (для избежания "квакания" от агрессивного шумодава)
-    FILTER_PRESETS = {
-        # raw: минимальная обработка, максимальное качество
-        'raw': 'highpass=f=80',
-        
-        # soft: мягкая обработка без шумодава (рекомендуется)
-        'soft': 'adeclick,highpass=f=80,lowpass=f=12000,'
-                'acompressor=threshold=-24dB:ratio=2:attack=10:release=150,'
-                'loudnorm=I=-16:TP=-1.5:LRA=11',
-        
-        # full: полная обработка с мягким шумодавом (anlmdn=s=3 вместо s=7)
-        'full': 'adeclick,highpass=f=80,lowpass=f=12000,anlmdn=s=3,'
-                'acompressor=threshold=-20dB:ratio=3:attack=5:release=100,'
-                'loudnorm=I=-16:TP=-1.5:LRA=11',
-        
-        # legacy: старые настройки (может давать "квакание")
-        'legacy': 'adeclick,highpass=f=80,lowpass=f=12000,anlmdn=s=7,'
-                  'acompressor=threshold=-20dB:ratio=3:attack=5:release=100,'
-                  'loudnorm=I=-16:TP=-1.5:LRA=11',
-    }
+    FILTER_PRESETS = _FILTER_PRESETS  # только для чтения
     
     # Пресет фильтров по умолчанию: 'soft' — без шумодава, чистый звук
-    FILTER_PRESET = os.environ.get('FILTER_PRESET', 'soft').lower()
+    FILTER_PRESET = _ENV.get('FILTER_PRESET', 'soft').lower()
     
     # Кастомные фильтры (переопределяют пресет)
-    VOICE_FILTERS = os.environ.get('VOICE_FILTERS', FILTER_PRESETS.get(FILTER_PRESET, FILTER_PRESETS['soft']))
+    VOICE_FILTERS = _ENV.get('VOICE_FILTERS', _FILTER_PRESETS.get(FILTER_PRESET, _FILTER_PRESETS['soft']))
+    
+    # Модель RNNoise (.rnnn): если задана и ffmpeg поддерживает arnndn,
+    # дорогой anlmdn в цепочке заменяется на arnndn (в разы меньше CPU при записи)
+    RNNOISE_MODEL = _ENV.get('RNNOISE_MODEL', '')
+    # Во время записи — только лёгкие фильтры (highpass/lowpass/adeclick),
+    # тяжёлые (шумодав, компрессор, loudnorm) — отдельным проходом после записи
+    DEFER_HEAVY_FILTERS = _ENV.get('DEFER_HEAVY_FILTERS', '0') == '1'
 
     # ASR (Automatic Speech Recognition)
-    DEFAULT_MODEL = os.environ.get('WHISPER_MODEL', 'medium')
-    ASR_BACKEND = os.environ.get('ASR_BACKEND', 'faster').lower()   # faster|whisper|whisperx|groq|auto
-    ASR_DEVICE = os.environ.get('ASR_DEVICE', 'auto').lower()       # auto|cpu|cuda|mps|metal
-    FORCE_RU = (os.environ.get('FORCE_RU', '0') == '1')             # принудительно русский язык
+    DEFAULT_MODEL = _ENV.get('WHISPER_MODEL', 'medium')
+    ASR_BACKEND = _ENV.get('ASR_BACKEND', 'faster').lower()   # см. ASR_BACKENDS
+    ASR_DEVICE = _ENV.get('ASR_DEVICE', 'auto').lower()       # auto|cpu|cuda|mps|metal
+    FORCE_RU = (_ENV.get('FORCE_RU', '0') == '1')             # принудительно русский язык
+    # openai-whisper: torch.compile энкодера/декодера (PyTorch 2.x, первый вызов дольше из-за компиляции)
+    WHISPER_COMPILE = _ENV.get('WHISPER_COMPILE', '0') == '1'
     
     # Groq API настройки
-    GROQ_API_KEY = os.environ.get('GROQ_API_KEY', '')
-    GROQ_MODEL = os.environ.get('GROQ_MODEL', 'whisper-large-v3')  # whisper-large-v3|whisper-large-v3-turbo
-    GROQ_TIMEOUT = int(os.environ.get('GROQ_TIMEOUT', '300'))        # таймаут запроса в секундах
+    GROQ_API_KEY = _ENV.get('GROQ_API_KEY', '')
+    GROQ_MODEL = _ENV.get('GROQ_MODEL', 'whisper-large-v3')  # whisper-large-v3|whisper-large-v3-turbo
+    GROQ_TIMEOUT = _env_int('GROQ_TIMEOUT', '300')        # таймаут запроса в секундах
     GROQ_MAX_FILE_SIZE = 25 * 1024 * 1024                            # 25MB лимит Groq API
-    ASR_FALLBACK = os.environ.get('ASR_FALLBACK', '1') == '1'        # fallback на локальный при ошибке API
+    ASR_FALLBACK = _ENV.get('ASR_FALLBACK', '1') == '1'        # fallback на локальный при ошибке API
+    GROQ_CONCURRENCY = _env_int('GROQ_CONCURRENCY', '4')  # одновременных загрузок для нескольких файлов
     
     # LLM суммаризация через Groq
-    SUMMARIZER_MODEL = os.environ.get('SUMMARIZER_MODEL', 'llama-3.3-70b-versatile')  # LLM модель для саммари
-    SUMMARIZER_TIMEOUT = int(os.environ.get('SUMMARIZER_TIMEOUT', '120'))              # таймаут LLM запроса
-    SUMMARIZER_MAX_TOKENS = int(os.environ.get('SUMMARIZER_MAX_TOKENS', '4096'))       # макс. токенов ответа
-    AUTO_SUMMARIZE = os.environ.get('AUTO_SUMMARIZE', '0') == '1'                      # авто-суммаризация
+    SUMMARIZER_MODEL = _ENV.get('SUMMARIZER_MODEL', 'llama-3.3-70b-versatile')  # LLM модель для саммари
+    SUMMARIZER_TIMEOUT = _env_int('SUMMARIZER_TIMEOUT', '120')              # таймаут LLM запроса
+    SUMMARIZER_MAX_TOKENS = _env_int('SUMMARIZER_MAX_TOKENS', '4096')       # макс. токенов ответа
+    AUTO_SUMMARIZE = _ENV.get('AUTO_SUMMARIZE', '0') == '1'                      # авто-суммаризация
 
     # faster-whisper специфичные настройки
-    FASTER_COMPUTE = os.environ.get('FASTER_COMPUTE_TYPE', 'int8')  # int8|int8_float16|float16|float32
-    FASTER_BEAM_SIZE = int(os.environ.get('FASTER_BEAM_SIZE', '5'))
-    FASTER_VAD = os.environ.get('FASTER_VAD', '0') == '1'           # VAD по умолчанию выключен
-    FASTER_CPU_THREADS = int(os.environ.get('FASTER_CPU_THREADS', '1'))
+    # auto — CTranslate2 сам выбирает самый быстрый тип для устройства (int8 на CPU, int8_float16/float16 на GPU)
+    FASTER_COMPUTE = _ENV.get('FASTER_COMPUTE_TYPE', 'auto')  # auto|int8|int8_float16|float16|float32|int4
+    WHISPER_MODEL_DIR = _ENV.get('WHISPER_MODEL_DIR', '')     # папка с заранее сконвертированными CT2 моделями
+    # 0 — по итоговому compute_type: greedy (beam=1, в 3–4 раза быстрее) для int*, иначе 5
+    FASTER_BEAM_SIZE = _env_int('FASTER_BEAM_SIZE', '0')
+    FASTER_BEAM_SIZE_FALLBACK = _env_int('FASTER_BEAM_SIZE_FALLBACK', '5')  # повторный проход с VAD
+    # Контекст предыдущего окна: 0 — окна независимы (меньше памяти и зацикливаний)
+    FASTER_CONDITION_ON_PREV = _ENV.get('FASTER_CONDITION_ON_PREV', '0') == '1'
+    # Пословные таймкоды в JSON (+15–30% ко времени декодирования; TXT/SRT их не используют)
+    WORD_TIMESTAMPS = _ENV.get('WORD_TIMESTAMPS', '0') == '1'
+    FASTER_BATCH_SIZE = _env_int('FASTER_BATCH_SIZE', '0')  # BatchedInferencePipeline; 0/1 = выкл
+    FASTER_VAD = _ENV.get('FASTER_VAD', '0') == '1'           # VAD по умолчанию выключен
+    USE_SILERO_VAD = _ENV.get('USE_SILERO_VAD', '0') == '1'   # вырезать тишину перед первым проходом
+    # FASTER_CPU_THREADS — ленивое поле, см. _LAZY_FIELDS
+    # Параллельные куски одной модели (если батчевый режим выключен); потоки делятся между ними
+    FASTER_NUM_WORKERS = _env_int('FASTER_NUM_WORKERS', '1')
+    FASTER_PIN_PCORES = _ENV.get('FASTER_PIN_PCORES', '0') == '1'  # гибридные CPU: только P-ядра
+    # Аудио длиннее N сек декодируется в memmap на диске, а не в RAM (0 = всегда в RAM)
+    AUDIO_MEMMAP_MIN_SEC = _env_int('AUDIO_MEMMAP_MIN_SEC', '3600')
+    PARALLEL_FILES = _env_int('WHISPER_PARALLEL_FILES', '1')  # процессов для нескольких файлов
+
+    # Демон транскрипции (модель остаётся загруженной между вызовами)
+    # По умолчанию $XDG_RUNTIME_DIR/mt.sock (или временная папка)
+    DAEMON_SOCKET = _ENV.get('MT_DAEMON_SOCKET', '')
 
     # WhisperX специфичные настройки (диаризация)
-    HF_TOKEN = os.environ.get('HF_TOKEN', '')                       # HuggingFace токен для pyannote
-    WHISPERX_COMPUTE = os.environ.get('WHISPERX_COMPUTE', 'float16')  # float16|int8
-    WHISPERX_BATCH_SIZE = int(os.environ.get('WHISPERX_BATCH_SIZE', '16'))
-    WHISPERX_LANGUAGE = os.environ.get('WHISPERX_LANGUAGE', 'ru')   # язык по умолчанию
-    DIARIZE_MIN_SPEAKERS = os.environ.get('DIARIZE_MIN_SPEAKERS')   # hint: мин. спикеров
-    DIARIZE_MAX_SPEAKERS = os.environ.get('DIARIZE_MAX_SPEAKERS')   # hint: макс. спикеров
+    HF_TOKEN = _ENV.get('HF_TOKEN', '')                       # HuggingFace токен для pyannote
+    WHISPERX_COMPUTE = _ENV.get('WHISPERX_COMPUTE', 'float16')  # float16|int8
+    WHISPERX_BATCH_SIZE = _env_int('WHISPERX_BATCH_SIZE', '16')
+    WHISPERX_LANGUAGE = _ENV.get('WHISPERX_LANGUAGE', 'ru')   # язык по умолчанию
+    DIARIZE_MIN_SPEAKERS = _ENV.get('DIARIZE_MIN_SPEAKERS')   # hint: мин. спикеров
+    DIARIZE_MAX_SPEAKERS = _ENV.get('DIARIZE_MAX_SPEAKERS')   # hint: макс. спикеров
     
     # BlackHole интеграция (macOS)
     # Режим захвата: mic = микрофон, system = системный звук, both = оба
-    CAPTURE_MODE = os.environ.get('CAPTURE_MODE', 'both').lower()   # mic|system|both (both для встреч)
-    BLACKHOLE_DEVICE = os.environ.get('BLACKHOLE_DEVICE', '')       # авто или явный ID
+    CAPTURE_MODE = _ENV.get('CAPTURE_MODE', 'both').lower()   # mic|system|both (both для встреч)
+    BLACKHOLE_DEVICE = _ENV.get('BLACKHOLE_DEVICE', '')       # авто или явный ID
+
+    # Выходные файлы
+    JSON_COMPACT = _ENV.get('JSON_COMPACT', '0') == '1'        # JSON без отступов (~вдвое меньше)
+    LIVE_TRANSCRIPT = _ENV.get('LIVE_TRANSCRIPT', '0') == '1'  # писать *.partial.txt по ходу ASR
 
     # Отладка
-    DEBUG_SEGMENTS = os.environ.get('DEBUG_SEGMENTS', '0') == '1'
+    DEBUG_SEGMENTS = _ENV.get('DEBUG_SEGMENTS', '0') == '1'
     
     @classmethod
     def ensure_directories(cls) -> None:
@@ -106,3 +198,35 @@ class Config:
         cls.TRANSCRIPTS_FOLDER.mkdir(parents=True, exist_ok=True)
         cls.LOGS_FOLDER.mkdir(parents=True, exist_ok=True)
 
+    @classmethod
+    def apply_filter_preset(cls, preset: str) -> bool:
+        """
+        Применить пресет аудио фильтров к VOICE_FILTERS.
+
+        Args:
+            preset: Имя пресета (raw|soft|full|legacy)
+
+        Returns:
+            False, если пресет неизвестен (VOICE_FILTERS не меняется)
+        """
+        filters = cls.FILTER_PRESETS.get(preset)
+        if filters is None:
+            return False
+        cls.VOICE_FILTERS = filters
+        return True
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Any]:
+        """
+        Скалярные поля конфигурации для передачи в процессы-воркеры.
+
+        Таблицы вроде FILTER_PRESETS не входят: они не зависят от окружения
+        и в воркере уже есть (а MappingProxyType не сериализуется pickle).
+
+        Returns:
+            Словарь {ИМЯ_ПОЛЯ: значение}
+        """
+        return {
+            k: v for k, v in vars(cls).items()
+            if k.isupper() and isinstance(v, _SNAPSHOT_TYPES)
+        }
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+Демон транскрипции: держит модель загруженной между вызовами CLI.
+
+Запуск (в отдельном терминале):
+    python3 -m meeting_transcriber daemon
+
+После этого `transcribe` сначала пробует отправить файлы демону
+и только если он недоступен — загружает модель в своём процессе.
+
+Протокол: Unix socket (SOCK_STREAM), один JSON объект на строку.
+    запрос:  {"files": [...], "backend": "faster",
+              "settings": {"model": ..., "language": ..., "compute_type": ...},
+              "options": {...}}
+    ответ:   {"ok": true, "success": 1, "total": 1}
+             {"ok": false, "error": "..."}
+"""
+
+import os
+import json
+import socket
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .config import Config
+from .logging_setup import get_logger
+from .transcriber import EnhancedTranscriber
+
+logger = get_logger()
+
+# Таймаут подключения клиента (сама транскрипция может идти сколько угодно)
+CONNECT_TIMEOUT = 2.0
+
+
+def _fallback_socket_dir() -> Path:
+    """Личная папка сокета во временной папке (общей для всех пользователей)."""
+    return Path(tempfile.gettempdir()) / f"mt-{os.getuid()}"
+
+
+def get_socket_path() -> Path:
+    """
+    Путь к сокету демона.
+
+    Returns:
+        MT_DAEMON_SOCKET, иначе $XDG_RUNTIME_DIR/mt.sock
+        (или mt.sock в личной подпапке временной папки)
+    """
+    if Config.DAEMON_SOCKET:
+        return Path(Config.DAEMON_SOCKET)
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return Path(runtime_dir) / "mt.sock"
+    return _fallback_socket_dir() / "mt.sock"
+
+
+def _owned_by_user(path: Path) -> bool:
+    """Путь существует и принадлежит текущему пользователю."""
+    try:
+        return path.stat().st_uid == os.getuid()
+    except OSError:
+        return False
+
+
+def model_settings() -> Dict[str, Any]:
+    """
+    Параметры, от которых зависит результат загруженной модели.
+
+    Клиент с другими настройками не должен получать ответ чужой модели:
+    демон сравнивает их со своими и при расхождении отказывает.
+
+    Returns:
+        Словарь {model, language, compute_type}
+    """
+    return {
+        'model': Config.DEFAULT_MODEL,
+        'language': 'ru' if Config.FORCE_RU else None,
+        'compute_type': Config.FASTER_COMPUTE,
+    }
+
+
+class TranscriptionDaemon:
+    """Сервер, обслуживающий запросы на транскрипцию тёплой моделью."""
+
+    def __init__(self, socket_path: Optional[Path] = None):
+        """
+        Args:
+            socket_path: Путь к Unix сокету (по умолчанию get_socket_path())
+        """
+        self.socket_path = socket_path or get_socket_path()
+        self.backend = Config.ASR_BACKEND
+        self.settings = model_settings()
+        self.fallback = Config.ASR_FALLBACK
+        self.transcriber: Optional[EnhancedTranscriber] = None
+
+    def _check_not_running(self) -> None:
+        """Убрать устаревший сокет или упасть, если демон уже запущен."""
+        if not self.socket_path.exists():
+            return
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(str(self.socket_path))
+            except OSError:
+                # Сокет остался от упавшего процесса
+                self.socket_path.unlink()
+                return
+        raise RuntimeError(f"Демон уже запущен: {self.socket_path}")
+
+    def _prepare_socket_dir(self) -> None:
+        """Создать личную папку 0700 для сокета, если он лежит во временной папке."""
+        socket_dir = self.socket_path.parent
+        if socket_dir != _fallback_socket_dir():
+            return
+        socket_dir.mkdir(mode=0o700, exist_ok=True)
+        # Папку мог заранее создать другой пользователь
+        if not _owned_by_user(socket_dir) or socket_dir.stat().st_mode & 0o077:
+            raise RuntimeError(f"Небезопасная папка сокета (чужая или доступна другим): {socket_dir}")
+
+    def serve_forever(self) -> None:
+        """Загрузить модель и обрабатывать запросы до Ctrl+C."""
+        self._prepare_socket_dir()
+        self._check_not_running()
+
+        self.transcriber = EnhancedTranscriber()
+        if self.transcriber.backend != 'groq':
+            self.transcriber._load_model()
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            # Сокет создаётся сразу с правами 0600, без окна с правами по umask
+            old_umask = os.umask(0o177)
+            try:
+                server.bind(str(self.socket_path))
+            finally:
+                os.umask(old_umask)
+            server.listen(1)
+
+            logger.info(f"🟢 Демон слушает {self.socket_path} (backend={self.backend})")
+            print(f"🟢 Демон готов: {self.socket_path} (Ctrl+C для остановки)")
+
+            try:
+                while True:
+                    conn, _ = server.accept()
+                    with conn:
+                        self._handle(conn)
+            finally:
+                self.socket_path.unlink(missing_ok=True)
+                logger.info("Демон остановлен")
+
+    def _handle(self, conn: socket.socket) -> None:
+        """Обработать одно подключение: прочитать запрос, ответить одной строкой."""
+        # Клиент мог уйти (Ctrl+C), пока шла транскрипция: оборванное соединение
+        # не должно останавливать демон
+        try:
+            with conn.makefile('rwb') as stream:
+                try:
+                    request = json.loads(stream.readline())
+                    response = self._process(request)
+                except ValueError as e:
+                    response = {'ok': False, 'error': f"Некорректный запрос: {e}"}
+                except Exception as e:
+                    logger.error(f"Ошибка обработки запроса демоном: {e}", exc_info=True)
+                    response = {'ok': False, 'error': str(e)}
+
+                stream.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b"\n")
+                stream.flush()
+        except OSError as e:
+            logger.warning(f"Соединение с клиентом оборвано: {e}")
+
+    def _process(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Выполнить запрос на транскрипцию.
+
+        Args:
+            request: Распарсенный JSON запрос
+
+        Returns:
+            Ответ для клиента
+        """
+        # Демон обслуживает только свой backend; остальное клиент сделает сам
+        if request.get('backend') != self.backend:
+            return {'ok': False, 'error': f"backend демона: {self.backend}"}
+        if request.get('settings') != self.settings:
+            return {'ok': False, 'error': f"настройки модели демона: {self.settings}"}
+
+        options = request.get('options') or {}
+        if options.get('diarize'):
+            return {'ok': False, 'error': "диаризация не поддерживается демоном"}
+
+        files = [Path(f) for f in request.get('files') or []]
+        if not files:
+            return {'ok': False, 'error': "пустой список файлов"}
+
+        tr = self.transcriber
+        tr.filter_hallucinations = options.get('filter_hallucinations', True)
+        summarize = options.get('summarize')
+        tr.summarize = summarize if summarize is not None else Config.AUTO_SUMMARIZE
+        tr.summary_language = options.get('summary_language', 'ru')
+        # Батчевый пайплайн создан при загрузке модели; 0/1 отключает его для этого запроса
+        batch_size = options.get('batch_size')
+        tr.batch_size = batch_size if batch_size is not None else Config.FASTER_BATCH_SIZE
+        concurrency = options.get('concurrency')
+        tr.concurrency = concurrency if concurrency is not None else Config.GROQ_CONCURRENCY
+        # --no-fallback клиента действует только на этот запрос
+        fallback = options.get('fallback')
+        Config.ASR_FALLBACK = fallback if fallback is not None else self.fallback
+
+        success = tr.transcribe_files(files)
+        return {'ok': True, 'success': success, 'total': len(files)}
+
+
+def transcribe_via_daemon(files: List[Path], options: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Отправить файлы запущенному демону.
+
+    Args:
+        files: Список аудио файлов
+        options: Параметры EnhancedTranscriber (filter_hallucinations, summarize, ...)
+
+    Returns:
+        Ответ демона или None, если демон не запущен или отказал
+    """
+    socket_path = get_socket_path()
+    if not socket_path.exists():
+        return None
+    # Файлы отправляем только своему демону, а не процессу, подложившему сокет
+    if not _owned_by_user(socket_path):
+        logger.warning(f"Сокет демона принадлежит другому пользователю, игнорирую: {socket_path}")
+        return None
+
+    request = {
+        'files': [str(Path(f).resolve()) for f in files],
+        'backend': Config.ASR_BACKEND,
+        'settings': model_settings(),
+        'options': options,
+    }
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(socket_path))
+            sock.settimeout(None)
+            sock.sendall(json.dumps(request, ensure_ascii=False).encode('utf-8') + b"\n")
+            with sock.makefile('rb') as stream:
+                response = json.loads(stream.readline())
+    except (OSError, ValueError) as e:
+        logger.debug(f"Демон недоступен ({socket_path}): {e}")
+        return None
+
+    if not response.get('ok'):
+        logger.info(f"Демон отклонил запрос: {response.get('error')}")
+        return None
+
+    return response
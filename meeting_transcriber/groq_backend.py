@@ -10,6 +10,7 @@ Groq предоставляет бесплатный и очень быстры
     ASR_BACKEND=groq meeting-transcriber transcribe file.wav
 """
 
+import io
 import os
 import time
 import json
@@ -19,16 +20,48 @@ from pathlib import Path
 from typing import Optional, Dict, Any, List, Tuple
 from urllib.request import Request, urlopen
 from urllib.error import HTTPError, URLError
-from http.client import HTTPResponse
 
 from .config import Config
 from .logging_setup import get_logger
+from .utils import ffmpeg_has_encoder, get_audio_duration, probe_audio_bitrate, probe_audio_params
 
 logger = get_logger()
 
 # Groq API endpoints
 GROQ_API_URL = "https://api.groq.com/openai/v1/audio/transcriptions"
 
+# Повторы при 429 (параллельные загрузки упираются в минутный лимит запросов)
+RATE_LIMIT_RETRIES = 2
+RATE_LIMIT_MAX_WAIT = 60  # сек; дольше ждать нет смысла — вероятно исчерпан дневной лимит
+ERROR_BODY_LIMIT = 4096  # байт; тело ошибки нужно только для лога
+
+# Сжатые кодеки, которые Groq принимает как есть: достаточно перепаковать
+# дорожку (-c:a copy) в подходящий контейнер — (формат ffmpeg, расширение)
+REMUX_CONTAINERS = {
+    'mp3': ('mp3', '.mp3'),
+    'aac': ('ipod', '.m4a'),
+    'opus': ('webm', '.webm'),
+}
+
+# Кодирование загрузки: (кодек ffmpeg, расширение, битрейт для речи, минимум kbps).
+# Opus в режиме voip на 16k не хуже mp3 64k для распознавания речи;
+# mp3 — только если ffmpeg собран без libopus
+UPLOAD_OPUS = ('libopus', '.ogg', 16, 8)
+UPLOAD_MP3 = ('libmp3lame', '.mp3', 32, 16)
+
+# Форматы, которые Groq принимает без конвертации
+GROQ_READY_SUFFIXES = ('.mp3', '.m4a', '.webm', '.ogg')
+
+# Content-Type файла в multipart запросе по расширению
+CONTENT_TYPES = {
+    '.mp3': 'audio/mpeg',
+    '.m4a': 'audio/mp4',
+    '.webm': 'audio/webm',
+    '.ogg': 'audio/ogg',
+    '.wav': 'audio/wav',
+    '.flac': 'audio/flac',
+}
+
 
 class GroqRateLimitError(Exception):
     """Исключение при превышении лимитов Groq API."""
@@ -40,6 +73,51 @@ class GroqAPIError(Exception):
     pass
 
 
+class MultipartBody(io.RawIOBase):
+    """
+    Тело multipart/form-data, читаемое потоком: заголовок, файл, хвост.
+    
+    Аудио (до 25MB) не загружается в память и не копируется в общий
+    bytes объект: urllib читает тело блоками прямо из файла.
+    """
+    
+    def __init__(self, header: bytes, file_path: Path, footer: bytes):
+        """
+        Args:
+            header: Поля формы до содержимого файла
+            file_path: Загружаемый файл
+            footer: Поля формы после файла и закрывающий boundary
+        """
+        super().__init__()
+        self.content_length = len(header) + file_path.stat().st_size + len(footer)
+        self._parts = [io.BytesIO(header), open(file_path, 'rb'), io.BytesIO(footer)]
+        self._index = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            return b"".join(part.read() for part in self._parts[self._index:])
+        while self._index < len(self._parts):
+            data = self._parts[self._index].read(size)
+            if data:
+                return data
+            self._index += 1
+        return b""
+    
+    def rewind(self) -> None:
+        """Вернуться в начало тела (повторная отправка после 429)."""
+        for part in self._parts:
+            part.seek(0)
+        self._index = 0
+    
+    def close(self) -> None:
+        for part in self._parts:
+            part.close()
+        super().close()
+
+
 class GroqTranscriber:
     """
     Транскрибер на базе Groq API.
@@ -83,58 +161,104 @@ class GroqTranscriber:
         """
         Подготовить аудио для Groq API.
         
-        Groq принимает: mp3, mp4, mpeg, mpga, m4a, wav, webm
-        Конвертируем в mp3 для уменьшения размера.
+        Groq принимает: flac, mp3, mp4, mpeg, mpga, m4a, ogg, wav, webm.
+        Сжатая дорожка подходящего кодека перепаковывается без перекодирования
+        (например, aac из видео), остальное кодируется в Opus (или mp3 без
+        libopus) за один проход с битрейтом, подогнанным под лимит 25MB.
         
         Returns:
             Tuple[путь к файлу, нужно ли удалять после]
         """
         # Если файл уже подходящего формата и размера
         suffix = audio_path.suffix.lower()
-        if suffix in ('.mp3', '.m4a', '.webm') and self._check_file_size(audio_path):
+        if suffix in GROQ_READY_SUFFIXES and self._check_file_size(audio_path):
             return audio_path, False
         
-        # Конвертируем в mp3 для уменьшения размера
-        logger.info("Конвертация в mp3 для Groq API...")
+        duration = get_audio_duration(audio_path)
+        _, _, codec = probe_audio_params(audio_path)
         
-        temp_file = Path(tempfile.gettempdir()) / f"groq_upload_{int(time.time())}.mp3"
+        # Дорожка уже сжата подходящим кодеком и влезает в лимит — только ремукс
+        container = REMUX_CONTAINERS.get(codec)
+        if container and duration:
+            track_size = probe_audio_bitrate(audio_path) * duration / 8
+            if 0 < track_size <= Config.GROQ_MAX_FILE_SIZE * 0.95:
+                fmt, ext = container
+                remuxed = self._run_ffmpeg(
+                    audio_path, ext, "Перепаковка аудио дорожки для Groq API (без перекодирования)...",
+                    ["-vn", "-c:a", "copy", "-f", fmt]
+                )
+                if remuxed and self._check_file_size(remuxed):
+                    return remuxed, True
+                if remuxed:
+                    remuxed.unlink(missing_ok=True)
         
-        try:
-            subprocess.run([
-                "ffmpeg", "-y", "-i", str(audio_path),
-                "-ar", "16000",       # 16kHz достаточно для speech
-                "-ac", "1",           # mono
-                "-b:a", "64k",        # 64kbps достаточно для речи
-                "-nostdin",
-                str(temp_file)
-            ], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            
-            if not self._check_file_size(temp_file):
-                # Если всё ещё большой, пробуем более агрессивное сжатие
-                subprocess.run([
-                    "ffmpeg", "-y", "-i", str(audio_path),
-                    "-ar", "16000", "-ac", "1", "-b:a", "32k",
-                    "-nostdin",
-                    str(temp_file)
-                ], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            
-            return temp_file, True
+        # Один проход кодирования: битрейт сразу подбирается под лимит
+        codec, ext, kbps, min_kbps = UPLOAD_OPUS if ffmpeg_has_encoder('libopus') else UPLOAD_MP3
+        if duration:
+            fit_kbps = int(Config.GROQ_MAX_FILE_SIZE * 8 / duration / 1000 * 0.9)
+            kbps = max(min_kbps, min(kbps, fit_kbps))
+        
+        args = [
+            "-vn",
+            "-ar", "16000",       # 16kHz достаточно для speech
+            "-ac", "1",           # mono
+            "-c:a", codec,
+            "-b:a", f"{kbps}k",
+        ]
+        if codec == 'libopus':
+            args += ["-vbr", "on", "-application", "voip"]
+        
+        encoded = self._run_ffmpeg(
+            audio_path, ext, f"Конвертация ({codec} {kbps}k) для Groq API...", args
+        )
+        if encoded:
+            return encoded, True
+        
+        # Пробуем отправить как есть
+        return audio_path, False
+    
+    @staticmethod
+    def _run_ffmpeg(audio_path: Path, suffix: str, message: str, args: List[str]) -> Optional[Path]:
+        """
+        Записать audio_path во временный файл через ffmpeg.
+        
+        Args:
+            audio_path: Исходный файл
+            suffix: Расширение временного файла
+            message: Сообщение в лог перед запуском
+            args: Параметры кодирования ffmpeg (между входом и выходом)
             
+        Returns:
+            Путь к временному файлу или None при ошибке ffmpeg
+        """
+        logger.info(message)
+        
+        # Уникальное имя: несколько файлов могут конвертироваться одновременно
+        fd, temp_name = tempfile.mkstemp(prefix="groq_upload_", suffix=suffix)
+        os.close(fd)
+        temp_file = Path(temp_name)
+        
+        try:
+            subprocess.run(
+                ["ffmpeg", "-y", "-i", str(audio_path), *args, "-nostdin", str(temp_file)],
+                check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            return temp_file
         except subprocess.CalledProcessError as e:
             logger.error(f"Ошибка конвертации: {e}")
-            # Пробуем отправить как есть
-            return audio_path, False
+            temp_file.unlink(missing_ok=True)
+            return None
     
     def _create_multipart_data(
         self, 
         file_path: Path, 
         language: Optional[str]
-    ) -> Tuple[bytes, str]:
+    ) -> Tuple[MultipartBody, str]:
         """
         Создать multipart/form-data для запроса.
         
         Returns:
-            Tuple[body bytes, content-type header]
+            Tuple[потоковое тело (MultipartBody), content-type header]
         """
         boundary = f"----WebKitFormBoundary{int(time.time() * 1000)}"
         
@@ -143,12 +267,9 @@ class GroqTranscriber:
         # Файл
         lines.append(f"--{boundary}")
         lines.append(f'Content-Disposition: form-data; name="file"; filename="{file_path.name}"')
-        lines.append("Content-Type: audio/mpeg")
+        lines.append(f"Content-Type: {CONTENT_TYPES.get(file_path.suffix.lower(), 'audio/mpeg')}")
         lines.append("")
         
-        with open(file_path, "rb") as f:
-            file_data = f.read()
-        
         # Модель
         lines_after = []
         lines_after.append(f"--{boundary}")
@@ -182,7 +303,7 @@ class GroqTranscriber:
         header_part = "\r\n".join(lines).encode('utf-8') + b"\r\n"
         footer_part = b"\r\n" + "\r\n".join(lines_after).encode('utf-8')
         
-        body = header_part + file_data + footer_part
+        body = MultipartBody(header_part, file_path, footer_part)
         content_type = f"multipart/form-data; boundary={boundary}"
         
         return body, content_type
@@ -211,6 +332,7 @@ class GroqTranscriber:
         
         # Подготавливаем файл
         upload_path, should_cleanup = self._prepare_audio(audio_path)
+        body = None
         
         try:
             logger.info(f"🚀 Отправка в Groq API ({self.model})...")
@@ -230,36 +352,14 @@ class GroqTranscriber:
                 headers={
                     "Authorization": f"Bearer {self.api_key}",
                     "Content-Type": content_type,
+                    # Тело — поток, длину urllib сам не определит
+                    "Content-Length": str(body.content_length),
                 },
                 method="POST"
             )
             
-            # Отправляем запрос
-            try:
-                response: HTTPResponse = urlopen(request, timeout=self.timeout)
-                response_data = response.read().decode('utf-8')
-                result = json.loads(response_data)
-                
-            except HTTPError as e:
-                error_body = e.read().decode('utf-8') if e.fp else ""
-                
-                if e.code == 429:
-                    # Rate limit exceeded
-                    logger.warning(f"Groq rate limit: {error_body}")
-                    raise GroqRateLimitError(
-                        f"Превышен лимит Groq API. Попробуйте позже или используйте локальный backend."
-                    )
-                elif e.code == 413:
-                    raise GroqAPIError(f"Файл слишком большой для Groq API")
-                elif e.code == 401:
-                    raise GroqAPIError("Неверный GROQ_API_KEY")
-                else:
-                    logger.error(f"Groq API error {e.code}: {error_body}")
-                    raise GroqAPIError(f"Groq API error {e.code}: {error_body[:200]}")
-                    
-            except URLError as e:
-                logger.error(f"Сетевая ошибка: {e}")
-                raise GroqAPIError(f"Сетевая ошибка: {e}")
+            # Отправляем запрос (при 429 — короткие повторы с ожиданием)
+            result = self._send_request(request)
             
             elapsed = time.time() - t0
             
@@ -282,6 +382,8 @@ class GroqTranscriber:
             }
             
         finally:
+            if body is not None:
+                body.close()
             # Удаляем временный файл
             if should_cleanup and upload_path.exists():
                 try:
@@ -289,6 +391,67 @@ class GroqTranscriber:
                 except OSError:
                     pass
     
+    def _send_request(self, request: Request) -> Dict[str, Any]:
+        """
+        Отправить запрос в Groq API.
+        
+        При 429 повторяет запрос до RATE_LIMIT_RETRIES раз, выдерживая
+        Retry-After (или экспоненциальную паузу), если ждать не дольше RATE_LIMIT_MAX_WAIT.
+        
+        Returns:
+            Распарсенный JSON ответ
+            
+        Raises:
+            GroqRateLimitError: Лимит не восстановился
+            GroqAPIError: Другие ошибки API и сети
+        """
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            if attempt and isinstance(request.data, MultipartBody):
+                request.data.rewind()
+            try:
+                with urlopen(request, timeout=self.timeout) as response:
+                    return json.load(response)
+                
+            except HTTPError as e:
+                try:
+                    error_body = e.read(ERROR_BODY_LIMIT).decode('utf-8', 'replace') if e.fp else ""
+                except OSError:
+                    error_body = ""
+                
+                if e.code == 429:
+                    # Rate limit exceeded
+                    logger.warning(f"Groq rate limit: {error_body}")
+                    wait = self._retry_after(e, attempt)
+                    if attempt < RATE_LIMIT_RETRIES and wait <= RATE_LIMIT_MAX_WAIT:
+                        logger.info(f"Groq 429: повтор через {wait:.0f} сек")
+                        time.sleep(wait)
+                        continue
+                    raise GroqRateLimitError(
+                        f"Превышен лимит Groq API. Попробуйте позже или используйте локальный backend."
+                    )
+                elif e.code == 413:
+                    raise GroqAPIError(f"Файл слишком большой для Groq API")
+                elif e.code == 401:
+                    raise GroqAPIError("Неверный GROQ_API_KEY")
+                else:
+                    logger.error(f"Groq API error {e.code}: {error_body}")
+                    raise GroqAPIError(f"Groq API error {e.code}: {error_body[:200]}")
+                    
+            except URLError as e:
+                logger.error(f"Сетевая ошибка: {e}")
+                raise GroqAPIError(f"Сетевая ошибка: {e}")
+        
+        raise GroqRateLimitError("Превышен лимит Groq API")
+    
+    @staticmethod
+    def _retry_after(error: HTTPError, attempt: int) -> float:
+        """Пауза перед повтором: заголовок Retry-After или 5, 10, 20... сек."""
+        header = error.headers.get('Retry-After') if error.headers else None
+        try:
+            return float(header)
+        except (TypeError, ValueError):
+            return 5.0 * (2 ** attempt)
+    
     def _parse_segments(self, result: Dict) -> List[Dict[str, Any]]:
         """Парсить сегменты из ответа Groq API."""
         segments = []
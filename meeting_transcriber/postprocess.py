@@ -11,7 +11,8 @@ Whisper часто галлюцинирует на тишине или шума
 """
 
 import re
-from typing import List, Dict, Any, Optional
+from collections import deque
+from typing import List, Dict, Any, Optional, Deque, Iterable, Set
 
 from .logging_setup import get_logger
 
@@ -63,11 +64,15 @@ HALLUCINATION_PATTERNS = [
     r"^\s*!\s*$",
 ]
 
-# Компилируем паттерны для производительности
-COMPILED_PATTERNS = [
-    re.compile(p, re.IGNORECASE | re.UNICODE) 
-    for p in HALLUCINATION_PATTERNS
-]
+# Один regex-альтернатива: движок проверяет все паттерны за один вызов search()
+_HALLUCINATION_RE = re.compile(
+    "|".join(f"(?:{p})" for p in HALLUCINATION_PATTERNS),
+    re.IGNORECASE | re.UNICODE
+)
+
+# Паттерны очистки текста (clean_text вызывается для каждого сегмента)
+_SPACE_BEFORE_PUNCT_RE = re.compile(r'\s+([.,!?;:])')
+_REPEATED_PUNCT_RE = re.compile(r'([.,!?])\1+')
 
 
 def is_hallucination(text: str) -> bool:
@@ -86,9 +91,8 @@ def is_hallucination(text: str) -> bool:
     text_clean = text.strip()
     
     # Проверяем по паттернам
-    for pattern in COMPILED_PATTERNS:
-        if pattern.search(text_clean):
-            return True
+    if _HALLUCINATION_RE.search(text_clean):
+        return True
     
     # Проверяем на повторяющиеся символы (например: "а а а а а")
     words = text_clean.split()
@@ -103,16 +107,20 @@ def is_hallucination(text: str) -> bool:
 
 def is_repeated_segment(
     current_text: str, 
-    previous_texts: List[str], 
-    threshold: float = 0.9
+    previous_texts: Iterable[str], 
+    threshold: float = 0.9,
+    previous_set: Optional[Set[str]] = None
 ) -> bool:
     """
     Проверяет, является ли сегмент повторением предыдущих.
     
     Args:
         current_text: Текущий текст
-        previous_texts: Список предыдущих текстов (последние N)
+        previous_texts: Предыдущие тексты (последние N)
         threshold: Порог схожести (0.0 - 1.0)
+        previous_set: Множество тех же текстов, уже приведённых к strip().lower().
+                      Если передано, previous_texts считаются нормализованными,
+                      а точное совпадение проверяется за O(1)
         
     Returns:
         True если текст является повторением
@@ -124,21 +132,27 @@ def is_repeated_segment(
     if len(current_clean) < 5:  # Слишком короткий для сравнения
         return False
     
-    for prev in previous_texts:
-        prev_clean = prev.strip().lower()
-        if not prev_clean:
+    if previous_set is None:
+        previous_texts = [prev.strip().lower() for prev in previous_texts]
+        previous_set = set(previous_texts)
+    
+    # Точное совпадение
+    if current_clean in previous_set:
+        return True
+    
+    current_len = len(current_clean)
+    for prev_clean in previous_texts:
+        prev_len = len(prev_clean)
+        if not prev_len:
             continue
         
-        # Точное совпадение
-        if current_clean == prev_clean:
-            return True
+        # Сначала сравниваем длины: при сильной разнице подстрока не пройдёт порог
+        if min(current_len, prev_len) / max(current_len, prev_len) < threshold:
+            continue
         
         # Частичное совпадение (один текст содержится в другом)
         if current_clean in prev_clean or prev_clean in current_clean:
-            shorter = min(len(current_clean), len(prev_clean))
-            longer = max(len(current_clean), len(prev_clean))
-            if shorter / longer >= threshold:
-                return True
+            return True
     
     return False
 
@@ -164,7 +178,9 @@ def filter_hallucinations(
     
     filtered = []
     removed_count = 0
-    previous_texts: List[str] = []
+    # Окно нормализованных текстов и множество для точных совпадений
+    previous_texts: Deque[str] = deque()
+    previous_set: Set[str] = set()
     
     for seg in segments:
         text = seg.get("text", "").strip()
@@ -176,7 +192,7 @@ def filter_hallucinations(
             continue
         
         # Проверяем на повторение
-        if check_repeats and is_repeated_segment(text, previous_texts):
+        if check_repeats and is_repeated_segment(text, previous_texts, previous_set=previous_set):
             removed_count += 1
             logger.debug(f"Удалён повтор: '{text[:50]}...'")
             continue
@@ -184,10 +200,15 @@ def filter_hallucinations(
         # Сегмент прошёл фильтры
         filtered.append(seg)
         
-        # Обновляем окно предыдущих текстов
-        previous_texts.append(text)
-        if len(previous_texts) > repeat_window:
-            previous_texts.pop(0)
+        # Обновляем окно предыдущих текстов, держа множество в синхроне
+        if previous_texts and len(previous_texts) >= repeat_window:
+            evicted = previous_texts.popleft()
+            if evicted not in previous_texts:
+                previous_set.discard(evicted)
+        if repeat_window > 0:
+            normalized = text.lower()
+            previous_texts.append(normalized)
+            previous_set.add(normalized)
     
     if removed_count > 0:
         logger.info(f"🧹 Удалено галлюцинаций/повторов: {removed_count}")
@@ -208,17 +229,14 @@ def clean_text(text: str) -> str:
     if not text:
         return text
     
-    # Удаляем множественные пробелы
-    text = re.sub(r'\s+', ' ', text)
+    # Схлопываем пробелы и обрезаем края (split() без regex, на C)
+    text = " ".join(text.split())
     
     # Удаляем пробелы перед знаками препинания
-    text = re.sub(r'\s+([.,!?;:])', r'\1', text)
+    text = _SPACE_BEFORE_PUNCT_RE.sub(r'\1', text)
     
     # Удаляем повторяющиеся знаки препинания
-    text = re.sub(r'([.,!?])\1+', r'\1', text)
-    
-    # Убираем пробелы в начале и конце
-    text = text.strip()
+    text = _REPEATED_PUNCT_RE.sub(r'\1', text)
     
     return text
 
@@ -251,13 +269,13 @@ def postprocess_transcription(
             if "text" in seg:
                 seg["text"] = clean_text(seg["text"])
         
-        # Пересобираем полный текст
+        # Пересобираем полный текст (сегменты уже очищены выше).
+        # Whisper часто режет перед запятой: на стыках убираем пробел перед знаком
         full_text = " ".join(
-            seg.get("text", "").strip() 
-            for seg in segments 
-            if seg.get("text", "").strip()
+            seg["text"] for seg in segments if seg.get("text")
         )
-        full_text = clean_text(full_text)
+        full_text = _SPACE_BEFORE_PUNCT_RE.sub(r'\1', full_text)
+        full_text = _REPEATED_PUNCT_RE.sub(r'\1', full_text)
         
         result["segments"] = segments
         result["text"] = full_text
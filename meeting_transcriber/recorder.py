@@ -3,22 +3,53 @@
 Модуль записи аудио с микрофона через ffmpeg.
 """
 
+import re
+import json
 import time
+import logging
+import threading
 import subprocess
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple, Dict
 
 from .config import Config
-from .utils import get_platform_config, ffprobe_ok, get_ffmpeg_device_name
+from .utils import get_platform_config, ffprobe_ok, get_ffmpeg_device_name, ffmpeg_has_filter
 from .logging_setup import get_logger
 from .audio_monitor import AudioLevelMonitor
 
 logger = get_logger()
 
+# anlmdn с параметрами внутри цепочки фильтров
+_ANLMDN_RE = re.compile(r'\banlmdn(=[^,]*)?')
+
+# Спецсимволы ffmpeg: значения опции фильтра и описания графа фильтров
+_FILTER_OPTION_SPECIAL_RE = re.compile(r"([\\':])")
+_FILTERGRAPH_SPECIAL_RE = re.compile(r"([\\'\[\],;])")
+
+
+def _escape_filter_value(value: str) -> str:
+    """
+    Экранировать значение опции фильтра для -af (оба уровня экранирования ffmpeg).
+    
+    Args:
+        value: Значение как есть (например, путь к файлу)
+        
+    Returns:
+        Строка для подстановки после "опция="
+    """
+    value = _FILTER_OPTION_SPECIAL_RE.sub(r'\\\1', value)
+    return _FILTERGRAPH_SPECIAL_RE.sub(r'\\\1', value)
+
+# Фильтры, которые дёшево применять в реальном времени (DEFER_HEAVY_FILTERS)
+_LIGHT_FILTERS = {'highpass', 'lowpass', 'adeclick'}
+
 
 class MeetingRecorder:
     """Класс для записи аудио с микрофона."""
     
+    # Интервал (сек) обновления счётчика длительности без монитора уровня
+    STATUS_INTERVAL = 1.0
+    
     def __init__(self, enable_monitor: bool = True):
         """
         Инициализация рекордера.
@@ -31,6 +62,95 @@ class MeetingRecorder:
         self.recording_process: Optional[subprocess.Popen] = None
         self.enable_monitor = enable_monitor
         self._audio_monitor: Optional[AudioLevelMonitor] = None
+        self._probe_cache_file = Config.LOGS_FOLDER / "_probe_cache.json"
+
+    def _voice_filters(self) -> str:
+        """
+        Цепочка фильтров для записи.
+        
+        anlmdn (non-local means) — самый тяжёлый фильтр цепочки. Если задана
+        модель RNNOISE_MODEL и ffmpeg собран с arnndn, он заменяется на RNNoise.
+        
+        Returns:
+            Строка для ffmpeg -af
+        """
+        filters = Config.VOICE_FILTERS
+        model = Config.RNNOISE_MODEL
+        if not model or not _ANLMDN_RE.search(filters):
+            return filters
+        
+        if not Path(model).is_file():
+            logger.warning(f"RNNOISE_MODEL не найден: {model}, используется anlmdn")
+            return filters
+        if not ffmpeg_has_filter('arnndn'):
+            logger.debug("ffmpeg без arnndn, используется anlmdn")
+            return filters
+        
+        # Функция вместо строки замены: обратные слэши пути не разбираются как \1, \m...
+        arnndn = f"arnndn=m={_escape_filter_value(model)}"
+        return _ANLMDN_RE.sub(lambda _: arnndn, filters)
+
+    @staticmethod
+    def _split_filters(chain: str) -> Tuple[str, str]:
+        """
+        Разделить цепочку фильтров на лёгкую (для записи) и тяжёлую (после записи).
+        
+        Args:
+            chain: Строка для ffmpeg -af
+            
+        Returns:
+            (лёгкие фильтры, тяжёлые фильтры) — порядок внутри каждой части сохраняется
+        """
+        light, heavy = [], []
+        for item in chain.split(','):
+            name = item.split('=', 1)[0].strip()
+            (light if name in _LIGHT_FILTERS else heavy).append(item)
+        return ','.join(light), ','.join(heavy)
+
+    def _apply_post_filters(
+        self,
+        path: Path,
+        filters: str,
+        codec_args: List[str],
+        log_file: Path
+    ) -> bool:
+        """
+        Применить тяжёлые фильтры к готовой записи (файл заменяется на месте).
+        
+        Args:
+            path: Записанный файл
+            filters: Цепочка для ffmpeg -af
+            codec_args: Параметры кодека, как при записи
+            log_file: Лог ffmpeg (дописывается)
+            
+        Returns:
+            True если файл обработан; при ошибке остаётся исходная запись
+        """
+        print("🎚️  Обработка записи фильтрами...")
+        logger.info(f"Пост-обработка фильтрами: {filters}")
+        
+        tmp_path = path.with_name(f"{path.stem}.filtered{path.suffix}")
+        cmd = [
+            'ffmpeg', '-y', '-hide_banner', '-nostdin',
+            '-i', str(path),
+            '-af', filters,
+            # loudnorm в динамическом режиме отдаёт 192 кГц — фиксируем формат записи
+            '-ar', Config.DEFAULT_SAMPLE_RATE,
+            '-ac', Config.DEFAULT_CHANNELS,
+            *codec_args,
+            str(tmp_path)
+        ]
+        
+        with open(log_file, 'a', encoding='utf-8') as log:
+            p = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT)
+        
+        if p.returncode == 0 and ffprobe_ok(tmp_path):
+            tmp_path.replace(path)
+            return True
+        
+        logger.warning(f"Пост-обработка не удалась, оставлена исходная запись. Лог: {log_file}")
+        tmp_path.unlink(missing_ok=True)
+        return False
 
     def _find_builtin_mic(self) -> Optional[str]:
         """
@@ -68,19 +188,44 @@ class MeetingRecorder:
         logger.info(f"🔍 Выполняю: {' '.join(cmd)}")
         
         try:
-            res = subprocess.run(
+            # ffmpeg печатает устройства в stderr — выводим построчно по мере появления
+            proc = subprocess.Popen(
                 cmd,
-                capture_output=True,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 text=True,
                 encoding='utf-8',
-                errors='ignore'
+                errors='ignore',
+                bufsize=1
             )
-            output = (res.stderr or '') + "\n" + (res.stdout or '')
-            print("\n" + output)  # Вывод устройств всегда в консоль
+            print()
+            for line in proc.stderr:
+                print(line, end='')  # Вывод устройств всегда в консоль
+            proc.wait()
+            print()
             logger.debug("Список устройств получен")
         except Exception as e:
             logger.error(f"Не удалось получить список устройств: {e}")
 
+    def _load_probe_cache(self) -> Dict[str, float]:
+        """Прочитать время последних успешных проб устройств."""
+        if Config.PROBE_CACHE_TTL <= 0:
+            return {}
+        try:
+            return json.loads(self._probe_cache_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_probe_cache(self, cache: Dict[str, float]) -> None:
+        """Сохранить кэш проб (ошибки записи не критичны)."""
+        if Config.PROBE_CACHE_TTL <= 0:
+            return
+        try:
+            self._probe_cache_file.write_text(json.dumps(cache), encoding='utf-8')
+        except OSError as e:
+            logger.debug(f"Не удалось сохранить кэш проб: {e}")
+
     def _record_probe(self, device: str) -> bool:
         """
         Пробная запись для проверки устройства.
@@ -95,6 +240,12 @@ class MeetingRecorder:
             logger.debug("Пробная запись отключена (PRE_RECORD_PROBE=0)")
             return True
         
+        cache_key = f"{self.platform_config['format']}:{device}"
+        probe_cache = self._load_probe_cache()
+        if time.time() - probe_cache.get(cache_key, 0) < Config.PROBE_CACHE_TTL:
+            logger.info(f"🔎 Устройство '{device}' уже проверено недавно, проба пропущена")
+            return True
+        
         logger.info(f"🔎 Пробная запись ({Config.PRE_RECORD_PROBE} сек) — проверка устройства '{device}'...")
         
         probe_file = Config.LOGS_FOLDER / "_probe.wav"
@@ -107,7 +258,8 @@ class MeetingRecorder:
             str(probe_file)
         ]
         log_file = Config.LOGS_FOLDER / "_probe.log"
-        logger.debug(f"Команда пробной записи: {' '.join(cmd)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Команда пробной записи: %s", ' '.join(cmd))
         
         try:
             with open(log_file, 'w', encoding='utf-8') as log:
@@ -117,8 +269,11 @@ class MeetingRecorder:
             ok = (p.returncode == 0) and ffprobe_ok(probe_file)
             if ok:
                 logger.info("✅ Проба успешна")
+                probe_cache[cache_key] = time.time()
             else:
                 logger.error(f"Пробная запись не удалась. См. лог: {log_file}")
+                probe_cache.pop(cache_key, None)
+            self._save_probe_cache(probe_cache)
             return ok
         finally:
             if probe_file.exists():
@@ -128,6 +283,19 @@ class MeetingRecorder:
                 except OSError as e:
                     logger.warning(f"Не удалось удалить временный файл пробы: {e}")
 
+    def _show_elapsed(self, start: float, stop: threading.Event) -> None:
+        """
+        Раз в STATUS_INTERVAL выводить длительность записи (поток таймера).
+        
+        Args:
+            start: Время начала записи (time.time())
+            stop: Событие, по которому поток завершается
+        """
+        while not stop.wait(self.STATUS_INTERVAL):
+            elapsed = int(time.time() - start)
+            print(f"\r⏱  Длительность: {elapsed // 60:02d}:{elapsed % 60:02d}",
+                  end="", flush=True)
+    
     def record(self, output_file: Path, device: str) -> Optional[List[Path]]:
         """
         Записать аудио с устройства.
@@ -146,26 +314,35 @@ class MeetingRecorder:
         suffix = '.wav' if Config.DEFAULT_FORMAT == 'wav' else '.flac'
         output_path = output_file.with_suffix(suffix)
         codec = 'pcm_s16le' if Config.DEFAULT_FORMAT == 'wav' else 'flac'
+        codec_args = ['-acodec', codec]
+        if Config.DEFAULT_FORMAT == 'flac':
+            codec_args += ['-compression_level', Config.FLAC_LEVEL]
+        else:
+            codec_args += ['-rf64', 'auto']
         
         # Собираем команду ffmpeg
+        # -nostats: без строки прогресса ffmpeg пишет в лог только предупреждения и ошибки
+        # (иначе — запись в лог дважды в секунду всю встречу; время показываем сами)
         cmd = [
-            'ffmpeg', '-y', '-hide_banner', '-nostdin',
+            'ffmpeg', '-y', '-hide_banner', '-nostdin', '-nostats',
             '-f', self.platform_config['format'],
             '-i', device,
             '-vn', '-ar', Config.DEFAULT_SAMPLE_RATE,
             '-ac', Config.DEFAULT_CHANNELS,
-            '-acodec', codec
+            *codec_args
         ]
         
-        if Config.DEFAULT_FORMAT == 'flac':
-            cmd += ['-compression_level', Config.FLAC_LEVEL]
-        else:
-            cmd += ['-rf64', 'auto']
-        
-        cmd += ['-af', Config.VOICE_FILTERS, str(output_path)]
+        filters = self._voice_filters()
+        post_filters = ''
+        if Config.DEFER_HEAVY_FILTERS:
+            filters, post_filters = self._split_filters(filters)
+        if filters:
+            cmd += ['-af', filters]
+        cmd.append(str(output_path))
         
         log_file = Config.LOGS_FOLDER / f"{output_file.stem}.log"
-        logger.debug(f"Команда записи: {' '.join(cmd)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Команда записи: %s", ' '.join(cmd))
         
         # Красивый вывод в консоль
         print("\n" + "=" * 52)
@@ -188,21 +365,23 @@ class MeetingRecorder:
             else:
                 print("⚠️  Мониторинг уровня недоступен (установите: pip install sounddevice numpy)")
         
+        stop_timer = threading.Event()
         try:
-            with open(log_file, 'w', encoding='utf-8') as log:
+            # ffmpeg пишет в дескриптор напрямую — текстовый слой Python не нужен
+            with open(log_file, 'wb') as log:
                 self.recording_process = subprocess.Popen(
                     cmd, stdout=log, stderr=subprocess.STDOUT
                 )
-                while self.recording_process.poll() is None:
-                    elapsed = int(time.time() - start)
-                    # Если монитор активен, он сам выводит уровень
-                    # Иначе показываем только время
-                    monitor_active = self._audio_monitor and self._audio_monitor.is_available()
-                    if not monitor_active:
-                        print(f"\r⏱  Длительность: {elapsed // 60:02d}:{elapsed % 60:02d}", 
-                              end="", flush=True)
-                    time.sleep(0.1 if monitor_active else 1)
+                # Если монитор активен, он сам выводит уровень. Иначе время показывает
+                # поток таймера, а основной поток блокируется в wait() без опроса
+                monitor_active = self._audio_monitor and self._audio_monitor.is_available()
+                if not monitor_active:
+                    threading.Thread(
+                        target=self._show_elapsed, args=(start, stop_timer), daemon=True
+                    ).start()
+                self.recording_process.wait()
         except KeyboardInterrupt:
+            stop_timer.set()
             print("\n⏸ Останавливаю запись...")
             logger.info("Запись остановлена пользователем (Ctrl+C)")
             if self.recording_process:
@@ -212,6 +391,7 @@ class MeetingRecorder:
             logger.error(f"Ошибка записи: {e}", exc_info=True)
             return None
         finally:
+            stop_timer.set()
             # Останавливаем монитор
             if self._audio_monitor:
                 self._audio_monitor.stop()
@@ -222,6 +402,8 @@ class MeetingRecorder:
         print("\n✅ Запись завершена")
         
         if output_path.exists() and ffprobe_ok(output_path):
+            if post_filters:
+                self._apply_post_filters(output_path, post_filters, codec_args, log_file)
             file_size = output_path.stat().st_size / (1024 * 1024)
             logger.info(f"Файл создан: {output_path}, размер: {file_size:.1f} MB")
             return [output_path]
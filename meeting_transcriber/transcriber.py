@@ -5,22 +5,68 @@
 """
 
 import os
+import sys
 import time
 import json
+import wave
+import bisect
+import functools
 import datetime
 import platform
+import tempfile
+import threading
+import importlib.util
+from types import SimpleNamespace
+from collections import namedtuple
 import subprocess
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List, Dict, Any, Tuple
 
 from .config import Config
-from .utils import ffprobe_ok, get_audio_duration, format_timestamp_srt
+from .utils import (
+    ffprobe_ok,
+    format_timestamp_srt,
+    format_timestamp_short,
+    is_asr_ready_wav,
+    get_audio_duration,
+    get_performance_cores,
+    get_available_memory_gb,
+)
 from .logging_setup import get_logger
 from .postprocess import postprocess_transcription, filter_hallucinations
 from .summarizer import MeetingSummarizer, format_summary_text, check_summarizer_available
 
 logger = get_logger()
 
+# Частота дискретизации, которую ожидают Whisper модели
+ASR_SAMPLE_RATE = 16000
+
+# Длина окна (сек) для батчевого пайплайна faster-whisper без VAD и окно (±сек)
+# поиска паузы для разреза: куски 24–30 сек, не длиннее окна модели
+BATCH_CHUNK_SEC = 30
+BATCH_SEARCH_SEC = 3
+
+# Минимальный интервал (сек) между обновлениями прогресс-бара
+PROGRESS_FLUSH_INTERVAL = 0.25
+
+# Параллельная нарезка по паузам (FASTER_NUM_WORKERS > 1):
+# целевая длина куска и окно (±сек) поиска самой тихой точки для разреза
+SILENCE_CHUNK_SEC = 120
+SILENCE_SEARCH_SEC = 15
+SILENCE_FRAME_SEC = 0.1
+
+# Примерный объём RAM (ГБ) модели faster-whisper в int8; float32 — примерно ×4
+_MODEL_RAM_GB_INT8 = {'tiny': 0.2, 'base': 0.4, 'small': 1.0, 'medium': 2.5, 'large': 5.0}
+
+# Загруженные модели процесса: повторные EnhancedTranscriber (record → transcribe,
+# демон) не платят за загрузку заново. Ключ — всё, что влияет на модель.
+_MODEL_CACHE: Dict[Tuple, Any] = {}
+
+# Сегмент/слово куска со сдвинутыми на начало куска таймкодами
+_ChunkSegment = namedtuple('_ChunkSegment', 'start end text words')
+_ChunkWord = namedtuple('_ChunkWord', 'start end word')
+
 # Проверяем доступность Groq
 HAS_GROQ = False
 try:
@@ -42,21 +88,71 @@ try:
 except ImportError:
     pass
 
-# Проверяем наличие torch
-HAS_TORCH = False
+# Проверяем наличие torch без импорта (сам импорт — сотни мс, нужен только для openai-whisper)
+HAS_TORCH = importlib.util.find_spec('torch') is not None
+
+# Проверяем наличие orjson (быстрая сериализация JSON)
+HAS_ORJSON = False
 try:
-    import torch
-    HAS_TORCH = True
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
     pass
 
+@functools.lru_cache(maxsize=None)
+def _torch_cuda_available() -> bool:
+    """CUDA через torch (первый вызов может занимать 50–200 мс, поэтому кэшируем)."""
+    if not HAS_TORCH:
+        return False
+    import torch
+    return torch.cuda.is_available()
+
+
+@functools.lru_cache(maxsize=None)
+def _torch_mps_available() -> bool:
+    """Apple MPS через torch (кэшируется на процесс)."""
+    if not HAS_TORCH:
+        return False
+    import torch
+    return hasattr(torch.backends, "mps") and torch.backends.mps.is_available()
+
+
+@functools.lru_cache(maxsize=None)
+def _ct2_cuda_available() -> bool:
+    """CUDA устройства, видимые CTranslate2 (без импорта torch)."""
+    try:
+        import ctranslate2
+        return ctranslate2.get_cuda_device_count() > 0
+    except (ImportError, RuntimeError):
+        return False
+
+
+class _NullBar:
+    """Заглушка прогресс-бара, когда tqdm не установлен."""
+    
+    def __init__(self, *args, **kwargs):
+        self.n = 0
+    
+    def update(self, n: int = 1) -> None:
+        pass
+    
+    def set_postfix_str(self, s: str = '') -> None:
+        pass
+    
+    def close(self) -> None:
+        pass
+    
+    @staticmethod
+    def write(s: str) -> None:
+        print(s)
+
+
 # Проверяем наличие tqdm
 try:
     from tqdm import tqdm
 except ImportError:
-    def tqdm(iterable=None, **kwargs):
-        logger.warning("tqdm не установлен. Установите: pip install tqdm")
-        return iterable if iterable is not None else []
+    logger.warning("tqdm не установлен, прогресс не отображается. Установите: pip install tqdm")
+    tqdm = _NullBar
 
 
 class EnhancedTranscriber:
@@ -79,7 +175,10 @@ class EnhancedTranscriber:
         max_speakers: Optional[int] = None,
         filter_hallucinations: bool = True,
         summarize: Optional[bool] = None,
-        summary_language: str = "ru"
+        summary_language: str = "ru",
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        stream: bool = False
     ):
         """
         Инициализация транскрибера.
@@ -91,9 +190,13 @@ class EnhancedTranscriber:
             filter_hallucinations: Фильтровать галлюцинации Whisper
             summarize: Генерировать саммари (None = использовать AUTO_SUMMARIZE)
             summary_language: Язык саммари (ru/en)
+            batch_size: Размер батча BatchedInferencePipeline (None = FASTER_BATCH_SIZE, 0/1 = выкл)
+            concurrency: Одновременных запросов Groq для нескольких файлов (None = GROQ_CONCURRENCY)
+            stream: Печатать сегменты по мере распознавания (локальные faster/whisper)
         """
         Config.ensure_directories()
         self.model = None
+        self.batched_model = None  # BatchedInferencePipeline поверх self.model (faster)
         self.model_loaded = False
         self.model_size = Config.DEFAULT_MODEL
         self.backend = Config.ASR_BACKEND
@@ -106,6 +209,11 @@ class EnhancedTranscriber:
         # None = использовать глобальную настройку, иначе явное значение
         self.summarize = summarize if summarize is not None else Config.AUTO_SUMMARIZE
         self.summary_language = summary_language
+        self.batch_size = batch_size if batch_size is not None else Config.FASTER_BATCH_SIZE
+        # Уточняется в _load_model, когда известен итоговый compute_type
+        self.beam_size = Config.FASTER_BEAM_SIZE or 5
+        self.concurrency = concurrency if concurrency is not None else Config.GROQ_CONCURRENCY
+        self.stream = stream
         
         # Groq транскрибер (для облачной транскрипции)
         self.groq_transcriber = None
@@ -118,6 +226,7 @@ class EnhancedTranscriber:
         
         # Fallback backend для режима 'auto' или при ошибках API
         self.fallback_backend = 'faster'
+        self._fallback_lock = threading.Lock()
         
         # Обрабатываем режим 'auto'
         if self.backend == 'auto':
@@ -153,48 +262,119 @@ class EnhancedTranscriber:
         d = Config.ASR_DEVICE
         
         if d == 'auto':
-            if HAS_TORCH and torch.cuda.is_available():
+            if _torch_cuda_available():
                 return 'cuda', True
-            if HAS_TORCH and hasattr(torch.backends, "mps") and torch.backends.mps.is_available():
+            if _torch_mps_available():
                 return 'mps', False
             return 'cpu', False
         
         if d == 'cuda':
-            if HAS_TORCH and torch.cuda.is_available():
+            if _torch_cuda_available():
                 return 'cuda', True
             return 'cpu', False
         
         if d in ('mps', 'metal'):
-            ok = HAS_TORCH and hasattr(torch.backends, "mps") and torch.backends.mps.is_available()
-            return ('mps', False) if ok else ('cpu', False)
+            return ('mps', False) if _torch_mps_available() else ('cpu', False)
         
         return 'cpu', False
 
     def _resolve_device_faster(self) -> str:
-        """Определить устройство для faster-whisper."""
+        """
+        Определить устройство для faster-whisper.
+        
+        'auto' раскрывается в cuda/cpu заранее, чтобы к CPU применялись
+        настройки потоков и выбор compute_type.
+        """
         d = Config.ASR_DEVICE
-        if d in ('auto', 'cpu', 'cuda', 'metal'):
+        if d == 'auto':
+            return 'cuda' if _ct2_cuda_available() else 'cpu'
+        if d in ('cpu', 'cuda', 'metal'):
             return d
         if d == 'mps':
             return 'metal'
         return 'auto'
-    
-    def _prepare_safe_wav(self, audio_file: Path) -> Optional[Path]:
+
+    def _resolve_compute_faster(self, device: str) -> str:
+        """
+        Определить compute_type для faster-whisper.
+
+        CTranslate2 не имеет int4 ядер, поэтому 'int4' сводится к самому
+        компактному поддерживаемому варианту: int8_float16 на CUDA, int8 иначе.
+        'auto' на CPU выбирается по размеру модели и свободной памяти.
+        """
+        compute = Config.FASTER_COMPUTE.lower()
+        if compute == 'auto' and device == 'cpu':
+            return self._auto_compute_type_cpu()
+        if compute != 'int4':
+            return compute
+
+        resolved = 'int8_float16' if device == 'cuda' else 'int8'
+        logger.debug(f"compute_type=int4 недоступен в CTranslate2, использую {resolved}")
+        return resolved
+
+    def _auto_compute_type_cpu(self) -> str:
+        """
+        Выбрать compute_type для CPU по размеру модели и доступной RAM.
+        
+        Маленькие модели (tiny/base) при достатке памяти идут в float32 —
+        это почти бесплатно и точнее; всё остальное — int8.
+        """
+        family = next((k for k in _MODEL_RAM_GB_INT8 if self.model_size.startswith(k)), None)
+        footprint = _MODEL_RAM_GB_INT8.get(family)
+        available = get_available_memory_gb()
+        
+        if family in ('tiny', 'base') and (available is None or available > footprint * 4):
+            resolved = 'float32'
+        else:
+            resolved = 'int8'
+            if footprint and available is not None and available < footprint:
+                logger.warning(
+                    f"Свободно {available:.1f} ГБ RAM, модели '{self.model_size}' нужно ~{footprint:.1f} ГБ "
+                    f"— возможен своп, попробуйте модель меньше"
+                )
+        
+        logger.debug(f"compute_type=auto → {resolved} (RAM: {available if available is not None else '?'} ГБ)")
+        return resolved
+
+    def _resolve_model_path_faster(self) -> str:
+        """
+        Найти заранее сконвертированную модель в WHISPER_MODEL_DIR.
+
+        Ожидается структура WHISPER_MODEL_DIR/<model_size>/model.bin
+        (например, результат ct2-transformers-converter --quantization int8).
+        Если такой папки нет — возвращаем имя модели для загрузки с HF Hub.
         """
-        Подготовить безопасный WAV файл для локальной обработки.
+        if Config.WHISPER_MODEL_DIR:
+            local_dir = Path(Config.WHISPER_MODEL_DIR).expanduser() / self.model_size
+            if (local_dir / "model.bin").exists():
+                logger.debug(f"Использую локальную CT2 модель: {local_dir}")
+                return str(local_dir)
+            logger.debug(f"Локальная модель не найдена в {local_dir}, загружаю '{self.model_size}'")
+        return self.model_size
+
+    def _prepare_safe_wav(self, audio_file: Path, announce: bool = True) -> Optional[Path]:
+        """
+        Подготовить безопасный WAV файл (нужен WhisperX, который читает файл сам).
         
         Args:
             audio_file: Исходный аудио файл
+            announce: Печатать сообщение о подготовке (False — при фоновой подготовке)
             
         Returns:
-            Путь к конвертированному WAV или None при ошибке
+            Путь к конвертированному WAV (или сам audio_file, если он уже
+            16kHz mono pcm_s16le) или None при ошибке
         """
+        if is_asr_ready_wav(audio_file):
+            logger.debug("Аудио уже 16kHz mono WAV, конвертация не нужна")
+            return audio_file
+        
         safe_file = audio_file.with_suffix(
             f".safe{datetime.datetime.now():%H%M%S}.wav"
         )
         
         logger.info("Подготовка аудио (конвертация в 16kHz mono WAV)...")
-        print("Подготовка аудио...")
+        if announce:
+            print("Подготовка аудио...")
         
         try:
             subprocess.run([
@@ -208,8 +388,119 @@ class EnhancedTranscriber:
             logger.error(f"Конвертация не удалась: {e}")
             return None
     
-    def _cleanup_temp_file(self, temp_file: Path) -> None:
-        """Удалить временный файл."""
+    def _load_audio_array(self, audio_file: Path, announce: bool = True) -> Optional[Any]:
+        """
+        Декодировать аудио в float32 PCM 16kHz mono прямо в память.
+        
+        faster-whisper и openai-whisper принимают numpy массив, поэтому
+        временный WAV на диске не нужен: ffmpeg отдаёт готовый f32le в pipe.
+        Файлы, уже записанные в 16kHz mono pcm_s16le, читаются напрямую
+        без запуска ffmpeg.
+        
+        Args:
+            audio_file: Исходный аудио файл
+            announce: Печатать сообщение о подготовке (False — при фоновой подготовке)
+            
+        Returns:
+            numpy.ndarray (float32, [-1, 1]) или None при ошибке
+        """
+        import numpy as np
+        
+        logger.info("Подготовка аудио (декодирование в 16kHz mono PCM)...")
+        if announce:
+            print("Подготовка аудио...")
+        
+        audio = None
+        if is_asr_ready_wav(audio_file):
+            try:
+                with wave.open(str(audio_file), 'rb') as wf:
+                    raw = wf.readframes(wf.getnframes())
+                audio = np.frombuffer(raw, np.int16).astype(np.float32)
+                audio /= 32768.0  # на месте, без второй копии
+            except (wave.Error, EOFError) as e:
+                # Например, RF64 заголовок — декодируем через ffmpeg
+                logger.debug(f"wave не смог прочитать файл ({e}), использую ffmpeg")
+        
+        if audio is None and Config.AUDIO_MEMMAP_MIN_SEC > 0:
+            duration = get_audio_duration(audio_file)
+            if duration >= Config.AUDIO_MEMMAP_MIN_SEC:
+                audio = self._decode_to_memmap(audio_file)
+        
+        if audio is None:
+            try:
+                raw = subprocess.run([
+                    "ffmpeg", "-nostdin", "-i", str(audio_file),
+                    "-f", "f32le", "-acodec", "pcm_f32le",
+                    "-ac", "1", "-ar", str(ASR_SAMPLE_RATE), "-"
+                ], check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout
+            except subprocess.CalledProcessError as e:
+                logger.error(f"Декодирование не удалось: {e}")
+                return None
+            # Буфер ffmpeg используется как есть (массив только для чтения)
+            audio = np.frombuffer(raw, np.float32)
+        
+        if not len(audio):
+            logger.error("Декодирование не дало аудио данных")
+            return None
+        
+        logger.debug(f"Декодировано {len(audio) / ASR_SAMPLE_RATE:.1f} сек аудио")
+        return audio
+    
+    @staticmethod
+    def _decode_to_memmap(audio_file: Path) -> Optional[Any]:
+        """
+        Декодировать длинную запись в float32 буфер, отображённый на временный файл.
+        
+        ffmpeg пишет PCM прямо во временный файл, и массив отображается на него
+        по фактическому размеру — длительность из заголовка не важна. ОС
+        подгружает страницы по мере чтения моделью, поэтому многочасовая
+        запись не держит сотни МБ в RAM. Файл удаляется сразу после mmap:
+        данные живут, пока жив массив.
+        
+        Args:
+            audio_file: Исходный аудио файл
+            
+        Returns:
+            numpy.memmap (float32, только чтение) или None — тогда декодируем в память
+        """
+        import numpy as np
+        
+        fd, tmp_name = tempfile.mkstemp(suffix='.f32')
+        os.close(fd)
+        try:
+            proc = subprocess.run([
+                "ffmpeg", "-nostdin", "-y", "-i", str(audio_file),
+                "-f", "f32le", "-acodec", "pcm_f32le",
+                "-ac", "1", "-ar", str(ASR_SAMPLE_RATE), tmp_name
+            ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if proc.returncode != 0:
+                logger.error(f"Декодирование не удалось (ffmpeg код {proc.returncode})")
+                os.unlink(tmp_name)
+                return None
+            
+            size = os.path.getsize(tmp_name)
+            if size < 4:
+                os.unlink(tmp_name)
+                return np.empty(0, np.float32)
+            audio = np.memmap(tmp_name, dtype=np.float32, mode='r', shape=(size // 4,))
+        except (OSError, ValueError) as e:
+            logger.debug(f"memmap недоступен ({e}), декодирую в память")
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            return None
+        
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass  # Windows: файл занят отображением, удалит ОС/пользователь
+        
+        logger.debug(f"Аудио декодировано в memmap: {size / 2**20:.0f} МБ вне RAM")
+        return audio
+    
+    def _cleanup_temp_file(self, temp_file: Path, source_file: Optional[Path] = None) -> None:
+        """Удалить временный файл (но никогда не исходный source_file)."""
+        if temp_file and temp_file == source_file:
+            return
         if temp_file and temp_file.exists():
             try:
                 temp_file.unlink()
@@ -259,48 +550,53 @@ class EnhancedTranscriber:
         print(f"🔄 Переключаюсь на локальный backend ({self.fallback_backend})...")
         logger.info(f"Fallback на {self.fallback_backend}")
         
-        # Загружаем локальную модель если ещё не загружена
-        if not self.model_loaded:
-            original_backend = self.backend
-            self.backend = self.fallback_backend
-            self._load_model()
-            self.backend = original_backend
-        
-        # Подготавливаем WAV для локальной обработки
-        safe_file = self._prepare_safe_wav(audio_file)
-        if not safe_file:
-            return None
-        
-        try:
+        # При параллельной отправке в Groq локальная модель одна на все потоки
+        with self._fallback_lock:
+            # Загружаем локальную модель если ещё не загружена
+            # self.backend не трогаем: другие потоки в это время идут через Groq
+            if not self.model_loaded:
+                self._load_model(backend=self.fallback_backend)
+            
+            # Декодируем аудио для локальной обработки
+            audio = self._load_audio_array(audio_file)
+            if audio is None:
+                return None
+            
             # Первый проход — БЕЗ VAD
-            result = self._run_asr_once(safe_file, language=language, use_vad=False)
+            result = self._run_asr_once(
+                audio, language=language, use_vad=False, backend=self.fallback_backend
+            )
             
             # Fallback — с VAD
             if not result or not result.get("segments"):
                 logger.warning("Первый проход пуст, пробуем с VAD...")
                 result = self._run_asr_once(
-                    safe_file,
+                    audio,
                     language=language or 'ru',
-                    use_vad=True
+                    use_vad=True,
+                    backend=self.fallback_backend
                 )
-            
-            if result:
-                result['backend'] = self.fallback_backend
-            return result
-            
-        finally:
-            self._cleanup_temp_file(safe_file)
+        
+        if result:
+            result['backend'] = self.fallback_backend
+        return result
 
-    def _load_model(self) -> None:
-        """Загрузить модель Whisper."""
+    def _load_model(self, backend: Optional[str] = None) -> None:
+        """
+        Загрузить модель Whisper.
+        
+        Args:
+            backend: Локальный backend (по умолчанию self.backend; fallback передаёт свой)
+        """
         if self.model_loaded:
             logger.debug("Модель уже загружена, пропускаем")
             return
         
-        logger.info(f"🤖 Загрузка модели '{self.model_size}' (backend={self.backend})...")
+        backend = backend or self.backend
+        logger.info(f"🤖 Загрузка модели '{self.model_size}' (backend={backend})...")
         load_start = time.time()
         
-        if self.backend == 'whisperx':
+        if backend == 'whisperx':
             # WhisperX с диаризацией
             if not HAS_WHISPERX:
                 raise ImportError(
@@ -310,32 +606,74 @@ class EnhancedTranscriber:
             self.whisperx_transcriber.load_model()
             self.device = self.whisperx_transcriber.device
         
-        elif self.backend == 'faster':
-            from faster_whisper import WhisperModel
-            
+        elif backend == 'faster':
             device = self._resolve_device_faster()
             cpu_threads = Config.FASTER_CPU_THREADS if device == 'cpu' else 0
+            if cpu_threads and Config.FASTER_PIN_PCORES:
+                cpu_threads = self._pin_performance_cores(cpu_threads)
+            
+            # Потоки делятся между параллельными кусками (inter × intra ≈ ядра)
+            num_workers = max(1, Config.FASTER_NUM_WORKERS)
+            if cpu_threads and num_workers > 1:
+                cpu_threads = max(1, cpu_threads // num_workers)
+            
+            # OpenMP/MKL читают число потоков при загрузке библиотек,
+            # поэтому выставляем его до импорта faster_whisper
+            if cpu_threads:
+                os.environ.setdefault('OMP_NUM_THREADS', str(cpu_threads))
+                os.environ.setdefault('MKL_NUM_THREADS', str(cpu_threads))
             
+            from faster_whisper import WhisperModel
+            
+            compute_type = self._resolve_compute_faster(device)
+            # Greedy только для реально квантованной модели; float16/float32 и GPU 'auto' — beam 5
+            if not Config.FASTER_BEAM_SIZE:
+                self.beam_size = 1 if compute_type.startswith('int') else 5
+            model_path = self._resolve_model_path_faster()
+
             logger.debug(
                 f"faster-whisper: device={device}, "
-                f"compute_type={Config.FASTER_COMPUTE}, "
-                f"cpu_threads={cpu_threads}"
-            )
-            
-            self.model = WhisperModel(
-                self.model_size,
-                device=device,
-                compute_type=Config.FASTER_COMPUTE,
-                cpu_threads=cpu_threads
+                f"compute_type={compute_type}, "
+                f"cpu_threads={cpu_threads}, num_workers={num_workers}, model={model_path}"
             )
+
+            cache_key = ('faster', model_path, device, compute_type, cpu_threads, num_workers)
+            self.model = _MODEL_CACHE.get(cache_key)
+            if self.model is None:
+                self.model = WhisperModel(
+                    model_path,
+                    device=device,
+                    compute_type=compute_type,
+                    cpu_threads=cpu_threads,
+                    num_workers=num_workers
+                )
+                _MODEL_CACHE[cache_key] = self.model
+            else:
+                logger.debug("faster-whisper: модель уже загружена в этом процессе")
             self.device = device
+            
+            if self.batch_size > 1:
+                try:
+                    from faster_whisper import BatchedInferencePipeline
+                    self.batched_model = BatchedInferencePipeline(model=self.model)
+                    logger.debug(f"faster-whisper: батчевый режим, batch_size={self.batch_size}")
+                except ImportError:
+                    logger.debug("BatchedInferencePipeline недоступен (faster-whisper < 1.1), без батчинга")
         else:
             import whisper
             
             device, fp16 = self._resolve_device_whisper()
             logger.debug(f"openai-whisper: device={device}, fp16={fp16}")
             
-            self.model = whisper.load_model(self.model_size, device=device)
+            cache_key = ('whisper', self.model_size, device, Config.WHISPER_COMPILE)
+            self.model = _MODEL_CACHE.get(cache_key)
+            if self.model is None:
+                self.model = whisper.load_model(self.model_size, device=device)
+                if Config.WHISPER_COMPILE:
+                    self._compile_whisper_model()
+                _MODEL_CACHE[cache_key] = self.model
+            else:
+                logger.debug("openai-whisper: модель уже загружена в этом процессе")
             self.device = device
             self.use_fp16 = fp16
         
@@ -343,53 +681,294 @@ class EnhancedTranscriber:
         self.model_loaded = True
         logger.info(f"✅ Модель загружена (device={self.device}) за {load_time:.1f} сек")
 
-    def transcribe_files(self, files: List[Path]) -> None:
+    @staticmethod
+    def _pin_performance_cores(cpu_threads: int) -> int:
+        """
+        Ограничить ASR производительными ядрами гибридного CPU.
+        
+        На Linux процесс привязывается к P-ядрам (sched_setaffinity),
+        на macOS привязка недоступна — только число потоков урезается до числа P-ядер.
+        
+        Args:
+            cpu_threads: Желаемое число потоков CTranslate2
+            
+        Returns:
+            Число потоков с учётом числа P-ядер
+        """
+        pcores = get_performance_cores()
+        if not pcores:
+            logger.debug("FASTER_PIN_PCORES: гибридная топология не найдена, пропускаю")
+            return cpu_threads
+        
+        if hasattr(os, 'sched_setaffinity'):
+            try:
+                os.sched_setaffinity(0, pcores)
+            except OSError as e:
+                logger.warning(f"Не удалось привязать процесс к P-ядрам: {e}")
+                return cpu_threads
+        
+        logger.info(f"⚙️ ASR на P-ядрах: {len(pcores)} логических CPU")
+        return min(cpu_threads, len(pcores))
+
+    def _compile_whisper_model(self) -> None:
+        """
+        Обернуть энкодер и декодер openai-whisper в torch.compile.
+        
+        Компиляция происходит при первом вызове, поэтому первый файл
+        обрабатывается дольше; дальше ядра attention/LayerNorm идут слитно.
+        """
+        import torch
+        
+        if not hasattr(torch, 'compile'):
+            logger.warning("WHISPER_COMPILE=1, но torch.compile недоступен (нужен PyTorch 2.x)")
+            return
+        
+        try:
+            self.model.encoder = torch.compile(self.model.encoder, mode='reduce-overhead', fullgraph=False)
+            self.model.decoder = torch.compile(self.model.decoder, mode='reduce-overhead', fullgraph=False)
+            logger.info("⚙️ openai-whisper: torch.compile включён (первый вызов медленнее)")
+        except Exception as e:
+            logger.warning(f"torch.compile не удался, работаем без компиляции: {e}")
+
+    def transcribe_files(self, files: List[Path]) -> int:
         """
         Транскрибировать список файлов.
         
         Args:
             files: Список путей к аудио файлам
+            
+        Returns:
+            Число успешно обработанных файлов
         """
         logger.info(f"Начинаем транскрипцию {len(files)} файл(ов), backend={self.backend}")
         
-        # Groq не требует предварительной загрузки модели
-        if self.backend != 'groq':
-            self._load_model()
-        else:
-            # Инициализируем Groq транскрибер
+        success = 0
+        total = len(files)
+        workers = self._parallel_workers(total)
+        
+        if self.backend == 'groq':
+            # Groq не требует предварительной загрузки модели
             self.groq_transcriber = GroqTranscriber()
             logger.info(f"🚀 Groq API готов (модель: {self.groq_transcriber.model})")
+        elif workers == 1:
+            # В параллельном режиме модель загружает каждый воркер
+            self._load_model()
         
-        # Инициализируем суммаризатор если нужно
-        if self.summarize:
-            if check_summarizer_available():
-                self.summarizer = MeetingSummarizer()
-                logger.info(f"🧠 Суммаризатор готов (модель: {self.summarizer.model})")
-            else:
-                logger.warning("GROQ_API_KEY не установлен, суммаризация отключена")
-                print("⚠️ Суммаризация отключена: GROQ_API_KEY не установлен")
-                self.summarize = False
+        self._init_summarizer()
+        
+        if workers > 1:
+            success = self._transcribe_files_parallel(files, workers)
+        elif self.backend == 'groq' and total > 1 and self.concurrency > 1:
+            success = self._transcribe_files_groq(files)
+        elif self.backend != 'groq' and total > 1:
+            success = self._transcribe_files_prefetch(files)
+        else:
+            for i, f in enumerate(files, 1):
+                print(f"\n━━━ Файл {i}/{total}: {f.name} ━━━")
+                logger.info(f"Обработка файла {i}/{total}: {f.name}")
+                
+                ok = self._transcribe_single(f, auto_open=(i == 1))
+                success += 1 if ok else 0
+        
+        logger.info(f"📊 Итог: успешно {success}/{total}, ошибок {total - success}")
+        print(f"\n📊 Итог: успешно {success}/{total}, ошибок {total - success}")
+        return success
+
+    def _init_summarizer(self) -> None:
+        """Инициализировать суммаризатор если он нужен и доступен."""
+        if not self.summarize or self.summarizer:
+            return
+        
+        if check_summarizer_available():
+            self.summarizer = MeetingSummarizer()
+            logger.info(f"🧠 Суммаризатор готов (модель: {self.summarizer.model})")
+        else:
+            logger.warning("GROQ_API_KEY не установлен, суммаризация отключена")
+            print("⚠️ Суммаризация отключена: GROQ_API_KEY не установлен")
+            self.summarize = False
+
+    def _parallel_workers(self, n_files: int) -> int:
+        """
+        Число процессов для параллельной транскрипции файлов.
+        
+        Параллелим только локальные backends (faster, whisper) и только
+        если это явно включено через WHISPER_PARALLEL_FILES > 1.
+        Каждый процесс занимает FASTER_CPU_THREADS ядер.
+        """
+        if Config.PARALLEL_FILES <= 1 or n_files <= 1:
+            return 1
+        if self.backend not in ('faster', 'whisper'):
+            return 1
+        
+        threads_per_worker = max(1, Config.FASTER_CPU_THREADS)
+        by_cpu = max(1, (os.cpu_count() or 1) // threads_per_worker)
+        return min(n_files, Config.PARALLEL_FILES, by_cpu)
+
+    def _worker_options(self) -> Dict[str, Any]:
+        """Аргументы конструктора для воркеров параллельной транскрипции."""
+        return {
+            'diarize': self.diarize,
+            'min_speakers': self.min_speakers,
+            'max_speakers': self.max_speakers,
+            'filter_hallucinations': self.filter_hallucinations,
+            'summarize': self.summarize,
+            'summary_language': self.summary_language,
+            'batch_size': self.batch_size,
+        }
+
+    def _transcribe_files_groq(self, files: List[Path]) -> int:
+        """
+        Транскрибировать файлы через Groq API параллельно в потоках.
+        
+        Работа упирается в сеть (загрузка и ожидание ответа), поэтому
+        self.concurrency запросов держатся в полёте одновременно.
+        Локальный fallback при ошибках API выполняется по одному файлу.
+        
+        Args:
+            files: Список путей к аудио файлам
+            
+        Returns:
+            Число успешно обработанных файлов
+        """
+        from concurrent.futures import as_completed
+        
+        workers = min(len(files), self.concurrency)
+        logger.info(f"🚀 Groq API: до {workers} файлов одновременно")
+        print(f"🚀 Groq API: до {workers} файлов одновременно")
         
+        success = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(self._transcribe_single, f, i == 1): f
+                for i, f in enumerate(files, 1)
+            }
+            for future in as_completed(futures):
+                f = futures[future]
+                try:
+                    ok = future.result()
+                except Exception as e:
+                    logger.error(f"Ошибка транскрипции {f.name}: {e}", exc_info=True)
+                    ok = False
+                success += 1 if ok else 0
+        
+        return success
+
+    def _prepare_audio(self, audio_file: Path) -> Optional[Any]:
+        """
+        Подготовить вход ASR для файла заранее (вызывается в фоновом потоке).
+        
+        Args:
+            audio_file: Путь к аудио файлу
+            
+        Returns:
+            WAV для whisperx, массив PCM для faster/whisper или None при ошибке
+        """
+        if not ffprobe_ok(audio_file):
+            return None
+        if self.backend == 'whisperx':
+            return self._prepare_safe_wav(audio_file, announce=False)
+        return self._load_audio_array(audio_file, announce=False)
+    
+    def _transcribe_files_prefetch(self, files: List[Path]) -> int:
+        """
+        Транскрибировать файлы одной локальной моделью, готовя следующий файл заранее.
+        
+        Пока модель распознаёт файл i, ffmpeg в фоновом потоке декодирует
+        файл i+1, поэтому GPU/CPU не простаивают между файлами.
+        В памяти одновременно не больше двух подготовленных файлов.
+        
+        Args:
+            files: Список путей к аудио файлам
+            
+        Returns:
+            Число успешно обработанных файлов
+        """
         success = 0
         total = len(files)
         
-        for i, f in enumerate(files, 1):
-            print(f"\n━━━ Файл {i}/{total}: {f.name} ━━━")
-            logger.info(f"Обработка файла {i}/{total}: {f.name}")
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pending = pool.submit(self._prepare_audio, files[0])
+            for i, f in enumerate(files, 1):
+                print(f"\n━━━ Файл {i}/{total}: {f.name} ━━━")
+                logger.info(f"Обработка файла {i}/{total}: {f.name}")
+                
+                try:
+                    prepared = pending.result()
+                except Exception as e:
+                    logger.warning(f"Предварительная подготовка {f.name} не удалась: {e}")
+                    prepared = None
+                if i < total:
+                    pending = pool.submit(self._prepare_audio, files[i])
+                
+                try:
+                    ok = self._transcribe_single(f, auto_open=(i == 1), prepared=prepared)
+                finally:
+                    # WAV для whisperx удаляется и если файл отсеян до распознавания
+                    if isinstance(prepared, Path):
+                        self._cleanup_temp_file(prepared, f)
+                success += 1 if ok else 0
+        
+        return success
+    
+    def _transcribe_files_parallel(self, files: List[Path], workers: int) -> int:
+        """
+        Транскрибировать файлы в пуле процессов.
+        
+        Каждый процесс загружает собственную модель один раз и обрабатывает
+        файлы по очереди. Используется контекст 'spawn', поэтому конфигурация
+        передаётся воркерам явно.
+        
+        Args:
+            files: Список путей к аудио файлам
+            workers: Число процессов
             
-            ok = self._transcribe_single(f, auto_open=(i == 1))
-            success += 1 if ok else 0
+        Returns:
+            Число успешно обработанных файлов
+        """
+        import multiprocessing as mp
+        from concurrent.futures import ProcessPoolExecutor, as_completed
         
-        logger.info(f"📊 Итог: успешно {success}/{total}, ошибок {total - success}")
-        print(f"\n📊 Итог: успешно {success}/{total}, ошибок {total - success}")
+        logger.info(f"⚙️ Параллельная транскрипция: {workers} процесс(ов)")
+        print(f"⚙️ Параллельная транскрипция: {workers} процесс(ов)")
+        
+        config_snapshot = Config.snapshot()
+        config_snapshot['ASR_BACKEND'] = self.backend
+        
+        success = 0
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(config_snapshot, self._worker_options())
+        ) as pool:
+            futures = {
+                pool.submit(_transcribe_in_worker, str(f), i == 1): f
+                for i, f in enumerate(files, 1)
+            }
+            for future in as_completed(futures):
+                f = futures[future]
+                try:
+                    ok = future.result()
+                except Exception as e:
+                    logger.error(f"Ошибка транскрипции {f.name} в воркере: {e}", exc_info=True)
+                    ok = False
+                success += 1 if ok else 0
+        
+        return success
 
-    def _transcribe_single(self, audio_file: Path, auto_open: bool = True) -> bool:
+    def _transcribe_single(
+        self,
+        audio_file: Path,
+        auto_open: bool = True,
+        prepared: Optional[Any] = None
+    ) -> bool:
         """
         Транскрибировать один файл.
         
         Args:
             audio_file: Путь к аудио файлу
             auto_open: Открыть результат после завершения
+            prepared: Заранее подготовленный вход ASR (см. _prepare_audio), иначе готовится здесь
             
         Returns:
             True при успехе, False при ошибке
@@ -406,6 +985,7 @@ class EnhancedTranscriber:
         language = 'ru' if Config.FORCE_RU else None
         result = None
         used_backend = self.backend
+        live_path = None
         
         try:
             # === Groq API backend ===
@@ -416,35 +996,40 @@ class EnhancedTranscriber:
             
             # === WhisperX backend (с диаризацией) ===
             elif self.backend == 'whisperx':
-                safe_file = self._prepare_safe_wav(audio_file)
+                safe_file = prepared if prepared is not None else self._prepare_safe_wav(audio_file)
                 if not safe_file:
                     return False
                 try:
                     result = self._run_whisperx(safe_file, language=language)
                 finally:
-                    self._cleanup_temp_file(safe_file)
+                    self._cleanup_temp_file(safe_file, audio_file)
             
             # === Локальные backends (faster, whisper) ===
             else:
-                safe_file = self._prepare_safe_wav(audio_file)
-                if not safe_file:
+                audio = prepared if prepared is not None else self._load_audio_array(audio_file)
+                if audio is None:
                     return False
-                try:
-                    # Первый проход — БЕЗ VAD
-                    logger.debug(f"ASR проход 1: language={language}, vad=off")
-                    result = self._run_asr_once(safe_file, language=language, use_vad=False)
-                    
-                    # Fallback — с VAD и ru
-                    if not result or not result.get("segments"):
-                        logger.warning("Первый проход пуст, пробуем с VAD...")
-                        print("⚠️ Пусто без VAD, пробую с VAD...")
-                        result = self._run_asr_once(
-                            safe_file,
-                            language=language or 'ru',
-                            use_vad=True
-                        )
-                finally:
-                    self._cleanup_temp_file(safe_file)
+                
+                # Черновик транскрипта по ходу распознавания (LIVE_TRANSCRIPT=1)
+                if Config.LIVE_TRANSCRIPT:
+                    live_path = Config.TRANSCRIPTS_FOLDER / f"{audio_file.stem}.partial.txt"
+                    print(f"📝 Черновик: {live_path}")
+                
+                # Первый проход — БЕЗ VAD
+                logger.debug(f"ASR проход 1: language={language}, vad=off")
+                result = self._run_asr_once(audio, language=language, use_vad=False, live_path=live_path)
+                
+                # Fallback — с VAD и ru
+                if not result or not result.get("segments"):
+                    logger.warning("Первый проход пуст, пробуем с VAD...")
+                    print("⚠️ Пусто без VAD, пробую с VAD...")
+                    result = self._run_asr_once(
+                        audio,
+                        language=language or 'ru',
+                        use_vad=True,
+                        beam_size=Config.FASTER_BEAM_SIZE_FALLBACK,
+                        live_path=live_path
+                    )
             
             if not result or not result.get("text", "").strip():
                 logger.error("Транскрипция не дала результата")
@@ -488,13 +1073,17 @@ class EnhancedTranscriber:
                 seg.get('speaker') for seg in result['segments']
             )
             
-            if has_speakers:
-                txt = self._save_txt_diarized(result, base)
-            else:
-                txt = self._save_txt(result, base)
+            # Три файла пишутся параллельно: запись на диск отпускает GIL
+            save_txt = self._save_txt_diarized if has_speakers else self._save_txt
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                f_txt = pool.submit(save_txt, result, base)
+                f_jsn = pool.submit(self._save_json, result, base, audio_file.name, language or 'auto')
+                f_srt = pool.submit(self._save_srt, result, base, include_speaker=has_speakers)
+                txt, jsn, srt = f_txt.result(), f_jsn.result(), f_srt.result()
             
-            jsn = self._save_json(result, base, audio_file.name, language or 'auto')
-            srt = self._save_srt(result, base, include_speaker=has_speakers)
+            # Черновик больше не нужен — есть финальные файлы
+            if live_path:
+                self._cleanup_temp_file(live_path)
             
             logger.info(f"📄 Сохранено: {txt.name}, {jsn.name}, {srt.name}")
             print("📄 Сохранено:", txt.name, jsn.name, srt.name)
@@ -535,75 +1124,125 @@ class EnhancedTranscriber:
 
     def _run_asr_once(
         self,
-        wav_file: Path,
+        audio: Any,
         language: Optional[str],
-        use_vad: bool
+        use_vad: bool,
+        beam_size: Optional[int] = None,
+        live_path: Optional[Path] = None,
+        backend: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Выполнить один проход ASR.
         
         Args:
-            wav_file: Путь к WAV файлу
+            audio: float32 PCM 16kHz mono (см. _load_audio_array)
             language: Язык или None для автоопределения
             use_vad: Использовать Voice Activity Detection
+            beam_size: Размер beam (faster-whisper), по умолчанию self.beam_size
+            live_path: Файл, куда текст сегментов дописывается по мере распознавания
+            backend: Локальный backend (по умолчанию self.backend; fallback передаёт свой)
             
         Returns:
             Словарь с text и segments или None при ошибке
         """
-        total_sec = get_audio_duration(wav_file)
+        # Silero VAD пре-сегментация (встроенный VAD faster-whisper делает это сам)
+        speech_offsets = None
+        if Config.USE_SILERO_VAD and not use_vad:
+            audio, speech_offsets = self._compact_speech(audio)
+        
+        total_sec = len(audio) / ASR_SAMPLE_RATE
         logger.debug(f"Длительность аудио: {total_sec:.1f} сек")
         
         pbar = tqdm(
             total=int(total_sec) if total_sec > 0 else None,
             desc="Транскрипция",
             unit="s",
-            bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]'
+            bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}{postfix}]'
         )
         
         segs: List[Dict] = []
-        texts: List[str] = []
         last_progress = 0
-        last_print = time.time()
+        pending = 0  # Накопленный прогресс, ещё не переданный в pbar
+        last_flush = time.monotonic()
+        show_progress = not isinstance(pbar, _NullBar)
+        # Построчная буферизация: каждый сегмент сразу виден в файле
+        live = open(live_path, 'w', encoding='utf-8', buffering=1) if live_path else None
         
         try:
             logger.info(f"ASR start (lang={language}, vad={'on' if use_vad else 'off'})")
             print(f" > ASR start (lang={language}, vad={'on' if use_vad else 'off'})")
             
-            if self.backend == 'faster':
-                segments_it, info = self.model.transcribe(
-                    str(wav_file),
-                    language=language,
-                    vad_filter=use_vad,
-                    beam_size=Config.FASTER_BEAM_SIZE,
-                    word_timestamps=True
-                )
+            if (backend or self.backend) == 'faster':
+                transcribe_kwargs = {
+                    'language': language,
+                    'vad_filter': use_vad,
+                    'beam_size': beam_size or self.beam_size,
+                    'temperature': 0.0,
+                    'word_timestamps': Config.WORD_TIMESTAMPS,
+                    'chunk_length': BATCH_CHUNK_SEC,
+                }
+                
+                if self.batched_model is not None and self.batch_size > 1:
+                    if not use_vad:
+                        # Батчевому пайплайну нужна сегментация: без VAD режем на окна по паузам,
+                        # чтобы граница окна не приходилась на середину слова
+                        transcribe_kwargs['clip_timestamps'] = self._batch_clips(audio)
+                    segments_it, info = self.batched_model.transcribe(
+                        audio,
+                        batch_size=self.batch_size,
+                        **transcribe_kwargs
+                    )
+                elif Config.FASTER_NUM_WORKERS > 1 and not use_vad:
+                    segments_it, info = self._transcribe_chunks_parallel(audio, transcribe_kwargs)
+                else:
+                    # Батчевый пайплайн и так декодирует окна независимо
+                    transcribe_kwargs['condition_on_previous_text'] = Config.FASTER_CONDITION_ON_PREV
+                    segments_it, info = self.model.transcribe(audio, **transcribe_kwargs)
                 
                 for s in segments_it:
-                    segs.append({
+                    seg = {
                         'start': s.start,
                         'end': s.end,
                         'text': s.text
-                    })
-                    texts.append(s.text)
+                    }
+                    # Слова есть только при WORD_TIMESTAMPS=1 — тогда они идут в JSON
+                    if s.words:
+                        seg['words'] = [
+                            {'start': w.start, 'end': w.end, 'word': w.word}
+                            for w in s.words
+                        ]
+                    segs.append(seg)
+                    if live:
+                        live.write(s.text.strip() + "\n")
+                    if self.stream:
+                        # Время на исходной шкале (при Silero VAD сегменты пока на сжатой)
+                        shown = {'start': s.start}
+                        if speech_offsets:
+                            self._remap_segments([shown], speech_offsets)
+                        pbar.write(f"[{format_timestamp_short(shown['start'])}] {s.text.strip()}")
                     
-                    # Обновляем прогресс
-                    if total_sec and s.end is not None:
-                        cur = int(s.end)
-                        if cur > last_progress:
-                            pbar.update(cur - last_progress)
-                            last_progress = cur
-                    
-                    # Живой статус каждые ~2.5 сек
-                    if time.time() - last_print > 2.5:
-                        mm = int(s.end) // 60 if s.end else 0
-                        ss = int(s.end) % 60 if s.end else 0
-                        print(f"\r… t≈{mm:02d}:{ss:02d}, сегментов: {len(segs)}", 
-                              end="", flush=True)
-                        last_print = time.time()
+                    # Копим прогресс и сбрасываем в pbar не чаще 4 раз/сек
+                    if show_progress:
+                        if total_sec and s.end is not None:
+                            cur = int(s.end)
+                            if cur > last_progress:
+                                pending += cur - last_progress
+                                last_progress = cur
+                        
+                        now = time.monotonic()
+                        if now - last_flush >= PROGRESS_FLUSH_INTERVAL:
+                            pbar.update(pending)
+                            pbar.set_postfix_str(f"сегм={len(segs)}")
+                            pending = 0
+                            last_flush = now
                     
                     if Config.DEBUG_SEGMENTS:
                         logger.debug(f"[{s.start:.2f}-{s.end:.2f}] {s.text[:60]}")
                 
+                if pending:
+                    pbar.update(pending)
+                pbar.set_postfix_str(f"сегм={len(segs)}")
+                
                 if language is None:
                     language = getattr(info, 'language', None)
                     logger.debug(f"Определён язык: {language}")
@@ -612,27 +1251,206 @@ class EnhancedTranscriber:
                 import whisper
                 
                 res = self.model.transcribe(
-                    str(wav_file),
+                    audio,
                     language=language,
                     fp16=self.use_fp16,
-                    word_timestamps=True
+                    word_timestamps=Config.WORD_TIMESTAMPS,
+                    # True — whisper сам печатает сегменты по мере декодирования
+                    verbose=True if self.stream else None
                 )
                 segs = res.get("segments", [])
-                texts = [seg.get("text", "") for seg in segs]
                 pbar.update(int(total_sec) if total_sec else 0)
             
+            if speech_offsets:
+                self._remap_segments(segs, speech_offsets)
+            
             logger.debug(f"ASR завершён: {len(segs)} сегментов")
-            return {'text': " ".join(texts).strip(), 'segments': segs}
+            # Текст собирается один раз из сегментов, без параллельного списка строк
+            text = " ".join(seg.get('text', '') for seg in segs).strip()
+            return {'text': text, 'segments': segs}
         
         except Exception as e:
             logger.error(f"Ошибка ASR: {e}", exc_info=True)
             raise
         finally:
+            if live:
+                live.close()
             if total_sec and pbar.n < int(total_sec):
                 pbar.update(int(total_sec) - pbar.n)
             pbar.close()
             print()  # Перенос строки после прогресса
 
+    def _compact_speech(self, audio: Any) -> Tuple[Any, Optional[List[Tuple[float, float]]]]:
+        """
+        Вырезать тишину с помощью Silero VAD (поставляется с faster-whisper).
+        
+        Args:
+            audio: float32 PCM 16kHz mono
+            
+        Returns:
+            (аудио только с речью, таблица смещений [(compact_sec, original_sec), ...])
+            или (исходное аудио, None), если VAD недоступен или речь не найдена
+        """
+        try:
+            from faster_whisper.vad import get_speech_timestamps
+        except ImportError:
+            logger.debug("Silero VAD недоступен (нужен faster-whisper), пропускаю")
+            return audio, None
+        
+        import numpy as np
+        
+        chunks = get_speech_timestamps(audio)
+        if not chunks:
+            logger.debug("Silero VAD не нашёл речь, использую аудио целиком")
+            return audio, None
+        
+        offsets = []
+        compact_pos = 0
+        for chunk in chunks:
+            offsets.append((compact_pos / ASR_SAMPLE_RATE, chunk['start'] / ASR_SAMPLE_RATE))
+            compact_pos += chunk['end'] - chunk['start']
+        
+        compact = np.concatenate([audio[c['start']:c['end']] for c in chunks])
+        logger.info(
+            f"Silero VAD: {len(audio) / ASR_SAMPLE_RATE:.0f} → "
+            f"{len(compact) / ASR_SAMPLE_RATE:.0f} сек речи ({len(chunks)} фрагментов)"
+        )
+        return compact, offsets
+
+    @staticmethod
+    def _remap_segments(segs: List[Dict], offsets: List[Tuple[float, float]]) -> None:
+        """Вернуть start/end сегментов со сжатой шкалы на исходную (in-place)."""
+        compact_starts = [compact for compact, _ in offsets]
+        
+        def remap(t: Optional[float]) -> Optional[float]:
+            if t is None:
+                return t
+            i = max(bisect.bisect_right(compact_starts, t) - 1, 0)
+            compact_start, original_start = offsets[i]
+            return original_start + (t - compact_start)
+        
+        for seg in segs:
+            seg['start'] = remap(seg.get('start'))
+            seg['end'] = remap(seg.get('end'))
+            for word in seg.get('words') or []:
+                word['start'] = remap(word.get('start'))
+                word['end'] = remap(word.get('end'))
+
+    @staticmethod
+    def _split_on_silence(
+        audio: Any,
+        chunk_sec: float = SILENCE_CHUNK_SEC,
+        search_sec: float = SILENCE_SEARCH_SEC
+    ) -> List[Tuple[int, int]]:
+        """
+        Нарезать аудио на куски ~chunk_sec, разрезая в самых тихих местах.
+        
+        Точка разреза ищется в окне ±search_sec вокруг целевой границы
+        по минимальной энергии кадра SILENCE_FRAME_SEC. Каждый кусок
+        не длиннее chunk_sec + search_sec.
+        
+        Args:
+            audio: float32 PCM 16kHz mono
+            chunk_sec: Целевая длина куска
+            search_sec: Полуширина окна поиска паузы
+            
+        Returns:
+            Список границ кусков [(start, end), ...] в сэмплах
+        """
+        import numpy as np
+        
+        frame = int(SILENCE_FRAME_SEC * ASR_SAMPLE_RATE)
+        n_frames = len(audio) // frame
+        chunk_frames = int(chunk_sec / SILENCE_FRAME_SEC)
+        search_frames = int(search_sec / SILENCE_FRAME_SEC)
+        
+        if n_frames <= chunk_frames + search_frames:
+            return [(0, len(audio))]
+        
+        energy = np.square(audio[:n_frames * frame].reshape(n_frames, frame)).mean(axis=1)
+        
+        cuts = [0]
+        target = chunk_frames
+        while target + search_frames < n_frames:
+            lo, hi = target - search_frames, target + search_frames
+            cut = lo + int(np.argmin(energy[lo:hi]))
+            cuts.append(cut * frame)
+            target = cut + chunk_frames
+        cuts.append(len(audio))
+        
+        return list(zip(cuts[:-1], cuts[1:]))
+
+    def _transcribe_chunks_parallel(
+        self,
+        audio: Any,
+        transcribe_kwargs: Dict[str, Any]
+    ) -> Tuple[Any, Any]:
+        """
+        Транскрибировать куски аудио параллельно одной моделью.
+        
+        CTranslate2 отпускает GIL, а модель создана с num_workers=FASTER_NUM_WORKERS,
+        поэтому потоки декодируют куски одновременно.
+        
+        Args:
+            audio: float32 PCM 16kHz mono
+            transcribe_kwargs: Параметры WhisperModel.transcribe
+            
+        Returns:
+            (итератор сегментов по порядку, info с полем language) —
+            как у WhisperModel.transcribe. Без заданного языка первый кусок
+            декодируется отдельно, и определённый по нему язык передаётся остальным
+        """
+        chunks = self._split_on_silence(audio)
+        info = SimpleNamespace(language=transcribe_kwargs.get('language'))
+        logger.debug(f"Параллельная транскрипция: {len(chunks)} кусков, {Config.FASTER_NUM_WORKERS} воркеров")
+        
+        kwargs = dict(transcribe_kwargs)
+        kwargs['condition_on_previous_text'] = Config.FASTER_CONDITION_ON_PREV
+        
+        def run_chunk(bounds: Tuple[int, int]) -> Tuple[List[_ChunkSegment], Optional[str]]:
+            start, end = bounds
+            offset = start / ASR_SAMPLE_RATE
+            segments, chunk_info = self.model.transcribe(audio[start:end], **kwargs)
+            # Генератор сегментов нужно исчерпать внутри потока — там идёт декодирование
+            segs = [
+                _ChunkSegment(
+                    s.start + offset, s.end + offset, s.text,
+                    [_ChunkWord(w.start + offset, w.end + offset, w.word) for w in s.words or []]
+                )
+                for s in segments
+            ]
+            return segs, getattr(chunk_info, 'language', None)
+        
+        def iterate():
+            rest = chunks
+            if info.language is None:
+                # Язык определяем один раз по первому куску, остальные получают его явно
+                segs, info.language = run_chunk(chunks[0])
+                kwargs['language'] = info.language
+                yield from segs
+                rest = chunks[1:]
+            with ThreadPoolExecutor(max_workers=Config.FASTER_NUM_WORKERS) as pool:
+                for segs, _ in pool.map(run_chunk, rest):
+                    yield from segs
+        
+        return iterate(), info
+
+    @classmethod
+    def _batch_clips(cls, audio: Any) -> List[Dict[str, int]]:
+        """
+        Окна для батчевого пайплайна без VAD: разрез по паузам, не длиннее BATCH_CHUNK_SEC.
+        
+        Args:
+            audio: float32 PCM 16kHz mono
+            
+        Returns:
+            Список окон [{'start': ..., 'end': ...}] в сэмплах
+        """
+        chunks = cls._split_on_silence(
+            audio, BATCH_CHUNK_SEC - BATCH_SEARCH_SEC, BATCH_SEARCH_SEC
+        )
+        return [{'start': start, 'end': end} for start, end in chunks]
+
     def _run_whisperx(
         self,
         wav_file: Path,
@@ -690,7 +1508,7 @@ class EnhancedTranscriber:
             else:
                 # Сохраняем предыдущую группу
                 if current_text:
-                    ts = self._format_time_short(current_start)
+                    ts = format_timestamp_short(current_start)
                     combined = " ".join(current_text)
                     lines.append(f"[{ts}] {current_speaker}:\n{combined}")
                 
@@ -701,7 +1519,7 @@ class EnhancedTranscriber:
         
         # Добавляем последнюю группу
         if current_text:
-            ts = self._format_time_short(current_start)
+            ts = format_timestamp_short(current_start)
             combined = " ".join(current_text)
             lines.append(f"[{ts}] {current_speaker}:\n{combined}")
         
@@ -710,13 +1528,6 @@ class EnhancedTranscriber:
         
         return p
 
-    @staticmethod
-    def _format_time_short(seconds: float) -> str:
-        """Форматировать время в MM:SS."""
-        minutes = int(seconds) // 60
-        secs = int(seconds) % 60
-        return f"{minutes:02d}:{secs:02d}"
-
     def _save_json(
         self,
         result: Dict,
@@ -733,10 +1544,34 @@ class EnhancedTranscriber:
             'text': result['text'],
             'segments': result['segments']
         }
-        with open(p, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self._write_json(p, data)
         return p
 
+    @staticmethod
+    def _json_default(obj: Any) -> Any:
+        """Привести numpy скаляры/массивы и прочее к JSON-совместимым типам."""
+        if hasattr(obj, 'tolist'):
+            return obj.tolist()
+        return str(obj)
+
+    @classmethod
+    def _write_json(cls, path: Path, data: Any) -> None:
+        """Записать JSON (orjson если установлен, иначе stdlib json; JSON_COMPACT — без отступов)."""
+        if HAS_ORJSON:
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            if not Config.JSON_COMPACT:
+                option |= orjson.OPT_INDENT_2
+            with open(path, 'wb') as f:
+                f.write(orjson.dumps(data, option=option, default=cls._json_default))
+            return
+        
+        if Config.JSON_COMPACT:
+            format_kwargs = {'separators': (',', ':')}
+        else:
+            format_kwargs = {'indent': 2}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, default=cls._json_default, **format_kwargs)
+
     def _save_srt(
         self,
         result: Dict,
@@ -752,16 +1587,21 @@ class EnhancedTranscriber:
             include_speaker: Добавлять метку спикера
         """
         p = Config.TRANSCRIPTS_FOLDER / f"{base}.srt"
+        
+        # Собираем весь файл в памяти и пишем одним вызовом
+        parts = []
+        for i, s in enumerate(result['segments'], 1):
+            start = format_timestamp_srt(s.get('start', 0.0))
+            end = format_timestamp_srt(s.get('end', 0.0))
+            text = (s.get('text') or '').strip()
+            
+            if include_speaker and s.get('speaker'):
+                text = f"[{s['speaker']}] {text}"
+            
+            parts.append(f"{i}\n{start} --> {end}\n{text}\n\n")
+        
         with open(p, 'w', encoding='utf-8') as f:
-            for i, s in enumerate(result['segments'], 1):
-                start = format_timestamp_srt(s.get('start', 0.0))
-                end = format_timestamp_srt(s.get('end', 0.0))
-                text = (s.get('text') or '').strip()
-                
-                if include_speaker and s.get('speaker'):
-                    text = f"[{s['speaker']}] {text}"
-                
-                f.write(f"{i}\n{start} --> {end}\n{text}\n\n")
+            f.write("".join(parts))
         return p
 
     def _save_summary(self, summary_result: Dict, base: str) -> Path:
@@ -785,18 +1625,25 @@ class EnhancedTranscriber:
         
         # Также сохраняем JSON для программной обработки
         json_path = Config.TRANSCRIPTS_FOLDER / f"{base}_summary.json"
-        with open(json_path, 'w', encoding='utf-8') as f:
-            import json
-            json.dump(summary_result, f, ensure_ascii=False, indent=2)
+        self._write_json(json_path, summary_result)
         
         logger.debug(f"Саммари сохранено: {p}, {json_path}")
         return p
 
     def _open_file(self, path: Path) -> None:
-        """Открыть файл в системном приложении."""
+        """Открыть файл в системном приложении (только в интерактивной GUI сессии)."""
+        system = platform.system()
+        
+        # Сервер/CI/скрипты: не запускаем open/xdg-open, которые ждут GUI
+        if not sys.stdout.isatty():
+            logger.debug(f"stdout не TTY, не открываю {path}")
+            return
+        if system == "Linux" and not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")):
+            logger.debug(f"Нет DISPLAY/WAYLAND_DISPLAY, не открываю {path}")
+            return
+        
         try:
             logger.debug(f"Открываю файл: {path}")
-            system = platform.system()
             
             if system == "Darwin":
                 subprocess.run(["open", str(path)], check=False)
@@ -807,3 +1654,24 @@ class EnhancedTranscriber:
         except Exception as e:
             logger.warning(f"Не удалось открыть файл {path}: {e}")
 
+
+# === Воркеры параллельной транскрипции ===
+# Каждый процесс пула держит собственный экземпляр транскрибера с моделью
+
+_worker_transcriber: Optional[EnhancedTranscriber] = None
+
+
+def _init_worker(config_snapshot: Dict[str, Any], options: Dict[str, Any]) -> None:
+    """Инициализация процесса-воркера: применить конфиг и загрузить модель."""
+    global _worker_transcriber
+    for key, value in config_snapshot.items():
+        setattr(Config, key, value)
+    
+    _worker_transcriber = EnhancedTranscriber(**options)
+    _worker_transcriber._load_model()
+    _worker_transcriber._init_summarizer()
+
+
+def _transcribe_in_worker(path: str, auto_open: bool) -> bool:
+    """Транскрибировать один файл в процессе-воркере."""
+    return _worker_transcriber._transcribe_single(Path(path), auto_open=auto_open)
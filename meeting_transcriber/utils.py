@@ -3,16 +3,71 @@
 Утилиты для работы с аудио и определения платформы.
 """
 
+import re
+import json
+import datetime
 import shutil
 import platform
+import functools
 import subprocess
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, List, Optional, Tuple
 
 from .logging_setup import get_logger
 
 logger = get_logger()
 
+# Символы, недопустимые в имени файла записи (\w — с кириллицей)
+_UNSAFE_NAME_RE = re.compile(r'[^\w\s-]')
+# То же правило для ASCII имён в виде таблицы str.translate (без прохода regex)
+_UNSAFE_ASCII_TABLE = {c: None for c in range(128) if _UNSAFE_NAME_RE.match(chr(c))}
+
+
+# Поля, которые читают ffprobe_ok / get_audio_duration / probe_audio_params
+_FFPROBE_ENTRIES = 'stream=codec_type,codec_name,sample_rate,channels,bit_rate:format=duration'
+
+
+@functools.lru_cache(maxsize=256)
+def _ffprobe_json(path: str, mtime_ns: int, size: int) -> Optional[Dict[str, Any]]:
+    """
+    Один вызов ffprobe на файл: только нужные поля format + streams в JSON.
+
+    Результат кэшируется по (path, mtime_ns, size), поэтому повторные
+    проверки одного и того же файла не порождают новых процессов,
+    а изменение файла автоматически инвалидирует кэш.
+    """
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-print_format', 'json',
+        '-show_entries', _FFPROBE_ENTRIES,
+        path
+    ]
+    try:
+        result = subprocess.check_output(cmd, stderr=subprocess.DEVNULL, text=True)
+        return json.loads(result)
+    except (subprocess.CalledProcessError, ValueError) as e:
+        logger.debug(f"ffprobe не смог прочитать {path}: {e}")
+        return None
+
+
+def _probe(path: Path) -> Optional[Dict[str, Any]]:
+    """Получить (кэшированный) результат ffprobe или None."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return _ffprobe_json(str(path), st.st_mtime_ns, st.st_size)
+
+
+def _first_audio_stream(info: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Первый аудио поток из результата ffprobe."""
+    if not info:
+        return None
+    for stream in info.get('streams', []):
+        if stream.get('codec_type') == 'audio':
+            return stream
+    return None
+
 
 def ffprobe_ok(path: Path) -> bool:
     """
@@ -28,18 +83,8 @@ def ffprobe_ok(path: Path) -> bool:
         # Если ffprobe нет, проверяем хотя бы размер файла
         return path.exists() and path.stat().st_size > 1000
     
-    cmd = [
-        'ffprobe', '-v', 'error',
-        '-select_streams', 'a:0',
-        '-show_entries', 'stream=codec_name',
-        '-of', 'default=nokey=1:noprint_wrappers=1',
-        str(path)
-    ]
-    try:
-        result = subprocess.check_output(cmd, stderr=subprocess.STDOUT, text=True).strip()
-        return bool(result)
-    except subprocess.CalledProcessError:
-        return False
+    stream = _first_audio_stream(_probe(path))
+    return bool(stream and stream.get('codec_name'))
 
 
 def get_audio_duration(path: Path) -> float:
@@ -56,20 +101,175 @@ def get_audio_duration(path: Path) -> float:
         logger.warning("ffprobe не найден, не могу определить длительность")
         return 0.0
     
-    cmd = [
-        'ffprobe', '-v', 'error',
-        '-show_entries', 'format=duration',
-        '-of', 'default=nokey=1:noprint_wrappers=1',
-        str(path)
-    ]
+    info = _probe(path)
     try:
-        result = subprocess.check_output(cmd, stderr=subprocess.STDOUT, text=True).strip()
-        return float(result)
-    except Exception as e:
+        return float(info['format']['duration'])
+    except (TypeError, KeyError, ValueError) as e:
         logger.debug(f"Не удалось получить длительность: {e}")
         return 0.0
 
 
+def probe_audio_params(path: Path) -> Tuple[int, int, str]:
+    """
+    Получает параметры первого аудио потока.
+
+    Args:
+        path: Путь к аудио файлу
+
+    Returns:
+        Кортеж (sample_rate, channels, codec_name) или (0, 0, '') при ошибке
+    """
+    if not shutil.which('ffprobe'):
+        return 0, 0, ''
+
+    stream = _first_audio_stream(_probe(path))
+    if not stream:
+        return 0, 0, ''
+    try:
+        return (
+            int(stream.get('sample_rate') or 0),
+            int(stream.get('channels') or 0),
+            stream.get('codec_name', '')
+        )
+    except ValueError as e:
+        logger.debug(f"Не удалось получить параметры аудио: {e}")
+        return 0, 0, ''
+
+
+def probe_audio_bitrate(path: Path) -> int:
+    """
+    Получает битрейт первого аудио потока.
+
+    Args:
+        path: Путь к аудио файлу
+
+    Returns:
+        Битрейт в бит/с или 0, если ffprobe его не сообщает (например, VBR в контейнере)
+    """
+    if not shutil.which('ffprobe'):
+        return 0
+
+    stream = _first_audio_stream(_probe(path))
+    try:
+        return int(stream.get('bit_rate') or 0) if stream else 0
+    except ValueError:
+        return 0
+
+
+def is_asr_ready_wav(path: Path) -> bool:
+    """
+    Проверяет, что файл уже в формате для ASR (16kHz mono pcm_s16le).
+
+    Args:
+        path: Путь к аудио файлу
+
+    Returns:
+        True если конвертация не нужна
+    """
+    return probe_audio_params(path) == (16000, 1, 'pcm_s16le')
+
+
+@functools.lru_cache(maxsize=None)
+def ffmpeg_has_filter(name: str) -> bool:
+    """
+    Проверяет, собран ли ffmpeg с указанным фильтром.
+
+    Args:
+        name: Имя фильтра (например 'arnndn')
+
+    Returns:
+        True если фильтр есть в `ffmpeg -filters`
+    """
+    try:
+        output = subprocess.check_output(
+            ['ffmpeg', '-hide_banner', '-filters'],
+            stderr=subprocess.DEVNULL, text=True
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.debug(f"Не удалось получить список фильтров ffmpeg: {e}")
+        return False
+    # Формат строки: " ... arnndn            A->A       Reduce noise ..."
+    return any(line.split()[1:2] == [name] for line in output.splitlines())
+
+
+@functools.lru_cache(maxsize=None)
+def ffmpeg_has_encoder(name: str) -> bool:
+    """
+    Проверяет, собран ли ffmpeg с указанным кодировщиком.
+
+    Args:
+        name: Имя кодировщика (например 'libopus')
+
+    Returns:
+        True если кодировщик есть в `ffmpeg -encoders`
+    """
+    try:
+        output = subprocess.check_output(
+            ['ffmpeg', '-hide_banner', '-encoders'],
+            stderr=subprocess.DEVNULL, text=True
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.debug(f"Не удалось получить список кодировщиков ffmpeg: {e}")
+        return False
+    # Формат строки: " A....D libopus              libopus Opus ..."
+    return any(line.split()[1:2] == [name] for line in output.splitlines())
+
+
+def get_performance_cores() -> Optional[List[int]]:
+    """
+    Определяет производительные (P) ядра на гибридных CPU.
+
+    Linux (Intel 12+): /sys/devices/cpu_core/cpus — список логических CPU.
+    macOS (Apple Silicon): sysctl hw.perflevel0.logicalcpu — только их число,
+    привязка потоков к ядрам в macOS недоступна.
+
+    Returns:
+        Список ID логических CPU (на macOS — range по числу P-ядер)
+        или None, если CPU не гибридный или топологию не удалось определить
+    """
+    system = platform.system()
+
+    if system == "Linux":
+        cpus_file = Path('/sys/devices/cpu_core/cpus')
+        try:
+            spec = cpus_file.read_text().strip()
+        except OSError:
+            return None
+        ids: List[int] = []
+        for part in spec.split(','):
+            start, _, end = part.partition('-')
+            ids.extend(range(int(start), int(end or start) + 1))
+        return ids or None
+
+    if system == "Darwin":
+        try:
+            out = subprocess.check_output(
+                ['sysctl', '-n', 'hw.nperflevels', 'hw.perflevel0.logicalcpu'],
+                stderr=subprocess.DEVNULL, text=True
+            ).split()
+            levels, pcores = int(out[0]), int(out[1])
+        except (OSError, subprocess.CalledProcessError, ValueError, IndexError):
+            return None
+        return list(range(pcores)) if levels > 1 else None
+
+    return None
+
+
+def get_available_memory_gb() -> Optional[float]:
+    """
+    Доступная оперативная память.
+
+    Returns:
+        Гигабайты или None, если psutil не установлен
+    """
+    # psutil импортируется только здесь: CLI грузит utils при каждом старте
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.virtual_memory().available / (1024 ** 3)
+
+
 def get_platform_config() -> Dict[str, str]:
     """
     Получает конфигурацию ffmpeg для текущей платформы.
@@ -102,6 +302,57 @@ def get_platform_config() -> Dict[str, str]:
     }
 
 
+def safe_filename(name: str) -> str:
+    """
+    Делает безопасное базовое имя файла из названия встречи.
+
+    Args:
+        name: Название, введённое пользователем
+
+    Returns:
+        Имя без спецсимволов, пробелы заменены на "_"
+    """
+    if name.isascii():
+        cleaned = name.translate(_UNSAFE_ASCII_TABLE)
+    else:
+        # Кириллица и прочий Unicode: \w должен оставить буквы любых алфавитов
+        cleaned = _UNSAFE_NAME_RE.sub('', name)
+    return cleaned.strip().replace(' ', '_')
+
+
+def recording_base(folder: Path, name: str) -> Path:
+    """
+    Базовый путь новой записи: <folder>/<безопасное имя>_<ГГГГММДД_ЧЧММ>.
+    
+    Args:
+        folder: Папка записей
+        name: Название встречи
+        
+    Returns:
+        Путь без расширения (recorder добавляет .wav/.flac)
+    """
+    stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M")
+    return folder / f"{safe_filename(name)}_{stamp}"
+
+
+def resolve_summarize(summarize: bool, no_summarize: bool) -> Optional[bool]:
+    """
+    Итоговый флаг суммаризации из опций CLI: --no-summarize > --summarize.
+
+    Args:
+        summarize: Указан --summarize
+        no_summarize: Указан --no-summarize
+
+    Returns:
+        True/False, либо None — использовать Config.AUTO_SUMMARIZE
+    """
+    if no_summarize:
+        return False
+    if summarize:
+        return True
+    return None
+
+
 def format_duration(seconds: float) -> str:
     """
     Форматирует длительность в читаемый вид.
@@ -120,6 +371,20 @@ def format_duration(seconds: float) -> str:
     return f"{minutes:02d}:{secs:02d}"
 
 
+def format_timestamp_short(seconds: float) -> str:
+    """
+    Форматирует время для TXT с репликами спикеров.
+
+    Args:
+        seconds: Время в секундах
+
+    Returns:
+        Строка вида "83:05" (минуты не ограничены часом)
+    """
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes:02d}:{secs:02d}"
+
+
 def format_timestamp_srt(seconds: float) -> str:
     """
     Форматирует время для SRT субтитров.
@@ -130,9 +395,10 @@ def format_timestamp_srt(seconds: float) -> str:
     Returns:
         Строка вида "00:01:23,456"
     """
-    hours, remainder = divmod(int(seconds), 3600)
-    minutes, secs = divmod(remainder, 60)
-    ms = int((seconds - int(seconds)) * 1000)
+    # Целочисленная арифметика в миллисекундах; round, а не int: 1.005 * 1000 = 1004.99...
+    hours, ms = divmod(round(seconds * 1000), 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    secs, ms = divmod(ms, 1000)
     return f"{hours:02d}:{minutes:02d}:{secs:02d},{ms:03d}"
 
 
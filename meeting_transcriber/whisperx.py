@@ -15,30 +15,73 @@ WhisperX добавляет:
 
 import os
 import time
+import importlib.util
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 
 from .config import Config
 from .logging_setup import get_logger
+from .utils import format_timestamp_short
 
 logger = get_logger()
 
 
-# Проверяем доступность whisperx
-HAS_WHISPERX = False
-try:
-    import whisperx
-    HAS_WHISPERX = True
-except ImportError:
-    pass
+# Проверяем доступность whisperx без импорта: сам пакет тянет torch и pyannote
+# (несколько секунд), поэтому он импортируется только при загрузке модели
+HAS_WHISPERX = importlib.util.find_spec('whisperx') is not None
+HAS_TORCH = importlib.util.find_spec('torch') is not None
+
+_TORCH_PATCHED = False
+
+
+def _patch_torch_for_pyannote() -> None:
+    """
+    Workaround для PyTorch 2.6+ совместимости с pyannote.
+    
+    PyTorch 2.6+ по умолчанию использует weights_only=True, что ломает
+    загрузку чекпойнтов pyannote. Патч нужно применить ДО импорта whisperx,
+    поэтому он вызывается из _import_whisperx(), а не при импорте пакета.
+    """
+    global _TORCH_PATCHED
+    if _TORCH_PATCHED:
+        return
+    _TORCH_PATCHED = True
+    
+    try:
+        import torch
+    except ImportError:
+        return
+    
+    # Сохраняем настоящую оригинальную функцию
+    _real_torch_load = torch.load.__wrapped__ if hasattr(torch.load, '__wrapped__') else torch.load
+    
+    def _patched_load(f, map_location=None, pickle_module=None, *, weights_only=False, **kwargs):
+        """Патч torch.load с weights_only=False по умолчанию."""
+        if pickle_module is not None:
+            kwargs['pickle_module'] = pickle_module
+        return _real_torch_load(f, map_location=map_location, weights_only=weights_only, **kwargs)
+    
+    torch.load = _patched_load
+    
+    # Патчим lightning_fabric.utilities.cloud_io
+    try:
+        import lightning_fabric.utilities.cloud_io
+        
+        def _patched_cloud_load(path_or_url, map_location=None, weights_only=None):
+            # ВСЕГДА используем weights_only=False для pyannote моделей
+            return _patched_load(path_or_url, map_location=map_location, weights_only=False)
+        
+        lightning_fabric.utilities.cloud_io._load = _patched_cloud_load
+        lightning_fabric.utilities.cloud_io.torch.load = _patched_load
+    except ImportError:
+        pass
 
-# Проверяем torch
-HAS_TORCH = False
-try:
-    import torch
-    HAS_TORCH = True
-except ImportError:
-    pass
+
+def _import_whisperx():
+    """Импортировать whisperx, предварительно пропатчив torch.load."""
+    _patch_torch_for_pyannote()
+    import whisperx
+    return whisperx
 
 
 class WhisperXTranscriber:
@@ -69,19 +112,30 @@ class WhisperXTranscriber:
         self._align_model = None
         self._align_metadata = None
         self._align_language = None
+        
+        # Кэшированный pipeline диаризации (pyannote грузится 5–8 сек)
+        self._diarize_model = None
+    
+    @staticmethod
+    def _cuda_available() -> bool:
+        """CUDA через torch (torch импортируется только здесь)."""
+        if not HAS_TORCH:
+            return False
+        import torch
+        return torch.cuda.is_available()
     
     def _resolve_device(self) -> str:
         """Определить устройство для WhisperX."""
         d = Config.ASR_DEVICE
         
         if d == 'auto':
-            if HAS_TORCH and torch.cuda.is_available():
+            if self._cuda_available():
                 return 'cuda'
             # WhisperX на CPU работает, но медленно
             return 'cpu'
         
         if d == 'cuda':
-            if HAS_TORCH and torch.cuda.is_available():
+            if self._cuda_available():
                 return 'cuda'
             logger.warning("CUDA недоступна, использую CPU")
             return 'cpu'
@@ -106,6 +160,7 @@ class WhisperXTranscriber:
         
         load_start = time.time()
         
+        whisperx = _import_whisperx()
         self.model = whisperx.load_model(
             self.model_size,
             device=self.device,
@@ -143,6 +198,7 @@ class WhisperXTranscriber:
             - speakers: уникальные спикеры
         """
         self.load_model()
+        whisperx = _import_whisperx()
         
         audio_str = str(audio_path)
         
@@ -213,12 +269,13 @@ class WhisperXTranscriber:
                 t2 = time.time()
                 
                 try:
-                    # Загружаем pipeline диаризации
-                    from whisperx.diarize import DiarizationPipeline
-                    diarize_model = DiarizationPipeline(
-                        use_auth_token=self.hf_token,
-                        device=self.device
-                    )
+                    # Загружаем pipeline диаризации (кэшируем)
+                    if self._diarize_model is None:
+                        from whisperx.diarize import DiarizationPipeline
+                        self._diarize_model = DiarizationPipeline(
+                            use_auth_token=self.hf_token,
+                            device=self.device
+                        )
                     
                     # Выполняем диаризацию
                     diarize_kwargs = {}
@@ -227,7 +284,7 @@ class WhisperXTranscriber:
                     if max_speakers is not None:
                         diarize_kwargs["max_speakers"] = max_speakers
                     
-                    diarize_segments = diarize_model(
+                    diarize_segments = self._diarize_model(
                         audio,
                         **diarize_kwargs
                     )
@@ -309,7 +366,7 @@ class WhisperXTranscriber:
                 if current_text:
                     combined = " ".join(current_text)
                     if include_timestamps:
-                        ts = self._format_time(current_start)
+                        ts = format_timestamp_short(current_start)
                         lines.append(f"[{ts}] {current_speaker}: {combined}")
                     else:
                         lines.append(f"{current_speaker}: {combined}")
@@ -323,19 +380,12 @@ class WhisperXTranscriber:
         if current_text:
             combined = " ".join(current_text)
             if include_timestamps:
-                ts = self._format_time(current_start)
+                ts = format_timestamp_short(current_start)
                 lines.append(f"[{ts}] {current_speaker}: {combined}")
             else:
                 lines.append(f"{current_speaker}: {combined}")
         
         return "\n\n".join(lines)
-    
-    @staticmethod
-    def _format_time(seconds: float) -> str:
-        """Форматировать время в MM:SS."""
-        minutes = int(seconds) // 60
-        secs = int(seconds) % 60
-        return f"{minutes:02d}:{secs:02d}"
 
 
 def check_whisperx_available() -> bool:
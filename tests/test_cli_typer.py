@@ -9,6 +9,7 @@ from typer.testing import CliRunner
 from unittest.mock import patch, MagicMock
 
 from meeting_transcriber.cli_typer import app
+from meeting_transcriber.config import Config
 
 
 runner = CliRunner()
@@ -122,6 +123,12 @@ class TestListDevices:
 class TestTranscribe:
     """Тесты команды transcribe."""
 
+    @pytest.fixture(autouse=True)
+    def no_daemon(self):
+        """Не отправлять запросы демону, запущенному на этой машине."""
+        with patch("meeting_transcriber.cli_typer.transcribe_via_daemon", return_value=None) as mock_daemon:
+            yield mock_daemon
+
     @patch("meeting_transcriber.cli_typer.EnhancedTranscriber")
     @patch("meeting_transcriber.cli_typer.check_summarizer_available")
     def test_transcribe_basic(self, mock_summarizer, mock_transcriber_class, tmp_path):
@@ -197,6 +204,28 @@ class TestTranscribe:
         assert call_args.kwargs["summarize"] is True
         assert call_args.kwargs["summary_language"] == "en"
 
+    @patch("meeting_transcriber.cli_typer.EnhancedTranscriber")
+    def test_transcribe_invalid_backend(self, mock_transcriber_class, tmp_path):
+        """Неизвестный backend отклоняется до создания транскрайбера."""
+        test_file = tmp_path / "test.wav"
+        test_file.write_text("fake audio")
+
+        result = runner.invoke(app, ["transcribe", str(test_file), "--backend", "fastr"])
+
+        assert result.exit_code == 2
+        mock_transcriber_class.assert_not_called()
+
+    @patch("meeting_transcriber.cli_typer.EnhancedTranscriber")
+    def test_transcribe_missing_file(self, mock_transcriber_class, tmp_path):
+        """Отсутствующий файл отклоняется до создания транскрайбера."""
+        test_file = tmp_path / "test.wav"
+        test_file.write_text("fake audio")
+
+        result = runner.invoke(app, ["transcribe", str(test_file), str(tmp_path / "missing.wav")])
+
+        assert result.exit_code == 2
+        mock_transcriber_class.assert_not_called()
+
     @patch("meeting_transcriber.cli_typer.EnhancedTranscriber")
     def test_transcribe_multiple_files(self, mock_transcriber_class, tmp_path):
         """Тест транскрипции нескольких файлов."""
@@ -228,6 +257,67 @@ class TestTranscribe:
         assert result.exit_code == 1
         assert "Transcription failed" in result.stdout
 
+    @patch("meeting_transcriber.cli_typer.transcribe_via_daemon")
+    @patch("meeting_transcriber.cli_typer.EnhancedTranscriber")
+    def test_transcribe_via_daemon(self, mock_transcriber_class, mock_daemon, tmp_path):
+        """Тест: при запущенном демоне модель в процессе не загружается."""
+        test_file = tmp_path / "test.wav"
+        test_file.write_text("fake audio")
+
+        mock_daemon.return_value = {"ok": True, "success": 1, "total": 1}
+
+        result = runner.invoke(app, ["transcribe", str(test_file), "--no-summarize"])
+
+        assert result.exit_code == 0
+        assert "демон" in result.stdout
+        mock_transcriber_class.assert_not_called()
+        options = mock_daemon.call_args.args[1]
+        assert options["summarize"] is False
+        assert options["fallback"] is None
+
+    @patch("meeting_transcriber.cli_typer.EnhancedTranscriber")
+    def test_transcribe_via_daemon_partial_failure(self, mock_transcriber_class, no_daemon, tmp_path):
+        """Тест: ошибки демона не выдаются за успешное завершение."""
+        test_file = tmp_path / "test.wav"
+        test_file.write_text("fake audio")
+
+        no_daemon.return_value = {"ok": True, "success": 1, "total": 2}
+
+        result = runner.invoke(app, ["transcribe", str(test_file), "--no-summarize"])
+
+        assert result.exit_code == 0
+        assert "с ошибками" in result.stdout
+        assert "ошибок 1" in result.stdout
+        assert "✅" not in result.stdout
+
+    @patch("meeting_transcriber.cli_typer.EnhancedTranscriber")
+    def test_transcribe_no_fallback_via_daemon(self, mock_transcriber_class, no_daemon, tmp_path, monkeypatch):
+        """Тест: --no-fallback передаётся демону."""
+        test_file = tmp_path / "test.wav"
+        test_file.write_text("fake audio")
+        monkeypatch.setattr(Config, "ASR_FALLBACK", True)
+        monkeypatch.setenv("ASR_FALLBACK", "1")
+
+        no_daemon.return_value = {"ok": True, "success": 1, "total": 1}
+
+        result = runner.invoke(app, ["transcribe", str(test_file), "--no-summarize", "--no-fallback"])
+
+        assert result.exit_code == 0
+        assert no_daemon.call_args.args[1]["fallback"] is False
+
+    @patch("meeting_transcriber.cli_typer.transcribe_via_daemon")
+    @patch("meeting_transcriber.cli_typer.EnhancedTranscriber")
+    def test_transcribe_stream_skips_daemon(self, mock_transcriber_class, mock_daemon, tmp_path):
+        """Тест: --stream распознаёт в своём процессе, чтобы сегменты печатались здесь."""
+        test_file = tmp_path / "test.wav"
+        test_file.write_text("fake audio")
+
+        result = runner.invoke(app, ["transcribe", str(test_file), "--no-summarize", "--stream"])
+
+        assert result.exit_code == 0
+        mock_daemon.assert_not_called()
+        assert mock_transcriber_class.call_args.kwargs["stream"] is True
+
 
 class TestRecord:
     """Тесты команды record."""
@@ -406,3 +496,42 @@ class TestVersion:
 
         assert result.exit_code == 0
         assert "Meeting Transcriber v5.6.0" in result.stdout
+
+
+class TestRun:
+    """Тесты быстрого пути run() мимо Typer."""
+
+    @patch("meeting_transcriber.cli_typer.app")
+    @patch("meeting_transcriber.cli_typer._print_setup_instructions")
+    def test_run_simple_command_bypasses_typer(self, mock_setup, mock_app):
+        """blackhole-status --setup вызывается напрямую, без app()."""
+        from meeting_transcriber.cli_typer import run
+
+        run(["blackhole-status", "--setup"])
+
+        mock_setup.assert_called_once()
+        mock_app.assert_not_called()
+
+    @patch("meeting_transcriber.cli_typer.app")
+    def test_run_falls_back_to_typer(self, mock_app):
+        """Неизвестные флаги и сложные команды уходят в Typer."""
+        from meeting_transcriber.cli_typer import run
+
+        run(["blackhole-status", "--help"])
+        run(["transcribe", "a.wav"])
+
+        assert mock_app.call_count == 2
+
+
+class TestPlainConsole:
+    """Тесты вывода без терминала."""
+
+    def test_plain_console_strips_markup(self, capsys):
+        """Разметка Rich снимается без создания Rich Console."""
+        from meeting_transcriber.cli_typer import _PlainConsole
+
+        console = _PlainConsole()
+        console.print("[green]✅ Готово:[/green] [1/3] \\[x]")
+
+        assert capsys.readouterr().out == "✅ Готово: [1/3] [x]\n"
+        assert console._rich is None
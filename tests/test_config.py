@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Тесты конфигурации.
+"""
+
+import pickle
+
+from meeting_transcriber.config import Config
+
+
+class TestSnapshot:
+    """Тесты Config.snapshot() для процессов-воркеров."""
+
+    def test_snapshot_is_picklable(self):
+        """Снимок конфигурации сериализуется (передаётся в spawn-пул)."""
+        snapshot = Config.snapshot()
+
+        assert pickle.loads(pickle.dumps(snapshot)) == snapshot
+
+    def test_snapshot_skips_tables(self):
+        """Таблицы пресетов не входят в снимок, скалярные поля — входят."""
+        snapshot = Config.snapshot()
+
+        assert "FILTER_PRESETS" not in snapshot
+        assert snapshot["VOICE_FILTERS"] == Config.VOICE_FILTERS
+        assert snapshot["ASR_BACKEND"] == Config.ASR_BACKEND
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Тесты демона транскрипции.
+"""
+
+import os
+import tempfile
+from unittest.mock import MagicMock
+
+from meeting_transcriber.config import Config
+from meeting_transcriber.daemon import (
+    TranscriptionDaemon,
+    get_socket_path,
+    model_settings,
+    transcribe_via_daemon,
+)
+
+
+class TestProcess:
+    """Тесты обработки запроса демоном."""
+
+    def test_no_fallback_applies_to_one_request(self, tmp_path, monkeypatch):
+        """--no-fallback клиента отключает fallback только для своего запроса."""
+        monkeypatch.setattr(Config, "ASR_FALLBACK", True)
+        daemon = TranscriptionDaemon(socket_path=tmp_path / "mt.sock")
+        daemon.transcriber = MagicMock()
+        seen = []
+        daemon.transcriber.transcribe_files.side_effect = lambda files: seen.append(Config.ASR_FALLBACK) or 1
+        request = {"files": ["a.wav"], "backend": daemon.backend, "settings": model_settings()}
+
+        daemon._process({**request, "options": {"fallback": False}})
+        daemon._process({**request, "options": {}})
+
+        assert seen == [False, True]
+
+    def test_client_gone_does_not_stop_daemon(self, tmp_path):
+        """Оборванное клиентом соединение не роняет демон."""
+        import socket
+
+        daemon = TranscriptionDaemon(socket_path=tmp_path / "mt.sock")
+        server, client = socket.socketpair()
+        client.sendall(b'{"files": ["a.wav"]}\n')
+        client.close()
+        daemon._process = MagicMock(return_value={"ok": True, "success": 1, "total": 1})
+
+        with server:
+            daemon._handle(server)
+
+        daemon._process.assert_called_once()
+
+    def test_rejects_other_model_settings(self, tmp_path, monkeypatch):
+        """Клиент с другой моделью не обслуживается загруженной моделью демона."""
+        daemon = TranscriptionDaemon(socket_path=tmp_path / "mt.sock")
+        daemon.transcriber = MagicMock()
+        monkeypatch.setattr(Config, "DEFAULT_MODEL", "tiny" if Config.DEFAULT_MODEL != "tiny" else "small")
+
+        response = daemon._process({
+            "files": ["a.wav"], "backend": daemon.backend, "settings": model_settings(), "options": {}
+        })
+
+        assert response["ok"] is False
+        daemon.transcriber.transcribe_files.assert_not_called()
+
+
+class TestSocketPath:
+    """Тесты расположения и проверки сокета."""
+
+    def test_private_dir_without_xdg(self, tmp_path, monkeypatch):
+        """Без XDG_RUNTIME_DIR сокет лежит в личной папке 0700, а не в общей /tmp."""
+        monkeypatch.setattr(Config, "DAEMON_SOCKET", "")
+        monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+        monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+
+        path = get_socket_path()
+        TranscriptionDaemon(socket_path=path)._prepare_socket_dir()
+
+        assert path.parent == tmp_path / f"mt-{os.getuid()}"
+        assert path.parent.stat().st_mode & 0o777 == 0o700
+
+    def test_foreign_socket_ignored(self, tmp_path, monkeypatch):
+        """Сокет другого пользователя не используется."""
+        sock = tmp_path / "mt.sock"
+        sock.touch()
+        monkeypatch.setattr(Config, "DAEMON_SOCKET", str(sock))
+        monkeypatch.setattr(os, "getuid", lambda: sock.stat().st_uid + 1)
+        connect = MagicMock()
+        monkeypatch.setattr("meeting_transcriber.daemon.socket.socket", connect)
+
+        assert transcribe_via_daemon([tmp_path / "a.wav"], {}) is None
+        connect.assert_not_called()
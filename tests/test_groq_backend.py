@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Тесты Groq backend.
+"""
+
+import io
+from unittest.mock import patch
+from urllib.error import HTTPError
+from urllib.request import Request
+
+from meeting_transcriber.groq_backend import GROQ_API_URL, GroqTranscriber, MultipartBody
+
+
+def _read_in_blocks(body, size=7):
+    """Прочитать тело блоками, как это делает http.client."""
+    chunks = []
+    while True:
+        data = body.read(size)
+        if not data:
+            return b"".join(chunks)
+        chunks.append(data)
+
+
+class TestMultipartBody:
+    """Тесты потокового multipart тела."""
+
+    def test_streams_header_file_footer(self, tmp_path):
+        """Тело читается блоками: заголовок, содержимое файла, хвост."""
+        audio = tmp_path / "a.mp3"
+        audio.write_bytes(b"ID3-fake-audio-bytes")
+
+        body = MultipartBody(b"HEADER\r\n", audio, b"\r\nFOOTER")
+
+        expected = b"HEADER\r\nID3-fake-audio-bytes\r\nFOOTER"
+        assert body.content_length == len(expected)
+        assert _read_in_blocks(body) == expected
+        body.close()
+
+    def test_rewind(self, tmp_path):
+        """После rewind() тело читается заново целиком."""
+        audio = tmp_path / "a.mp3"
+        audio.write_bytes(b"0123456789")
+        body = MultipartBody(b"H", audio, b"F")
+
+        body.read(4)
+        body.rewind()
+
+        assert body.read() == b"H0123456789F"
+        body.close()
+
+    def test_same_bytes_as_in_memory_form(self, tmp_path):
+        """Поток совпадает с формой, собранной в памяти (как до потоковой отправки)."""
+        audio = tmp_path / "a.mp3"
+        audio.write_bytes(b"audio")
+        with patch("meeting_transcriber.groq_backend.Config.GROQ_API_KEY", "gsk_test"):
+            tr = GroqTranscriber()
+
+        body, content_type = tr._create_multipart_data(audio, "ru")
+        boundary = content_type.split("boundary=", 1)[1]
+
+        expected = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="a.mp3"\r\n'
+            f"Content-Type: audio/mpeg\r\n\r\n"
+        ).encode() + b"audio" + (
+            f"\r\n--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="model"\r\n\r\n{tr.model}\r\n'
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="language"\r\n\r\nru\r\n'
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="response_format"\r\n\r\nverbose_json\r\n'
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="timestamp_granularities[]"\r\n\r\nsegment\r\n'
+            f"--{boundary}--\r\n"
+        ).encode()
+        assert _read_in_blocks(body) == expected
+        body.close()
+
+
+class TestSendRequest:
+    """Тесты повторной отправки при 429."""
+
+    @patch("meeting_transcriber.groq_backend.time.sleep")
+    @patch("meeting_transcriber.groq_backend.urlopen")
+    def test_retry_after_429_resends_full_body(self, mock_urlopen, mock_sleep, tmp_path):
+        """После 429 тело перематывается и отправляется заново целиком."""
+        audio = tmp_path / "a.mp3"
+        audio.write_bytes(b"0123456789")
+        body = MultipartBody(b"H", audio, b"F")
+        sent = []
+
+        def fake_urlopen(request, timeout):
+            sent.append(_read_in_blocks(request.data, 3))
+            if len(sent) == 1:
+                raise HTTPError(GROQ_API_URL, 429, "Too Many Requests", {"Retry-After": "1"}, None)
+            return io.BytesIO(b'{"text": "ok"}')
+
+        mock_urlopen.side_effect = fake_urlopen
+        with patch("meeting_transcriber.groq_backend.Config.GROQ_API_KEY", "gsk_test"):
+            tr = GroqTranscriber()
+
+        result = tr._send_request(Request(GROQ_API_URL, data=body))
+
+        assert result == {"text": "ok"}
+        assert sent == [b"H0123456789F", b"H0123456789F"]
+        mock_sleep.assert_called_once_with(1.0)
+        body.close()
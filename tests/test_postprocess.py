@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Тесты постобработки транскрипции.
+"""
+
+from meeting_transcriber.postprocess import (
+    clean_text,
+    filter_hallucinations,
+    is_repeated_segment,
+    postprocess_transcription,
+)
+
+
+class TestCleanText:
+    """Тесты очистки текста."""
+
+    def test_clean_text(self):
+        """Пробелы схлопываются, пробел перед знаком и повторы знаков убираются."""
+        assert clean_text("  Привет ,  мир!!  \n Как дела ?? ") == "Привет, мир! Как дела?"
+
+    def test_clean_text_empty(self):
+        """Пустая строка возвращается как есть."""
+        assert clean_text("") == ""
+
+
+class TestPostprocessTranscription:
+    """Тесты сборки полного текста."""
+
+    def test_join_before_punctuation(self):
+        """Сегмент, начинающийся со знака, не оставляет пробел на стыке."""
+        result = postprocess_transcription({
+            "text": "",
+            "segments": [
+                {"text": " Ну, смотрите"},
+                {"text": ", мы начинаем встречу"},
+                {"text": "Итак."},
+                {"text": ". Дальше"},
+            ],
+        })
+
+        assert result["text"] == "Ну, смотрите, мы начинаем встречу Итак. Дальше"
+        assert result["segments"][1]["text"] == ", мы начинаем встречу"
+
+
+class TestFilterHallucinations:
+    """Тесты фильтра галлюцинаций и повторов (окно deque + set)."""
+
+    TEXTS = [
+        "Первый пункт повестки", "Второй пункт", "Первый пункт повестки",
+        "Привет всем", "Сегодня обсуждаем план", "Сегодня обсуждаем план",
+        "сегодня обсуждаем план.", "Второй пункт", "Третий пункт",
+        "Четвёртый пункт", "Сегодня обсуждаем план", "Да", "Да",
+        "Субтитры от Amara.org", "Третий пункт",
+        "Пятый пункт обсуждения", "Пятый пункт обсуждения и",
+    ]
+
+    def _filter(self, **kwargs):
+        segments = [{"text": t} for t in self.TEXTS]
+        return [s["text"] for s in filter_hallucinations(segments, **kwargs)]
+
+    def test_window_of_three(self):
+        """Повторы ищутся только в окне из трёх последних принятых сегментов."""
+        assert self._filter(repeat_window=3) == [
+            "Первый пункт повестки", "Второй пункт", "Привет всем",
+            "Сегодня обсуждаем план", "Третий пункт", "Четвёртый пункт",
+            "Да", "Да", "Третий пункт", "Пятый пункт обсуждения",
+        ]
+
+    def test_window_of_one(self):
+        """С окном 1 повтор через сегмент уже не ловится."""
+        assert self._filter(repeat_window=1) == [
+            "Первый пункт повестки", "Второй пункт", "Первый пункт повестки",
+            "Привет всем", "Сегодня обсуждаем план", "Второй пункт",
+            "Третий пункт", "Четвёртый пункт", "Сегодня обсуждаем план",
+            "Да", "Да", "Третий пункт", "Пятый пункт обсуждения",
+        ]
+
+    def test_without_repeat_check(self):
+        """Без проверки повторов удаляются только галлюцинации."""
+        assert len(self._filter(check_repeats=False)) == len(self.TEXTS) - 1
+
+    def test_is_repeated_segment_raw_texts(self):
+        """Без previous_set тексты нормализуются внутри; короткое вхождение — не повтор."""
+        assert is_repeated_segment("Сегодня обсуждаем план", ["  сегодня ОБСУЖДАЕМ план "])
+        assert is_repeated_segment("Сегодня обсуждаем план!", ["сегодня обсуждаем план"])
+        assert not is_repeated_segment("обсуждаем план", ["Сегодня обсуждаем план"])
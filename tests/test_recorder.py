@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Тесты рекордера.
+"""
+
+from unittest.mock import patch
+
+from meeting_transcriber.config import Config
+from meeting_transcriber.recorder import MeetingRecorder, _escape_filter_value
+
+
+class TestSplitFilters:
+    """Тесты разделения цепочки фильтров (DEFER_HEAVY_FILTERS)."""
+
+    def test_soft_preset(self):
+        """Лёгкие фильтры остаются в записи, тяжёлые уходят в пост-обработку."""
+        light, heavy = MeetingRecorder._split_filters(Config.FILTER_PRESETS['soft'])
+
+        assert light == "adeclick,highpass=f=80,lowpass=f=12000"
+        assert heavy == (
+            "acompressor=threshold=-24dB:ratio=2:attack=10:release=150,"
+            "loudnorm=I=-16:TP=-1.5:LRA=11"
+        )
+
+    def test_light_only(self):
+        """Цепочка только из лёгких фильтров не даёт пост-обработки."""
+        assert MeetingRecorder._split_filters("highpass=f=80") == ("highpass=f=80", "")
+
+    def test_order_preserved(self):
+        """Порядок внутри каждой части сохраняется."""
+        light, heavy = MeetingRecorder._split_filters("anlmdn=s=3,highpass=f=80,loudnorm,lowpass=f=8000")
+
+        assert light == "highpass=f=80,lowpass=f=8000"
+        assert heavy == "anlmdn=s=3,loudnorm"
+
+
+class TestRnnoiseFilter:
+    """Тесты подстановки RNNOISE_MODEL в цепочку фильтров."""
+
+    def test_escape_filter_value(self):
+        """Оба уровня экранирования ffmpeg: значение опции и граф фильтров."""
+        assert _escape_filter_value("/models/sh.rnnn") == "/models/sh.rnnn"
+        assert _escape_filter_value(r"C:\m\it's,a.rnnn") == r"C\\:\\\\m\\\\it\\\'s\,a.rnnn"
+
+    @patch("meeting_transcriber.recorder.ffmpeg_has_filter", return_value=True)
+    def test_model_path_with_backslashes(self, mock_has_filter, tmp_path, monkeypatch):
+        """Путь с обратными слэшами не разбирается как шаблон замены re.sub."""
+        model = tmp_path / r"\model's.rnnn"
+        model.write_bytes(b"")
+        monkeypatch.setattr(Config, "RNNOISE_MODEL", str(model))
+        monkeypatch.setattr(Config, "VOICE_FILTERS", "highpass=f=80,anlmdn=s=3,loudnorm")
+
+        filters = MeetingRecorder.__new__(MeetingRecorder)._voice_filters()
+
+        assert filters == f"highpass=f=80,arnndn=m={_escape_filter_value(str(model))},loudnorm"
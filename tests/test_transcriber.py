@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Тесты вспомогательных функций транскрибера.
+"""
+
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from meeting_transcriber.transcriber import ASR_SAMPLE_RATE, BATCH_CHUNK_SEC, EnhancedTranscriber
+
+
+def _noise_with_gaps(total_sec, gaps):
+    """Шум с тихими участками [(начало, конец), ...] в секундах."""
+    np = pytest.importorskip("numpy")
+    audio = np.random.RandomState(0).uniform(-0.5, 0.5, int(total_sec * ASR_SAMPLE_RATE)).astype(np.float32)
+    for start, end in gaps:
+        audio[int(start * ASR_SAMPLE_RATE):int(end * ASR_SAMPLE_RATE)] = 0.0
+    return audio
+
+
+class TestRemapSegments:
+    """Тесты перевода таймкодов со сжатой шкалы (Silero VAD) на исходную."""
+
+    def test_remap_segments_and_words(self):
+        """Сегменты и слова сдвигаются по куску, в который попадают."""
+        offsets = [(0.0, 1.0), (2.0, 5.0)]
+        segs = [
+            {"start": 0.5, "end": 2.5, "words": [{"start": 0.5, "end": 1.0}, {"start": 2.0, "end": 2.5}]},
+            {"start": 3.0, "end": None},
+        ]
+
+        EnhancedTranscriber._remap_segments(segs, offsets)
+
+        assert segs[0]["start"] == 1.5
+        assert segs[0]["end"] == 5.5
+        assert segs[0]["words"] == [{"start": 1.5, "end": 2.0}, {"start": 5.0, "end": 5.5}]
+        assert segs[1] == {"start": 6.0, "end": None}
+
+
+class TestSplitOnSilence:
+    """Тесты нарезки аудио по паузам."""
+
+    def test_cuts_at_silence(self):
+        """Разрез приходится на начало паузы в окне поиска."""
+        audio = _noise_with_gaps(31, [(9.0, 9.3), (20.5, 20.8)])
+
+        chunks = EnhancedTranscriber._split_on_silence(audio, 10, 2)
+
+        assert chunks == [
+            (0, 9 * ASR_SAMPLE_RATE),
+            (9 * ASR_SAMPLE_RATE, int(20.5 * ASR_SAMPLE_RATE)),
+            (int(20.5 * ASR_SAMPLE_RATE), len(audio)),
+        ]
+
+    def test_short_audio_single_chunk(self):
+        """Короткое аудио не режется."""
+        audio = _noise_with_gaps(5, [])
+
+        assert EnhancedTranscriber._split_on_silence(audio) == [(0, len(audio))]
+
+    def test_batch_clips_fit_model_window(self):
+        """Окна батчевого пайплайна покрывают аудио и не длиннее BATCH_CHUNK_SEC."""
+        audio = _noise_with_gaps(200, [])
+
+        clips = EnhancedTranscriber._batch_clips(audio)
+
+        assert clips[0]["start"] == 0
+        assert clips[-1]["end"] == len(audio)
+        assert all(a["end"] == b["start"] for a, b in zip(clips, clips[1:]))
+        assert max(c["end"] - c["start"] for c in clips) <= BATCH_CHUNK_SEC * ASR_SAMPLE_RATE
+
+
+class TestDecodeToMemmap:
+    """Тесты декодирования длинных записей в memmap."""
+
+    def test_sized_by_actual_output(self):
+        """Размер массива — по фактическому выводу ffmpeg, без копии в RAM."""
+        np = pytest.importorskip("numpy")
+        samples = np.arange(1000, dtype=np.float32)
+
+        def fake_ffmpeg(cmd, **kwargs):
+            samples.tofile(cmd[-1])
+            return subprocess.CompletedProcess(cmd, 0)
+
+        with patch("meeting_transcriber.transcriber.subprocess.run", side_effect=fake_ffmpeg):
+            audio = EnhancedTranscriber._decode_to_memmap(Path("long.wav"))
+
+        assert isinstance(audio, np.memmap)
+        assert np.array_equal(audio, samples)
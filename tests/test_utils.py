@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Тесты утилит.
+"""
+
+import pytest
+
+from meeting_transcriber.utils import format_timestamp_srt
+
+
+class TestFormatTimestampSrt:
+    """Тесты таймкодов SRT."""
+
+    @pytest.mark.parametrize("seconds, expected", [
+        (0, "00:00:00,000"),
+        (0.5, "00:00:00,500"),
+        (59.999, "00:00:59,999"),
+        (61.25, "00:01:01,250"),
+        (3661.5, "01:01:01,500"),
+        (36000, "10:00:00,000"),
+    ])
+    def test_format(self, seconds, expected):
+        """Часы, минуты, секунды и миллисекунды."""
+        assert format_timestamp_srt(seconds) == expected
+
+    @pytest.mark.parametrize("seconds, expected", [
+        (1.029, "00:00:01,029"),
+        (1.005, "00:00:01,005"),
+        (59.9996, "00:01:00,000"),
+    ])
+    def test_no_float_drift(self, seconds, expected):
+        """Миллисекунды округляются, а не усекаются с ошибкой float."""
+        assert format_timestamp_srt(seconds) == expected